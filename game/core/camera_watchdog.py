@@ -0,0 +1,189 @@
+import threading
+import time
+
+import cv2
+
+
+# 摄像头健康状态
+CAMERA_STOPPED = 'stopped'
+CAMERA_STARTING = 'starting'
+CAMERA_OK = 'ok'
+CAMERA_STALLED = 'stalled'
+CAMERA_RECONNECTING = 'reconnecting'
+
+
+class CameraWatchdog:
+    """在后台线程中读取摄像头的看门狗
+
+    采集线程不断读取最新一帧放进单帧槽位，渲染循环只取槽位里的最新帧，永远不会阻塞在设备上。
+    连续读取失败或一次读取卡住超过stall_timeout时，采集线程释放设备，按指数退避重新打开；
+    画面长时间没有更新时状态标记为stalled，供界面提示。USB重新枚举等耗时的恢复操作都在后台线程完成。
+    stop时线程可能还卡在设备调用里，这时保留线程引用，等它退出之后再启动新的线程，不会有两个线程同时占用设备。
+    """
+
+    def __init__(self, device_index=0, width=1280, height=720, stall_timeout=1.0,
+                 max_read_failures=10, initial_backoff=0.5, max_backoff=8.0):
+        self.device_index = device_index
+        self.width = width
+        self.height = height
+        self.stall_timeout = stall_timeout          # 超过该秒数没有新帧即视为卡住
+        self.max_read_failures = max_read_failures  # 连续读取失败多少次后重连
+        self.initial_backoff = initial_backoff      # 第一次重连前的等待时间（秒）
+        self.max_backoff = max_backoff              # 重连等待时间上限（秒）
+
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+        self._restart_pending = False  # stop后旧线程还没退出时收到的start，等旧线程退出后再执行
+        self._frame = None
+        self._frame_time = 0.0
+        self._frame_seq = 0
+        self._state = CAMERA_STOPPED
+        self.reconnect_count = 0
+
+    def start(self):
+        """
+        启动采集线程，立即返回
+
+        返回:
+            线程是否已经在运行；上一次stop的线程还没退出时返回False，等它退出后由health自动启动
+        """
+        if self._thread is not None and self._thread.is_alive():
+            if not self._stop_event.is_set():
+                return True
+            self._restart_pending = True
+            self._set_state(CAMERA_STARTING)
+            return False
+        self._restart_pending = False
+        self._stop_event.clear()
+        with self._lock:
+            self._frame = None
+            self._frame_time = 0.0
+            self._frame_seq = 0
+            self._state = CAMERA_STARTING
+        self.reconnect_count = 0
+        self._thread = threading.Thread(target=self._run, name="CameraWatchdog", daemon=True)
+        self._thread.start()
+        return True
+
+    def stop(self, timeout=1.0):
+        """通知采集线程退出；线程卡在设备调用里时不会无限等待，引用保留到它真正退出"""
+        self._stop_event.set()
+        self._restart_pending = False
+        if self._thread is not None:
+            self._thread.join(timeout)
+            if self._thread.is_alive():
+                print("摄像头线程仍在等待设备返回，将在后台退出")
+            else:
+                self._thread = None
+        with self._lock:
+            self._frame = None
+            self._state = CAMERA_STOPPED
+
+    def is_running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def read(self):
+        """
+        获取最新一帧，不阻塞
+
+        返回:
+            (frame, timestamp, seq)，还没有任何画面时frame为None；
+            seq随每个新帧递增，调用方可以据此判断画面是否更新
+        """
+        with self._lock:
+            return self._frame, self._frame_time, self._frame_seq
+
+    def health(self):
+        """返回当前的摄像头健康状态"""
+        if self._restart_pending and not self.is_running():
+            self.start()
+        with self._lock:
+            state = self._state
+            frame_time = self._frame_time
+        if state == CAMERA_OK and time.perf_counter() - frame_time > self.stall_timeout:
+            return CAMERA_STALLED
+        return state
+
+    def _set_state(self, state):
+        with self._lock:
+            self._state = state
+
+    def _open(self):
+        capture = cv2.VideoCapture(self.device_index)
+        if not capture.isOpened():
+            capture.release()
+            return None
+        capture.set(3, self.width)   # 设置宽度
+        capture.set(4, self.height)  # 设置高度
+        return capture
+
+    def _reconnect(self, capture):
+        """释放设备并标记为重连中，下一轮循环重新打开；返回None作为新的capture"""
+        try:
+            capture.release()
+        except Exception as e:
+            print(f"摄像头释放错误: {e}")
+        self._set_state(CAMERA_RECONNECTING)
+        return None
+
+    def _run(self):
+        capture = None
+        backoff = self.initial_backoff
+        failures = 0
+        streaming = False  # 当前打开的设备是否已经送来过画面
+        try:
+            while not self._stop_event.is_set():
+                if capture is None:
+                    try:
+                        capture = self._open()
+                    except Exception as e:
+                        print(f"摄像头打开错误: {e}")
+                        capture = None
+                    if capture is None:
+                        self._set_state(CAMERA_RECONNECTING)
+                        # 用Event等待，停止时可以立即醒来
+                        self._stop_event.wait(backoff)
+                        backoff = min(backoff * 2, self.max_backoff)
+                        self.reconnect_count += 1
+                        continue
+                    failures = 0
+                    streaming = False
+
+                read_started = time.perf_counter()
+                try:
+                    success, frame = capture.read()
+                except Exception as e:
+                    print(f"摄像头读取错误: {e}")
+                    success, frame = False, None
+                if self._stop_event.is_set():
+                    break
+
+                # 读取卡住（health会报告stalled）和连续读取失败一样释放设备重新打开；
+                # 刚打开的设备第一帧可能要等很久，收到过画面之后才检查
+                if streaming and time.perf_counter() - read_started > self.stall_timeout:
+                    print("摄像头读取卡住，正在后台重新连接")
+                    capture = self._reconnect(capture)
+                    continue
+
+                if success and frame is not None:
+                    failures = 0
+                    streaming = True
+                    backoff = self.initial_backoff
+                    with self._lock:
+                        self._frame = frame
+                        self._frame_time = time.perf_counter()
+                        self._frame_seq += 1
+                        self._state = CAMERA_OK
+                    continue
+
+                failures += 1
+                if failures >= self.max_read_failures:
+                    print("摄像头连续读取失败，正在后台重新连接")
+                    capture = self._reconnect(capture)
+                else:
+                    # 短暂等待，避免设备异常时空转占满CPU
+                    self._stop_event.wait(0.01)
+        finally:
+            if capture is not None:
+                capture.release()
@@ -0,0 +1,63 @@
+import numpy as np
+
+
+# 手势模式的逻辑游戏区域：所有玩法坐标（蛇头、食物、障碍物、碰撞）都在这个空间里
+LOGICAL_WIDTH = 1280
+LOGICAL_HEIGHT = 720
+
+# 设置界面可以循环切换的渲染比例
+RENDER_SCALE_OPTIONS = [1.0, 0.75, 0.5]
+
+
+class CoordinateSpace:
+    """手势模式的坐标空间换算
+
+    涉及四个空间：
+      - 摄像头空间：摄像头画面的像素坐标（已经水平翻转）
+      - 逻辑空间：固定为1280x720，玩法逻辑只使用逻辑坐标，与显示器分辨率无关
+      - 渲染空间：游戏帧实际绘制的分辨率，等于逻辑尺寸乘以render_scale
+      - 屏幕空间：pygame窗口，渲染好的帧在上屏时一次性放大到屏幕尺寸
+    所有换算都集中在这里，避免各处各自按screen_width/screen_height缩放。
+    """
+
+    def __init__(self, screen_size, logical_size=(LOGICAL_WIDTH, LOGICAL_HEIGHT), render_scale=1.0, camera_size=(1280, 720)):
+        self.logical_width, self.logical_height = logical_size
+        self.camera_width, self.camera_height = camera_size
+        self.screen_width, self.screen_height = screen_size
+        self.set_render_scale(render_scale)
+
+    def set_render_scale(self, render_scale):
+        self.render_scale = float(render_scale)
+        self.render_width = max(1, int(round(self.logical_width * self.render_scale)))
+        self.render_height = max(1, int(round(self.logical_height * self.render_scale)))
+
+    @property
+    def logical_size(self):
+        return self.logical_width, self.logical_height
+
+    @property
+    def render_size(self):
+        return self.render_width, self.render_height
+
+    def camera_to_logical(self, x, y):
+        """摄像头像素坐标 -> 逻辑坐标，并限制在逻辑区域内"""
+        lx = int(x * self.logical_width / self.camera_width)
+        ly = int(y * self.logical_height / self.camera_height)
+        return max(0, min(self.logical_width, lx)), max(0, min(self.logical_height, ly))
+
+    def screen_to_logical(self, x, y):
+        return int(x * self.logical_width / self.screen_width), int(y * self.logical_height / self.screen_height)
+
+    def screen_to_render(self, x, y):
+        return int(x * self.render_width / self.screen_width), int(y * self.render_height / self.screen_height)
+
+    def logical_to_render(self, x, y):
+        return int(round(x * self.render_scale)), int(round(y * self.render_scale))
+
+    def logical_to_render_array(self, points):
+        """把(n, 2)的逻辑坐标数组换算成可以直接绘制的int32渲染坐标"""
+        return np.rint(np.asarray(points, dtype=np.float32) * self.render_scale).astype(np.int32)
+
+    def render_length(self, length, minimum=1):
+        """把逻辑空间的长度（线宽、半径、字号等）换算到渲染空间"""
+        return max(minimum, int(round(length * self.render_scale)))
@@ -0,0 +1,119 @@
+import bisect
+import time
+
+
+# 手势模式的模拟频率（每秒模拟步数）
+SIMULATION_HZ = 60
+
+
+class FixedTimestep:
+    """固定步长的模拟时钟
+
+    渲染帧之间经过的真实时间累加到accumulator里，每凑够一个step就执行一次模拟，
+    剩余不足一步的部分用alpha表示，供渲染时在上一个和当前模拟状态之间插值。
+    这样游戏逻辑只和模拟时间有关：30帧和144帧渲染跑出来的游戏过程一致，
+    渲染卡顿时下一帧会补跑落下的步数；卡顿超过max_steps步的部分直接丢弃，避免一帧里追赶太多步。
+    """
+
+    def __init__(self, step=1.0 / SIMULATION_HZ, max_steps=15, clock=time.perf_counter):
+        self.step = step
+        self.max_steps = max_steps
+        self.clock = clock
+        self.reset()
+
+    def reset(self):
+        self.last_time = None
+        self.accumulator = 0.0
+        self.sim_time = 0.0    # 已经模拟的总时长（秒）
+        self.steps = 0         # 已经执行的模拟步数
+        self.dropped = 0.0     # 因卡顿丢弃的时间（秒）
+
+    def advance(self, now=None):
+        """
+        推进时钟
+
+        返回:
+            本帧需要执行的各个模拟步对应的时间戳列表（与now同一时钟），按时间先后排列
+        """
+        if now is None:
+            now = self.clock()
+        if self.last_time is None:
+            self.last_time = now
+            return []
+
+        self.accumulator += max(0.0, now - self.last_time)
+        self.last_time = now
+
+        steps = int(self.accumulator / self.step)
+        if steps > self.max_steps:
+            dropped = (steps - self.max_steps) * self.step
+            self.accumulator -= dropped
+            self.dropped += dropped
+            steps = self.max_steps
+
+        # 模拟当前推进到的时间点，每一步向前推进一个step
+        frontier = now - self.accumulator
+        times = [frontier + (i + 1) * self.step for i in range(steps)]
+        self.accumulator -= steps * self.step
+        self.sim_time += steps * self.step
+        self.steps += steps
+        return times
+
+    @property
+    def alpha(self):
+        """渲染插值系数：距离下一次模拟还差多少，范围[0, 1)"""
+        return min(1.0, self.accumulator / self.step)
+
+
+class SampleTimeline:
+    """带时间戳的指尖位置采样
+
+    采样时间使用摄像头的采集时间而不是检测完成的时间，模拟步按自己的时间戳取值，
+    两次采样之间做线性插值，晚于最新采样时保持最新的位置。
+    位置为None表示该时刻没有检测到手，取值时不会跨过None插值。
+    """
+
+    def __init__(self, max_samples=64):
+        self.max_samples = max_samples
+        self.clear()
+
+    def clear(self):
+        self.times = []
+        self.positions = []
+
+    def __len__(self):
+        return len(self.times)
+
+    def add(self, timestamp, position):
+        """追加一次采样，时间戳不晚于最新采样的重复数据会被忽略"""
+        if self.times and timestamp <= self.times[-1]:
+            return
+        self.times.append(timestamp)
+        self.positions.append(position)
+        if len(self.times) > self.max_samples:
+            del self.times[:-self.max_samples]
+            del self.positions[:-self.max_samples]
+
+    def sample_at(self, timestamp):
+        """返回timestamp时刻的位置，没有任何采样时返回None"""
+        if not self.times:
+            return None
+        index = bisect.bisect_right(self.times, timestamp)
+        if index == 0:
+            return self.positions[0]
+        if index == len(self.times):
+            return self.positions[-1]
+
+        t0, t1 = self.times[index - 1], self.times[index]
+        p0, p1 = self.positions[index - 1], self.positions[index]
+        if p0 is None or p1 is None:
+            return p0
+        ratio = (timestamp - t0) / (t1 - t0)
+        return (p0[0] + (p1[0] - p0[0]) * ratio, p0[1] + (p1[1] - p0[1]) * ratio)
+
+    def discard_before(self, timestamp):
+        """丢弃已经用不到的旧采样，保留timestamp之前的最后一个用于插值"""
+        index = bisect.bisect_right(self.times, timestamp) - 1
+        if index > 0:
+            del self.times[:index]
+            del self.positions[:index]
@@ -1,5 +1,6 @@
 import os
 import sys
+import time
 
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
@@ -268,8 +269,15 @@ from PIL import Image
 from game.core.snake_game import SnakeGame as CoreSnakeGame
 from game.modes.classic.classic_snake_game import ClassicSnakeGame
 from game.modes.gesture.simple_gesture_snake import SnakeGame as GestureSnakeGame
-from game.core.game_ui import draw_mode_selection_screen, draw_startup_animation, draw_and_update_effects, global_particles, draw_settings_screen, gradient_colors_data
-from game.utils.game_data import load_game_data, save_game_data
+from game.modes.gesture.two_player_gesture_snake import TwoPlayerSnakeGame
+from game.core.hand_tracker import HandIdentityTracker
+from game.core.motion_gate import MotionGate
+from game.core.camera_watchdog import CameraWatchdog, CAMERA_OK, CAMERA_STALLED, CAMERA_RECONNECTING
+from game.core.latency_monitor import LatencyMonitor, STAGE_DETECTED, STAGE_UPDATED
+from game.core.coordinate_space import CoordinateSpace, RENDER_SCALE_OPTIONS
+from game.core.gesture_commands import GestureCommandRecognizer, GESTURE_PINCH, GESTURE_OPEN_PALM, GESTURE_FIST
+from game.core.game_ui import draw_mode_selection_screen, draw_startup_animation, draw_and_update_effects, global_particles, draw_settings_screen
+from game.utils.game_data import load_game_data, save_game_data, GAME_DATA_FILE
 from game.utils.chinese_text import put_chinese_text, put_rainbow_text
 from game.utils.improved_chinese_text import put_chinese_text_pil, put_rainbow_text_pil, put_chinese_text_with_background
 from game.utils.language_manager import get_translation
@@ -354,6 +362,8 @@ class GameController:
         self.high_score_gesture = game_data['high_score_gesture']
         self.snake_color = game_data['snake_color'] 
         self.hide_camera_feed = game_data['hide_camera_feed'] 
+        self.gesture_two_player = game_data.get('gesture_two_player', False)
+        self.gesture_render_scale = game_data.get('gesture_render_scale', 1.0)
         
         # 加载语言设置
         self.current_language = game_data.get('language', 'zh_cn')
@@ -363,7 +373,21 @@ class GameController:
         
         self.animation_frame_count = 0
 
-        self.capture = None
+        # 摄像头在后台线程中读取和重连，渲染循环只取最新帧
+        self.camera = CameraWatchdog()
+        self.last_camera_seq = 0
+        self.last_hand_position = None
+        self.last_player_heads = [None, None]
+        
+        # 动作到上屏延迟统计，F3显示叠加层，F4导出CSV
+        self.latency_monitor = LatencyMonitor()
+        
+        # 运动门控：画面静止时复用上一帧的检测结果，跳过推理
+        self.motion_gate = MotionGate()
+        self.last_detected_hands = []
+        
+        # 手势命令（捏合/张开手掌/握拳），直接复用检测得到的21个关键点
+        self.gesture_commands = GestureCommandRecognizer()
         
 
         self.hovered_button = None
@@ -373,6 +397,7 @@ class GameController:
 
         self.hand_tracking_enabled = False
         self.hand_detector = None
+        self.hand_detector_max_hands = 1
 
         self.is_loading = False
         self.loading_progress = 0
@@ -399,7 +424,19 @@ class GameController:
         self.hand_tracking_game.boom_sound = self.boom_sound
         self.hand_tracking_game.fail_sound = self.fail_sound
         
-        self.classic_game = ClassicSnakeGame(snake_color=self.snake_color, width=self.screen_width, height=self.screen_height, gradient_colors_data=gradient_colors_data) 
+        # 双人手势模式：一次多手检测驱动两条蛇
+        self.two_player_game = TwoPlayerSnakeGame(food_path=food_path)
+        self.two_player_game.boom_sound = self.boom_sound
+        self.two_player_game.fail_sound = self.fail_sound
+        self.hand_identity_tracker = HandIdentityTracker(num_players=2)
+        
+        # 手势模式的坐标换算：固定逻辑空间 + 可调的内部渲染分辨率，上屏时再放大到屏幕尺寸
+        self.coordinate_space = CoordinateSpace((self.screen_width, self.screen_height), render_scale=self.gesture_render_scale)
+        self.hand_tracking_game.set_coordinate_space(self.coordinate_space)
+        self.two_player_game.set_coordinate_space(self.coordinate_space)
+        self.gesture_background = None
+        
+        self.classic_game = ClassicSnakeGame(snake_color=self.snake_color, width=self.screen_width, height=self.screen_height) 
         self.classic_game.high_score = self.high_score_classic
         self.classic_game.boom_sound = self.boom_sound
         self.classic_game.fail_sound = self.fail_sound
@@ -513,11 +550,38 @@ class GameController:
         
         # 按钮矩形对象，用于点击检测
         self.camera_toggle_button_rect = pygame.Rect(0, 0, 300, 70)  # 初始化一个默认矩形
+        self.two_player_toggle_button_rect = pygame.Rect(0, 0, 300, 70)  # 初始化一个默认矩形
+        self.render_scale_button_rect = pygame.Rect(0, 0, 300, 70)  # 初始化一个默认矩形
         self.hand_tracking_back_button_rect = pygame.Rect(0, 0, 300, 70)  # 初始化一个默认矩形
         
         # 隐藏所有按钮直到需要它们
         self.hide_all_buttons()    # 期末汇报（12月底）之前请勿乱用该项目
 
+    def active_gesture_game(self):
+        """返回当前手势模式使用的游戏对象（单人或双人）"""
+        return self.two_player_game if self.gesture_two_player else self.hand_tracking_game
+
+    def configure_hand_detector_capacity(self, max_hands):
+        """按需重建手部检测器，使一次检测最多返回max_hands只手"""
+        if self.hand_detector is None or self.hand_detector_max_hands == max_hands:
+            return
+        try:
+            from game.core.tflite_hand_detector import TFLiteHandDetector
+            if isinstance(self.hand_detector, TFLiteHandDetector):
+                detector = TFLiteHandDetector(max_hands=max_hands, min_detection_confidence=self.hand_detector.min_detection_confidence)
+                if not detector.is_loaded:
+                    raise RuntimeError("MediaPipe检测器未就绪")
+                self.hand_detector = detector
+            elif isinstance(self.hand_detector, SimpleHandDetector):
+                # 肤色检测器每帧只输出一只手，无法支持双人
+                print("SimpleHandDetector不支持多手检测，双人模式将只识别一只手")
+            else:
+                self.hand_detector = HandDetector(detectionCon=0.1, maxHands=max_hands)
+            self.hand_detector_max_hands = max_hands
+            print(f"手部检测器已切换为最多检测{max_hands}只手")
+        except Exception as e:
+            print(f"重建手部检测器失败: {e}")
+
     def _init_backup_hand_detector(self, detection_conf=0.5):
         """兜底初始化，优先尝试独立的MediaPipe检测器，最后再用SimpleHandDetector"""
         try:
@@ -683,6 +747,8 @@ class GameController:
             
             self.update_and_draw()
             pygame.display.flip()
+            # 上屏之后结算本帧的延迟
+            self.latency_monitor.present()
         self.cleanup()
 
     def handle_ui_events(self, event):
@@ -827,14 +893,17 @@ class GameController:
                 self.handle_classic_game_input(event)
         elif self.game_mode == 'hand_tracking':
             if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_m:
+                if event.key == pygame.K_F3:
+                    self.latency_monitor.show_overlay = not self.latency_monitor.show_overlay
+                elif event.key == pygame.K_F4:
+                    export_name = time.strftime("latency_%Y%m%d_%H%M%S.csv")
+                    self.latency_monitor.export_csv(os.path.join(os.path.dirname(GAME_DATA_FILE), export_name))
+                elif event.key == pygame.K_m:
                     if self.hand_tracking_game.score > self.high_score_gesture:
                         self.high_score_gesture = self.hand_tracking_game.score
                     save_game_data({'high_score_classic': self.high_score_classic, 'high_score_gesture': self.high_score_gesture, 'snake_color': self.snake_color}) 
                     self.game_mode = 'selection'
-                    if self.capture is not None:
-                        self.capture.release()
-                        self.capture = None
+                    self.release_camera()
                     self.show_menu_buttons()
                     global_particles.clear()
         elif self.game_mode == 'hand_tracking_settings':
@@ -847,7 +916,24 @@ class GameController:
                 if hasattr(self, 'camera_toggle_button_rect') and self.camera_toggle_button_rect.collidepoint(mouse_x, mouse_y):
                     self.hide_camera_feed = not self.hide_camera_feed
                     print(f"摄像头画面状态切换为: {'显示' if not self.hide_camera_feed else '隐藏'}")
-                    save_game_data({'high_score_classic': self.high_score_classic, 'high_score_gesture': self.high_score_gesture, 'snake_color': self.snake_color, 'hide_camera_feed': self.hide_camera_feed})
+                    self.save_gesture_settings()
+                    return
+
+                elif hasattr(self, 'two_player_toggle_button_rect') and self.two_player_toggle_button_rect.collidepoint(mouse_x, mouse_y):
+                    self.gesture_two_player = not self.gesture_two_player
+                    print(f"双人手势模式切换为: {'开启' if self.gesture_two_player else '关闭'}")
+                    self.save_gesture_settings()
+                    return
+
+                elif hasattr(self, 'render_scale_button_rect') and self.render_scale_button_rect.collidepoint(mouse_x, mouse_y):
+                    # 在预设的渲染比例之间循环切换
+                    if self.gesture_render_scale in RENDER_SCALE_OPTIONS:
+                        next_index = (RENDER_SCALE_OPTIONS.index(self.gesture_render_scale) + 1) % len(RENDER_SCALE_OPTIONS)
+                    else:
+                        next_index = 0
+                    self.apply_render_scale(RENDER_SCALE_OPTIONS[next_index])
+                    print(f"手势模式渲染比例切换为: {int(self.gesture_render_scale * 100)}%")
+                    save_game_data({'gesture_render_scale': self.gesture_render_scale})
                     return
 
                 elif hasattr(self, 'hand_tracking_back_button_rect') and self.hand_tracking_back_button_rect.collidepoint(mouse_x, mouse_y):
@@ -919,6 +1005,45 @@ class GameController:
                     self.game_mode = 'settings_menu'  # 返回设置菜单
                     return
     
+    def return_to_menu_from_pause(self):
+        """从暂停菜单返回主菜单，保存最高分并释放摄像头"""
+        if self.prev_game_mode == 'classic' and self.classic_game.score > self.high_score_classic:
+            self.high_score_classic = self.classic_game.score
+        elif self.prev_game_mode == 'hand_tracking' and self.hand_tracking_game.score > self.high_score_gesture:
+            self.high_score_gesture = self.hand_tracking_game.score
+
+        save_game_data({'high_score_classic': self.high_score_classic, 'high_score_gesture': self.high_score_gesture, 'snake_color': self.snake_color})
+
+        self.release_camera()
+
+        self.game_mode = 'selection'
+
+        self.show_menu_buttons()
+        global_particles.clear()
+
+    def recognize_gesture_command(self):
+        """用本帧检测得到的第一只手的关键点识别手势命令"""
+        # 肤色检测器输出的是估算关键点，无法区分手势
+        if isinstance(self.hand_detector, SimpleHandDetector):
+            return None
+        hands = self.last_detected_hands
+        return self.gesture_commands.update(hands[0]['lmList'] if hands else None)
+
+    def poll_gesture_command(self):
+        """在不运行游戏的界面（如暂停菜单）读取一帧摄像头并识别手势命令"""
+        if self.hand_detector is None or self.camera.health() != CAMERA_OK:
+            return None
+        try:
+            cam_img, _, camera_seq = self.camera.read()
+            if cam_img is None or camera_seq == self.last_camera_seq:
+                return None
+            self.last_camera_seq = camera_seq
+            self.detect_hands(cv2.flip(cam_img, 1))
+            return self.recognize_gesture_command()
+        except Exception as e:
+            print(f"手势命令识别错误: {e}")
+            return None
+
     def check_button_click(self, mouse_x, mouse_y):
         """检查鼠标点击了哪个按钮"""
         # 只有在selection模式下才检查按钮点击
@@ -997,7 +1122,7 @@ class GameController:
         # 根据游戏模式和游戏状态控制背景音乐
         if self.game_mode == 'classic' and not self.classic_game.game_over:
             self.play_bgm()
-        elif self.game_mode == 'hand_tracking' and not self.hand_tracking_game.gameOver:
+        elif self.game_mode == 'hand_tracking' and not self.active_gesture_game().gameOver:
             self.play_bgm()
         else:
             self.stop_bgm()
@@ -1012,9 +1137,7 @@ class GameController:
 
             if self.loading_progress < 20:
 
-                if self.capture is not None:
-                    self.capture.release()
-                    self.capture = None
+                self.release_camera()
                 self.loading_progress = 20
             elif self.loading_progress < 50:
 
@@ -1036,12 +1159,15 @@ class GameController:
                             print("cvzone.HandDetector初始化成功")
                         except Exception as e:
                             print(f"cvzone.HandDetector初始化失败: {e}")
+                self.configure_hand_detector_capacity(2 if self.gesture_two_player else 1)
                 self.loading_progress = 80
             elif self.loading_progress < 100:
 
                 self.hand_tracking_game.reset()
 
                 self.hand_tracking_game.snake_color = self.snake_color
+                self.two_player_game.reset()
+                self.hand_identity_tracker.reset()
                 self.loading_progress = 100
             
 
@@ -1160,60 +1286,106 @@ class GameController:
                     global_particles.clear()
 
         elif self.game_mode == 'hand_tracking':
-            snake_bg_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'resources', 'assets', 'images', 'snake.png')
-            if os.path.exists(snake_bg_path):
-                snake_bg = cv2.imread(snake_bg_path)
-                snake_bg = cv2.resize(snake_bg, (self.screen_width, self.screen_height))
-                img = snake_bg.copy()
-            else:
-                img = np.zeros((self.screen_height, self.screen_width, 3), dtype=np.uint8) + 20  
+            # 游戏帧按内部渲染分辨率绘制，最后在draw_opencv_image中一次性放大
+            space = self.coordinate_space
+            render_width, render_height = space.render_size
+            px = space.render_length
+            img = self.get_gesture_background().copy()
             
-            mouse_pos = pygame.mouse.get_pos()
-            mouse_clicked = pygame.mouse.get_pressed()[0] if self.hand_tracking_game.gameOver else False
+            gesture_game = self.active_gesture_game()
+            mouse_pos = space.screen_to_render(*pygame.mouse.get_pos())
+            mouse_clicked = pygame.mouse.get_pressed()[0] if gesture_game.gameOver else False
             
             hand_position = None
+            player_heads = [None, None]
+            hands_updated = False
             
-            if self.capture is not None and self.capture.isOpened():
+            frame_timing = None
+            cam_img, capture_time, camera_seq = self.camera.read()
+            if cam_img is not None:
                 try:
-                    success, cam_img = self.capture.read()
-                    if success and cam_img is not None:
-                        original_cam_img = cam_img.copy()
-                        
-                        if not self.hide_camera_feed:
-                            display_img = cv2.flip(original_cam_img, 1)  
-                            display_img = cv2.resize(display_img, (self.screen_width, self.screen_height))
-                            img = display_img.copy()
-                        
-                        if self.hand_detector is not None:
+                    if not self.hide_camera_feed:
+                        display_img = cv2.flip(cam_img, 1)  
+                        display_img = cv2.resize(display_img, (render_width, render_height))
+                        img = display_img.copy()
+                    
+                    if self.hand_detector is not None:
+                        if camera_seq != self.last_camera_seq:
+                            # 只对新到的帧做检测，渲染比摄像头快时沿用上一帧的结果
+                            self.last_camera_seq = camera_seq
+                            frame_timing = self.latency_monitor.begin_frame(camera_seq, capture_time)
                             try:
-                                detection_img = cv2.flip(original_cam_img, 1)
-                                hand_position = self.get_hand_position(detection_img)
+                                detection_img = cv2.flip(cam_img, 1)
+                                if self.gesture_two_player:
+                                    self.last_player_heads = self.get_hand_positions(detection_img)
+                                else:
+                                    self.last_hand_position = self.get_hand_position(detection_img)
+                                frame_timing.mark(STAGE_DETECTED)
+                                hands_updated = True
                             except Exception as e:
                                 print(f"手部检测错误: {e}")
+                        hand_position = self.last_hand_position
+                        player_heads = self.last_player_heads
                 except Exception as e:
-                    print(f"摄像头读取错误: {e}")
-            
-            if hand_position:
-                img = self.hand_tracking_game.update(img, hand_position, mouse_pos, mouse_clicked, self.high_score_gesture)
+                    print(f"摄像头画面处理错误: {e}")
+            
+            if hands_updated:
+                gesture_command = self.recognize_gesture_command()
+                if gesture_command == GESTURE_OPEN_PALM and not gesture_game.gameOver:
+                    # 张开手掌保持约1.5秒（PAUSE_HOLD_FRAMES）：暂停游戏，转向时短暂张开手掌不会触发
+                    self.prev_game_mode = 'hand_tracking'
+                    self.game_mode = 'pause_menu'
+                elif gesture_command == GESTURE_PINCH and gesture_game.gameOver:
+                    # 捏合：重新开始
+                    gesture_game.reset()
+                    self.hand_identity_tracker.reset()
+                elif gesture_command == GESTURE_FIST and gesture_game.gameOver:
+                    # 握拳：返回主菜单
+                    gesture_game.return_to_menu = True
+            
+            if self.gesture_two_player:
+                img = self.two_player_game.update(img, player_heads, mouse_pos, mouse_clicked, frame_timing=frame_timing, sample_time=capture_time)
+            elif hand_position:
+                img = self.hand_tracking_game.update(img, hand_position, mouse_pos, mouse_clicked, self.high_score_gesture, frame_timing=frame_timing, sample_time=capture_time)
             else:
-                img = self.hand_tracking_game.update(img, None, mouse_pos, mouse_clicked, self.high_score_gesture)
+                img = self.hand_tracking_game.update(img, None, mouse_pos, mouse_clicked, self.high_score_gesture, frame_timing=frame_timing, sample_time=capture_time)
                 try:
                     from game.utils.improved_chinese_text import put_chinese_text_pil
-                    img, _ = put_chinese_text_pil(img, get_translation('gesture_no_hand'), (self.screen_width//2 - 150, 50), 40, (255, 255, 0))
+                    img, _ = put_chinese_text_pil(img, get_translation('gesture_no_hand'), (render_width//2 - px(150), px(50)), px(40), (255, 255, 0))
                 except Exception as e:
                     print(f"中文显示错误: {e}")
-                    cv2.putText(img, get_translation('gesture_no_hand'), (self.screen_width//2 - 150, 50), cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 255, 0), 2)
+                    cv2.putText(img, get_translation('gesture_no_hand'), (render_width//2 - px(150), px(50)), cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 255, 0), 2)
             
             if self.hand_tracking_game.score > self.high_score_gesture:
                 self.high_score_gesture = self.hand_tracking_game.score
                 save_game_data({'high_score_classic': self.high_score_classic, 'high_score_gesture': self.high_score_gesture, 'snake_color': self.snake_color})
             
-            if self.hand_tracking_game.return_to_menu:
+            camera_health = self.camera.health()
+            if camera_health in (CAMERA_STALLED, CAMERA_RECONNECTING):
+                try:
+                    status_key = 'camera_reconnecting' if camera_health == CAMERA_RECONNECTING else 'camera_stalled'
+                    img, _ = put_chinese_text_pil(img, get_translation(status_key), (render_width//2 - px(200), px(110)), px(32), (0, 165, 255))
+                except Exception as e:
+                    print(f"摄像头状态显示错误: {e}")
+            
+            if frame_timing is not None:
+                frame_timing.mark(STAGE_UPDATED)
+            
+            if self.latency_monitor.show_overlay:
+                gate_stats = self.motion_gate.stats()
+                gate_line = f"motion gate: skipped {gate_stats['skipped']}/{gate_stats['frames']} ({gate_stats['skip_ratio'] * 100:.1f}%)"
+                img = self.latency_monitor.draw_overlay(img, [gate_line, f"camera: {camera_health}"])
+            
+            if gesture_game.gameOver and self.hand_detector is not None:
+                try:
+                    img, _ = put_chinese_text_pil(img, get_translation('gesture_command_game_over_hint'), (render_width//2 - px(300), render_height - px(120)), px(32), (255, 255, 255))
+                except Exception as e:
+                    print(f"手势提示显示错误: {e}")
+            
+            if gesture_game.return_to_menu:
                 self.stop_bgm()
                 self.game_mode = 'selection'
-                if self.capture is not None:
-                    self.capture.release()
-                    self.capture = None
+                self.release_camera()
                 self.show_menu_buttons()
                 global_particles.clear()
             
@@ -1222,6 +1394,16 @@ class GameController:
         
         elif self.game_mode == 'pause_menu':
 
+            # 手势模式暂停时继续读取摄像头，支持捏合继续、握拳返回菜单
+            if self.prev_game_mode == 'hand_tracking':
+                gesture_command = self.poll_gesture_command()
+                if gesture_command == GESTURE_PINCH:
+                    self.game_mode = self.prev_game_mode
+                    return
+                elif gesture_command == GESTURE_FIST:
+                    self.return_to_menu_from_pause()
+                    return
+
             overlay = pygame.Surface((self.screen_width, self.screen_height), pygame.SRCALPHA)
             overlay.fill((0, 0, 0, 180))
             self.screen.blit(overlay, (0, 0))
@@ -1336,22 +1518,7 @@ class GameController:
                     self.game_mode = self.prev_game_mode
                 elif menu_button_rect.collidepoint(mouse_pos):
 
-
-                    if self.prev_game_mode == 'classic' and self.classic_game.score > self.high_score_classic:
-                        self.high_score_classic = self.classic_game.score
-                    elif self.prev_game_mode == 'hand_tracking' and self.hand_tracking_game.score > self.high_score_gesture:
-                        self.high_score_gesture = self.hand_tracking_game.score
-
-                    save_game_data({'high_score_classic': self.high_score_classic, 'high_score_gesture': self.high_score_gesture, 'snake_color': self.snake_color})
-
-                    if self.capture is not None:
-                        self.capture.release()
-                        self.capture = None
-
-                    self.game_mode = 'selection'
-
-                    self.show_menu_buttons()
-                    global_particles.clear()
+                    self.return_to_menu_from_pause()
                 elif exit_button_rect.collidepoint(mouse_pos):
 
                     pygame.event.post(pygame.event.Event(pygame.QUIT))
@@ -1627,7 +1794,7 @@ class GameController:
             button_hover_color = (150, 150, 150)
             text_color = (255, 255, 255)
 
-            num_buttons = 2
+            num_buttons = 4
             title_button_spacing = 60  
             total_menu_height = title_height + title_button_spacing + (num_buttons * button_height) + ((num_buttons - 1) * button_spacing)
 
@@ -1658,10 +1825,25 @@ class GameController:
             )
             camera_toggle_button_rect = self.camera_toggle_button_rect
             
+            self.two_player_toggle_button_rect = pygame.Rect(
+                self.screen_width//2 - button_width//2,
+                button_y_start + button_height + button_spacing,
+                button_width,
+                button_height
+            )
+            two_player_toggle_button_rect = self.two_player_toggle_button_rect
+
+            self.render_scale_button_rect = pygame.Rect(
+                self.screen_width//2 - button_width//2,
+                button_y_start + 2 * (button_height + button_spacing),
+                button_width,
+                button_height
+            )
+            render_scale_button_rect = self.render_scale_button_rect
 
             self.hand_tracking_back_button_rect = pygame.Rect(
                 self.screen_width//2 - button_width//2,
-                button_y_start + button_height + button_spacing,
+                button_y_start + 3 * (button_height + button_spacing),
                 button_width,
                 button_height
             )
@@ -1688,6 +1870,29 @@ class GameController:
             except Exception as e:
                 print(f"摄像头开关按钮文本渲染错误: {e}")
             
+            two_player_toggle_button_color = button_hover_color if two_player_toggle_button_rect.collidepoint(mouse_pos) else button_color
+            pygame.draw.rect(self.screen, two_player_toggle_button_color, two_player_toggle_button_rect, border_radius=10)
+            if self.gesture_two_player:
+                two_player_toggle_text = get_translation('settings_two_player_on')
+            else:
+                two_player_toggle_text = get_translation('settings_two_player_off')
+            try:
+                two_player_toggle_surface = self.font_small.render(two_player_toggle_text, True, text_color)
+                two_player_toggle_text_rect = two_player_toggle_surface.get_rect(center=two_player_toggle_button_rect.center)
+                self.screen.blit(two_player_toggle_surface, two_player_toggle_text_rect)
+            except Exception as e:
+                print(f"双人模式按钮文本渲染错误: {e}")
+            
+            render_scale_button_color = button_hover_color if render_scale_button_rect.collidepoint(mouse_pos) else button_color
+            pygame.draw.rect(self.screen, render_scale_button_color, render_scale_button_rect, border_radius=10)
+            render_scale_text = get_translation('settings_render_scale').format(int(self.gesture_render_scale * 100))
+            try:
+                render_scale_surface = self.font_small.render(render_scale_text, True, text_color)
+                render_scale_text_rect = render_scale_surface.get_rect(center=render_scale_button_rect.center)
+                self.screen.blit(render_scale_surface, render_scale_text_rect)
+            except Exception as e:
+                print(f"渲染比例按钮文本渲染错误: {e}")
+            
             back_button_color = button_hover_color if back_button_rect.collidepoint(mouse_pos) else button_color
             pygame.draw.rect(self.screen, back_button_color, back_button_rect, border_radius=10)
             back_text = get_translation('settings_return')
@@ -1724,41 +1929,75 @@ class GameController:
             
             # 直接在BGR图像上进行检测，避免颜色转换，提高性能
             # cvzone的HandDetector实际上支持BGR格式，无需转换
-            hands, _ = self.hand_detector.findHands(img, draw=False, flipType=False)
+            hands = self.detect_hands(img)
             
             if hands:
-                hand = hands[0]
-                lmList = hand['lmList']
-                # lmList包含21个手部关键点，索引8是食指指尖
-                # 优化：即使只有部分关键点，只要有食指指尖（索引8）就能工作
-                if len(lmList) >= 9:  # 确保至少有9个关键点，包含食指指尖
-                    # 获取食指指尖坐标（索引8）
-                    index_x = int(lmList[8][0])
-                    index_y = int(lmList[8][1])
-                    
-                    # 摄像头分辨率固定为1280x720，需要映射到游戏窗口分辨率
-                    # 计算缩放比例
-                    cam_width = 1280
-                    cam_height = 720
-                    
-                    # 将摄像头坐标映射到游戏窗口坐标
-                    scale_x = self.screen_width / cam_width
-                    scale_y = self.screen_height / cam_height
-                    
-                    # 应用缩放，确保蛇跟着手指方向正确移动
-                    game_x = int(index_x * scale_x)
-                    game_y = int(index_y * scale_y)
-                    
-                    # 确保坐标在游戏窗口范围内
-                    game_x = max(0, min(self.screen_width, game_x))
-                    game_y = max(0, min(self.screen_height, game_y))
-                    
-                    return game_x, game_y
+                return self.index_tip_to_logical(hands[0]['lmList'])
             return None
         except Exception as e:
             print(f"获取手部位置错误: {e}")
             return None
 
+    def get_hand_positions(self, img):
+        """双人模式：一次检测得到所有手，再按身份跟踪分配给两个玩家"""
+        try:
+            if img is None or len(img.shape) != 3 or img.shape[2] < 3:
+                return [None] * self.hand_identity_tracker.num_players
+            
+            # 只调用一次检测器，两名玩家共享同一次推理
+            hands = self.detect_hands(img)
+            
+            candidates = []
+            for hand in hands or []:
+                position = self.index_tip_to_logical(hand['lmList'])
+                if position is not None:
+                    candidates.append({'pos': position, 'type': hand.get('type')})
+            return self.hand_identity_tracker.assign(candidates, self.coordinate_space.logical_width)
+        except Exception as e:
+            print(f"获取多手位置错误: {e}")
+            return [None] * self.hand_identity_tracker.num_players
+
+    def detect_hands(self, img):
+        """经过运动门控的手部检测，画面静止时直接复用上一次的关键点"""
+        if not self.motion_gate.should_detect(img):
+            return self.last_detected_hands
+        hands, _ = self.hand_detector.findHands(img, draw=False, flipType=False)
+        self.last_detected_hands = hands or []
+        return self.last_detected_hands
+
+    def index_tip_to_logical(self, lmList):
+        """把食指指尖（关键点8）从摄像头坐标映射到手势模式的逻辑坐标"""
+        # lmList包含21个手部关键点，索引8是食指指尖
+        # 优化：即使只有部分关键点，只要有食指指尖（索引8）就能工作
+        if len(lmList) < 9:  # 确保至少有9个关键点，包含食指指尖
+            return None
+        
+        # 获取食指指尖坐标（索引8），换算和边界限制统一由CoordinateSpace完成
+        return self.coordinate_space.camera_to_logical(lmList[8][0], lmList[8][1])
+
+    def apply_render_scale(self, render_scale):
+        """切换手势模式的内部渲染比例，逻辑坐标不受影响"""
+        self.gesture_render_scale = render_scale
+        self.coordinate_space = CoordinateSpace((self.screen_width, self.screen_height), render_scale=render_scale)
+        self.hand_tracking_game.set_coordinate_space(self.coordinate_space)
+        self.two_player_game.set_coordinate_space(self.coordinate_space)
+
+    def save_gesture_settings(self):
+        """保存手势模式相关的设置，save_game_data只更新这几项，最高分等其他数据保持不变"""
+        save_game_data({'hide_camera_feed': self.hide_camera_feed, 'gesture_two_player': self.gesture_two_player})
+
+    def get_gesture_background(self):
+        """手势模式的固定背景，按渲染分辨率缓存，避免每帧读盘和缩放"""
+        render_size = self.coordinate_space.render_size
+        if self.gesture_background is None or self.gesture_background.shape[1::-1] != render_size:
+            snake_bg_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'resources', 'assets', 'images', 'snake.png')
+            snake_bg = cv2.imread(snake_bg_path) if os.path.exists(snake_bg_path) else None
+            if snake_bg is not None:
+                self.gesture_background = cv2.resize(snake_bg, render_size, interpolation=cv2.INTER_AREA)
+            else:
+                self.gesture_background = np.zeros((render_size[1], render_size[0], 3), dtype=np.uint8) + 20
+        return self.gesture_background
+
     def draw_opencv_image(self, img):
         """将OpenCV图像绘制到pygame屏幕上"""
         # 确保图像数据类型正确
@@ -1788,21 +2027,31 @@ class GameController:
         else:
             return  # 不支持的图像维度
         
+        # 以较低分辨率渲染的帧在这里一次性放大到屏幕尺寸
+        if surface.get_size() != (self.screen_width, self.screen_height):
+            surface = pygame.transform.smoothscale(surface, (self.screen_width, self.screen_height))
+        
         # 将表面绘制到屏幕上
         self.screen.blit(surface, (0, 0))
 
+    def release_camera(self):
+        """停止摄像头采集线程，并输出本次运动门控节省的检测次数"""
+        self.camera.stop()
+        self.last_camera_seq = 0
+        self.last_hand_position = None
+        self.last_player_heads = [None, None]
+        if self.motion_gate.total_frames:
+            print(self.motion_gate.summary())
+        self.motion_gate.reset()
+        self.last_detected_hands = []
+        self.gesture_commands.reset()
+
     def initialize_camera(self):
+        """启动后台采集线程，打开设备和失败重连都不会阻塞渲染循环"""
         try:
-            if self.capture is not None:
-                self.capture.release()
-            # 使用指定的分辨率初始化摄像头
-            self.capture = cv2.VideoCapture(0)
-            if self.capture.isOpened():
-                self.capture.set(3, 1280)  # 设置宽度
-                self.capture.set(4, 720)   # 设置高度
+            self.camera.start()
         except Exception as e:
             print(f"摄像头初始化错误: {e}")
-            self.capture = None
     
     def draw_hand_tracking_ui(self, img):
         game = self.hand_tracking_game
@@ -1843,7 +2092,7 @@ class GameController:
         return img
 
     def cleanup(self):
-        if self.capture: self.capture.release()
+        self.release_camera()
         pygame.quit()
 
 if __name__ == '__main__':
@@ -0,0 +1,152 @@
+import functools
+
+import numpy as np
+from PIL import Image, ImageDraw
+
+from game.core.sprite import Sprite
+from game.utils.improved_chinese_text import _get_font
+
+
+@functools.lru_cache(maxsize=32)
+def cached_font(font_size):
+    """按字号缓存字体对象，避免每次测量或绘制都重新加载字体文件"""
+    return _get_font(font_size)
+
+
+# 测量文字用的画布，全模块共用一个
+_measure_draw = ImageDraw.Draw(Image.new('RGB', (1, 1)))
+
+
+def measure_text(text, font_size):
+    """返回文字渲染后的(宽, 高)"""
+    font = cached_font(font_size)
+    try:
+        bbox = _measure_draw.textbbox((0, 0), text, font=font)
+        return bbox[2] - bbox[0], bbox[3] - bbox[1]
+    except AttributeError:
+        return _measure_draw.textsize(text, font=font)
+
+
+def _rgba(bgr, alpha=255):
+    return int(bgr[2]), int(bgr[1]), int(bgr[0]), int(alpha)
+
+
+class GameOverOverlay:
+    """缓存的游戏结束画面
+
+    游戏结束时把标题、分数和按钮一次性用PIL画到一个透明的BGRA图层上，
+    之后每帧只需把这个图层（转换成预乘alpha的Sprite）混合到画面上。
+    只有内容（content_key）或鼠标悬停的按钮变化时才重新生成图层，
+    按钮的点击和悬停判断直接使用生成图层时记录的按钮矩形。
+
+    文字元素是字典：{'text', 'position'(左上角), 'font_size', 'color'(BGR), 'background'(可选, (BGR, 不透明度))}
+    按钮元素是字典：{'id', 'rect'(x, y, w, h), 'label', 'font_size', 'color'(BGR)}，文字在按钮内居中
+    """
+
+    def __init__(self, border_color=(255, 255, 255), border_width=3, hover_lighten=40):
+        self.border_color = border_color
+        self.border_width = border_width
+        self.hover_lighten = hover_lighten
+        self.clear()
+
+    def clear(self):
+        self.content_key = None
+        self.size = (0, 0)
+        self.texts = []
+        self.buttons = []
+        self.hovered = None
+        self.sprite = None
+        self.offset = (0, 0)
+
+    def needs_layout(self, content_key):
+        """内容变化（分数、文字、画面尺寸等）时需要调用方重新提供布局"""
+        return content_key != self.content_key
+
+    def set_layout(self, content_key, size, texts, buttons):
+        """
+        设置布局并生成图层
+
+        参数:
+            content_key: 描述内容的可比较对象，相同时不会重建
+            size: 画面尺寸(宽, 高)
+        """
+        self.content_key = content_key
+        self.size = size
+        self.texts = list(texts)
+        self.buttons = list(buttons)
+        self.hovered = None
+        self._rebuild()
+
+    def button_at(self, pos):
+        """返回pos处按钮的id，不在任何按钮上时返回None"""
+        if pos is None:
+            return None
+        x, y = pos
+        for button in self.buttons:
+            bx, by, bw, bh = button['rect']
+            if bx <= x <= bx + bw and by <= y <= by + bh:
+                return button['id']
+        return None
+
+    def update_hover(self, pos):
+        """更新悬停的按钮，变化时重建图层"""
+        hovered = self.button_at(pos)
+        if hovered != self.hovered:
+            self.hovered = hovered
+            self._rebuild()
+        return hovered
+
+    def draw(self, img):
+        """把缓存的图层混合到img上"""
+        if self.sprite is not None:
+            self.sprite.draw(img, *self.offset)
+        return img
+
+    def _rebuild(self):
+        width, height = self.size
+        layer = Image.new('RGBA', (max(1, width), max(1, height)), (0, 0, 0, 0))
+        draw = ImageDraw.Draw(layer)
+
+        for item in self.texts:
+            font = cached_font(item['font_size'])
+            x, y = item['position']
+            background = item.get('background')
+            if background is not None:
+                bg_color, opacity = background
+                try:
+                    bbox = draw.textbbox((x, y), item['text'], font=font)
+                except AttributeError:
+                    text_width, text_height = draw.textsize(item['text'], font=font)
+                    bbox = (x, y, x + text_width, y + text_height)
+                draw.rectangle((bbox[0] - 5, bbox[1] - 5, bbox[2] + 5, bbox[3] + 5), fill=_rgba(bg_color, 255 * opacity))
+            draw.text((x, y), item['text'], font=font, fill=_rgba(item['color']))
+
+        for button in self.buttons:
+            bx, by, bw, bh = button['rect']
+            color = button['color']
+            if button['id'] == self.hovered:
+                color = tuple(min(255, c + self.hover_lighten) for c in color)
+            draw.rectangle((bx, by, bx + bw, by + bh), fill=_rgba(color), outline=_rgba(self.border_color), width=self.border_width)
+
+            font = cached_font(button['font_size'])
+            try:
+                left, top, right, bottom = draw.textbbox((0, 0), button['label'], font=font)
+            except AttributeError:
+                text_width, text_height = draw.textsize(button['label'], font=font)
+                left, top, right, bottom = 0, 0, text_width, text_height
+            text_x = bx + (bw - (right - left)) // 2 - left
+            text_y = by + (bh - (bottom - top)) // 2 - top
+            draw.text((text_x, text_y), button['label'], font=font, fill=_rgba((255, 255, 255)))
+
+        # RGBA -> BGRA，并裁掉全透明的边缘，每帧只混合有内容的区域
+        rgba = np.asarray(layer)
+        visible_rows = np.flatnonzero(rgba[:, :, 3].any(axis=1))
+        visible_cols = np.flatnonzero(rgba[:, :, 3].any(axis=0))
+        if len(visible_rows) == 0:
+            self.sprite = None
+            return
+        y0, y1 = visible_rows[0], visible_rows[-1] + 1
+        x0, x1 = visible_cols[0], visible_cols[-1] + 1
+        bgra = np.ascontiguousarray(rgba[y0:y1, x0:x1][:, :, [2, 1, 0, 3]])
+        self.sprite = Sprite(bgra)
+        self.offset = (int(x0), int(y0))
@@ -9,12 +9,7 @@ from game.utils.improved_chinese_text import put_chinese_text_pil, put_rainbow_t
 from game.utils.language_manager import get_translation
 
 
-gradient_colors_data = {
-    "彩虹": [((255,0,0),(255,165,0)), ((255,165,0),(255,255,0)), ((255,255,0),(0,128,0)), ((0,128,0),(0,0,255)), ((0,0,255),(75,0,130)), ((75,0,130),(238,130,238))],
-    "蓝绿渐变": ((0, 0, 255), (0, 255, 0)), 
-    "火热渐变": ((255, 0, 0), (255, 255, 0)), 
-    "宇宙渐变": ((128, 0, 128), (0, 0, 128))  
-}
+from game.core.palette import gradient_colors_data, palette
 
 
 global_particles = []
@@ -470,28 +465,16 @@ def draw_settings_screen(img, current_color, mouse_pos=None, hovered_color=None,
     # 使用中文渐变颜色名称，与gradient_colors_data的键对应
     gradient_color_names = [get_translation('gradient_rainbow'), get_translation('gradient_blue_green'), get_translation('gradient_fire'), get_translation('gradient_cosmic')]
 
-    for i, (grad_name, grad_value) in enumerate(gradient_colors_data.items()):
+    for i, grad_name in enumerate(palette.names()):
         col = i % gradient_grid_cols
         row = i // gradient_grid_cols
         x = gradient_actual_start_x + (col * (block_size + spacing))
         y = gradient_start_y + (row * (gradient_display_height + text_height_offset + spacing))
 
-        # 绘制渐变颜色块
-        if grad_name == "彩虹":
-            # 对于彩虹色，绘制一个彩色渐变条
-            for j in range(block_size):
-                # 创建彩虹渐变效果，确保hue值在0-255范围内
-                hue = int(359 * j / block_size)  # 使用359代替360，确保最大值为359
-                r, g, b = cv2.cvtColor(np.array([[[hue, 255, 255]]], dtype=np.uint8), cv2.COLOR_HSV2RGB)[0][0]
-                # 将RGB值转换为整数
-                r, g, b = int(r), int(g), int(b)
-                cv2.line(bg, (x + j, y), (x + j, y + gradient_display_height), (b, g, r), 1)
-        else:
-            # 对于双色渐变，绘制两半
-            color1_bgr = (grad_value[0][2], grad_value[0][1], grad_value[0][0])
-            color2_bgr = (grad_value[1][2], grad_value[1][1], grad_value[1][0])
-            cv2.rectangle(bg, (x + block_size // 2, y), (x + block_size, y + gradient_display_height), color2_bgr, -1)
-            cv2.rectangle(bg, (x, y), (x + block_size // 2, y + gradient_display_height), color1_bgr, -1)
+        # 绘制渐变颜色块：直接用调色板的查找表按列填充，与蛇身实际颜色一致
+        block = bg[y:y + gradient_display_height, x:x + block_size]
+        if block.size:
+            block[:] = palette.along_body(grad_name, block_size, 'bgr')[None, :block.shape[1]]
 
         # 如果是当前选中的渐变颜色，添加一个淡色边框
         if isinstance(current_color, str) and current_color == grad_name:
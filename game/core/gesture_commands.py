@@ -0,0 +1,96 @@
+import numpy as np
+
+
+# 手势命令
+GESTURE_NONE = None
+GESTURE_PINCH = 'pinch'          # 拇指和食指指尖捏合
+GESTURE_OPEN_PALM = 'open_palm'  # 五指张开
+GESTURE_FIST = 'fist'            # 握拳
+
+# MediaPipe 21点手部关键点索引
+WRIST = 0
+THUMB_TIP = 4
+INDEX_MCP = 5
+MIDDLE_MCP = 9
+FINGER_PIPS = [6, 10, 14, 18]    # 食指、中指、无名指、小指的第二关节
+FINGER_TIPS = [8, 12, 16, 20]    # 对应的指尖
+
+
+def classify_hand_pose(lmList):
+    """
+    根据一只手的21个关键点判断静态手势，只做几次向量运算，不需要额外的模型推理
+
+    返回:
+        GESTURE_PINCH / GESTURE_OPEN_PALM / GESTURE_FIST，无法识别时返回None
+    """
+    if lmList is None or len(lmList) < 21:
+        return GESTURE_NONE
+
+    points = np.asarray(lmList, dtype=np.float32)[:, :2]
+    wrist = points[WRIST]
+
+    # 用手腕到中指根部的距离作为手的尺度，使判断与手离摄像头的远近无关
+    hand_scale = float(np.linalg.norm(points[MIDDLE_MCP] - wrist))
+    if hand_scale < 1e-3:
+        return GESTURE_NONE
+
+    tip_distances = np.linalg.norm(points[FINGER_TIPS] - wrist, axis=1)
+    pip_distances = np.linalg.norm(points[FINGER_PIPS] - wrist, axis=1)
+    extended = tip_distances > pip_distances * 1.15
+    extended_count = int(np.count_nonzero(extended))
+
+    pinch_distance = float(np.linalg.norm(points[THUMB_TIP] - points[FINGER_TIPS[0]])) / hand_scale
+    thumb_spread = float(np.linalg.norm(points[THUMB_TIP] - points[INDEX_MCP])) / hand_scale
+
+    if pinch_distance < 0.25 and extended_count <= 3:
+        return GESTURE_PINCH
+    if extended_count == 4 and thumb_spread > 0.6:
+        return GESTURE_OPEN_PALM
+    if extended_count == 0:
+        return GESTURE_FIST
+    return GESTURE_NONE
+
+
+# 游戏进行中转向时手掌经常是张开的，暂停要保持更久（摄像头约30帧/秒时约1.5秒）才触发，避免误暂停
+PAUSE_HOLD_FRAMES = 45
+
+
+class GestureCommandRecognizer:
+    """对逐帧手势做防抖：同一手势保持若干帧后触发一次命令，换手势之前不会重复触发
+
+    张开手掌（暂停）需要保持pause_hold_frames帧，其余手势保持hold_frames帧；
+    中途换成别的手势或手离开画面都会从头计数，触发之后要先换手势才能再次触发。
+    """
+
+    def __init__(self, hold_frames=8, pause_hold_frames=PAUSE_HOLD_FRAMES):
+        self.hold_frames = hold_frames
+        self.pause_hold_frames = pause_hold_frames
+        self.reset()
+
+    def reset(self):
+        self.current_pose = GESTURE_NONE
+        self.pose_frames = 0
+        self.fired = False
+
+    def required_frames(self, pose):
+        """pose需要连续保持的帧数"""
+        return self.pause_hold_frames if pose == GESTURE_OPEN_PALM else self.hold_frames
+
+    def update(self, lmList):
+        """
+        输入本帧的关键点（没有手时传None），返回本帧触发的命令或None
+        """
+        pose = classify_hand_pose(lmList)
+        if pose != self.current_pose:
+            self.current_pose = pose
+            self.pose_frames = 0
+            self.fired = False
+
+        if pose is GESTURE_NONE:
+            return GESTURE_NONE
+
+        self.pose_frames += 1
+        if not self.fired and self.pose_frames >= self.required_frames(pose):
+            self.fired = True
+            return pose
+        return GESTURE_NONE
@@ -0,0 +1,113 @@
+import math
+from itertools import permutations
+
+
+class HandIdentityTracker:
+    """把同一帧检测到的多只手稳定地分配给玩家槽位
+
+    一次检测（max_num_hands=2）得到的手部列表顺序并不稳定，两只手交叉时还会互换。
+    这里用「预测位置的距离 + 左右手标签不一致的惩罚」作为代价，枚举所有分配方案取代价最小的，
+    从而在手交叉、短暂丢失时仍保持玩家身份不变。
+    """
+
+    def __init__(self, num_players=2, max_jump=450, handedness_penalty=150, new_hand_cost=200, lost_frames=15):
+        self.num_players = num_players
+        self.max_jump = max_jump                      # 单帧内允许的最大跳变距离（像素）
+        self.handedness_penalty = handedness_penalty  # 左右手标签与槽位记录不一致时的额外代价
+        self.new_hand_cost = new_hand_cost            # 把手分配给空槽位的基础代价
+        self.lost_frames = lost_frames                # 连续丢失多少帧后释放槽位
+        self.reset()
+
+    def reset(self):
+        """清空所有槽位"""
+        self.slots = [
+            {'pos': None, 'vel': (0.0, 0.0), 'type': None, 'missed': 0}
+            for _ in range(self.num_players)
+        ]
+
+    def _pair_cost(self, slot_index, hand, frame_width):
+        """计算把一只手分配给某个槽位的代价"""
+        slot = self.slots[slot_index]
+        x, y = hand['pos']
+
+        if slot['pos'] is None:
+            # 空槽位：按屏幕左右分区决定初始归属，玩家1在左、玩家2在右
+            home_x = frame_width * (slot_index + 0.5) / self.num_players
+            cost = self.new_hand_cost + abs(x - home_x)
+        else:
+            # 已有轨迹：与按速度外推的预测位置比较
+            pred_x = slot['pos'][0] + slot['vel'][0]
+            pred_y = slot['pos'][1] + slot['vel'][1]
+            distance = math.hypot(x - pred_x, y - pred_y)
+            if distance > self.max_jump:
+                return None
+            cost = distance
+
+        if slot['type'] is not None and hand.get('type') is not None and hand['type'] != slot['type']:
+            cost += self.handedness_penalty
+        return cost
+
+    def assign(self, hands, frame_width):
+        """
+        分配本帧的手部到玩家槽位
+
+        参数:
+            hands: [{'pos': (x, y), 'type': 'Left'/'Right'}, ...]
+            frame_width: 坐标所在画面的宽度，用于空槽位的左右分区
+
+        返回:
+            长度为num_players的列表，元素为(x, y)或None
+        """
+        hands = list(hands)[:self.num_players]
+        best_cost = None
+        best_mapping = ()
+
+        # 最多两只手、两个槽位，穷举全部分配方案的开销可以忽略
+        for count in range(len(hands), -1, -1):
+            for hand_indices in permutations(range(len(hands)), count):
+                for slot_indices in permutations(range(self.num_players), count):
+                    cost = 0.0
+                    valid = True
+                    for hand_index, slot_index in zip(hand_indices, slot_indices):
+                        pair_cost = self._pair_cost(slot_index, hands[hand_index], frame_width)
+                        if pair_cost is None:
+                            valid = False
+                            break
+                        cost += pair_cost
+                    if not valid:
+                        continue
+                    # 每少分配一只手都要付出代价，避免把检测结果白白丢掉
+                    cost += (len(hands) - count) * self.max_jump
+                    if best_cost is None or cost < best_cost:
+                        best_cost = cost
+                        best_mapping = tuple(zip(hand_indices, slot_indices))
+            if best_cost is not None and count == len(hands):
+                break
+
+        assigned = [None] * self.num_players
+        matched_slots = set()
+        for hand_index, slot_index in best_mapping:
+            hand = hands[hand_index]
+            slot = self.slots[slot_index]
+            x, y = hand['pos']
+            if slot['pos'] is not None:
+                # 对速度做指数平滑，减少预测抖动
+                vx = 0.5 * slot['vel'][0] + 0.5 * (x - slot['pos'][0])
+                vy = 0.5 * slot['vel'][1] + 0.5 * (y - slot['pos'][1])
+                slot['vel'] = (vx, vy)
+            if slot['type'] is None:
+                slot['type'] = hand.get('type')
+            slot['pos'] = (x, y)
+            slot['missed'] = 0
+            assigned[slot_index] = (x, y)
+            matched_slots.add(slot_index)
+
+        for slot_index, slot in enumerate(self.slots):
+            if slot_index in matched_slots:
+                continue
+            slot['missed'] += 1
+            slot['vel'] = (0.0, 0.0)
+            if slot['missed'] > self.lost_frames:
+                self.slots[slot_index] = {'pos': None, 'vel': (0.0, 0.0), 'type': None, 'missed': 0}
+
+        return assigned
@@ -0,0 +1,72 @@
+import time
+from collections import deque
+
+import numpy as np
+
+
+class DirectionInputQueue:
+    """经典模式的方向输入队列
+
+    按键时把(方向, 按键时间)放进有界队列，蛇每走一步只取出一条，
+    所以一个移动间隔内连按的两个键（例如先上再左的快速掉头）都会依次生效，不会被后一个覆盖。
+    入队时相对队尾方向检查，出队时再相对蛇当前的实际方向检查一次，掉头和重复方向都会被丢弃。
+    出队时记录从按键到真正转向的延迟，用latency_stats查看。
+    """
+
+    def __init__(self, capacity=3, clock=time.perf_counter, history=256):
+        self.capacity = capacity
+        self.clock = clock
+        self.entries = deque()
+        self.latencies = deque(maxlen=history)  # 按键到转向的延迟（毫秒）
+        self.dropped = 0                         # 因队列已满或方向无效被丢弃的按键数
+
+    def clear(self):
+        self.entries.clear()
+
+    def __len__(self):
+        return len(self.entries)
+
+    @staticmethod
+    def is_valid_turn(direction, current):
+        """不能原地掉头，也不能与当前方向相同"""
+        return direction != current and (direction[0] + current[0], direction[1] + current[1]) != (0, 0)
+
+    def push(self, direction, current_direction, timestamp=None):
+        """
+        加入一次按键
+
+        参数:
+            current_direction: 蛇当前的方向，队列为空时用它做检查
+
+        返回:
+            是否成功入队
+        """
+        last = self.entries[-1][0] if self.entries else current_direction
+        if len(self.entries) >= self.capacity or not self.is_valid_turn(direction, last):
+            self.dropped += 1
+            return False
+        self.entries.append((direction, self.clock() if timestamp is None else timestamp))
+        return True
+
+    def pop(self, current_direction):
+        """取出下一条对当前方向有效的转向，没有时返回None"""
+        while self.entries:
+            direction, timestamp = self.entries.popleft()
+            if self.is_valid_turn(direction, current_direction):
+                self.latencies.append((self.clock() - timestamp) * 1000.0)
+                return direction
+            self.dropped += 1
+        return None
+
+    def latency_stats(self):
+        """返回按键到转向延迟的统计（毫秒）"""
+        if not self.latencies:
+            return {'count': 0, 'mean': 0.0, 'p95': 0.0, 'max': 0.0, 'dropped': self.dropped}
+        values = np.fromiter(self.latencies, dtype=np.float64)
+        return {
+            'count': len(values),
+            'mean': float(values.mean()),
+            'p95': float(np.percentile(values, 95)),
+            'max': float(values.max()),
+            'dropped': self.dropped,
+        }
@@ -0,0 +1,155 @@
+import csv
+import os
+import time
+from collections import deque
+
+import cv2
+import numpy as np
+
+
+# 帧在管线中经过的时间点，按先后顺序排列
+STAGE_CAPTURED = 'captured'    # 摄像头线程拿到这一帧
+STAGE_DETECTED = 'detected'    # 手部检测完成
+STAGE_SMOOTHED = 'smoothed'    # 蛇头平滑完成
+STAGE_UPDATED = 'updated'      # SnakeGame.update 返回
+STAGE_PRESENTED = 'presented'  # pygame.display.flip 之后
+STAGES = [STAGE_CAPTURED, STAGE_DETECTED, STAGE_SMOOTHED, STAGE_UPDATED, STAGE_PRESENTED]
+
+# 统计的区间：相邻阶段之间的耗时，加上从采集到上屏的端到端延迟
+SPANS = [
+    ('detect', STAGE_CAPTURED, STAGE_DETECTED),
+    ('smooth', STAGE_DETECTED, STAGE_SMOOTHED),
+    ('update', STAGE_SMOOTHED, STAGE_UPDATED),
+    ('present', STAGE_UPDATED, STAGE_PRESENTED),
+    ('total', STAGE_CAPTURED, STAGE_PRESENTED),
+]
+
+
+class FrameTiming:
+    """一帧摄像头画面在各阶段的时间戳（time.perf_counter，秒）"""
+
+    def __init__(self, seq, capture_time):
+        self.seq = seq
+        self.marks = {STAGE_CAPTURED: capture_time}
+
+    def mark(self, stage):
+        # 同一阶段只记录第一次，保证统计的是这一帧第一次走到该阶段的时间
+        if stage not in self.marks:
+            self.marks[stage] = time.perf_counter()
+
+
+class LatencyMonitor:
+    """手势模式的动作到上屏（motion-to-photon）延迟统计
+
+    每个新到的摄像头帧带着采集时间戳依次经过检测、平滑、游戏更新，
+    在display.flip之后结束。每个区间维护一个固定分桶的直方图和最近若干帧的原始数据，
+    可以画成叠加层，也可以导出为CSV。
+    """
+
+    def __init__(self, bin_ms=5, max_ms=250, history=2000):
+        self.bin_ms = bin_ms
+        self.max_ms = max_ms
+        self.history = history
+        self.show_overlay = False
+        self.reset()
+
+    def reset(self):
+        """清空全部统计"""
+        bin_count = int(self.max_ms // self.bin_ms) + 1  # 最后一个桶存放超过max_ms的样本
+        self.histograms = {name: np.zeros(bin_count, dtype=np.int64) for name, _, _ in SPANS}
+        self.samples = deque(maxlen=self.history)
+        self.pending = None
+
+    def begin_frame(self, seq, capture_time):
+        """开始追踪一个新帧；上一帧还没上屏就被替换时直接丢弃"""
+        self.pending = FrameTiming(seq, capture_time)
+        return self.pending
+
+    def mark(self, stage):
+        if self.pending is not None:
+            self.pending.mark(stage)
+
+    def present(self):
+        """在display.flip之后调用，结算当前帧"""
+        timing = self.pending
+        if timing is None:
+            return
+        self.pending = None
+        timing.mark(STAGE_PRESENTED)
+
+        row = {'seq': timing.seq}
+        for name, start, end in SPANS:
+            if start in timing.marks and end in timing.marks:
+                duration_ms = (timing.marks[end] - timing.marks[start]) * 1000.0
+                row[name] = duration_ms
+                bin_index = min(int(max(duration_ms, 0.0) // self.bin_ms), len(self.histograms[name]) - 1)
+                self.histograms[name][bin_index] += 1
+            else:
+                row[name] = None
+        self.samples.append(row)
+
+    def percentiles(self, name, qs=(50, 95, 99)):
+        """根据最近的原始样本计算分位数（毫秒），没有样本时返回None"""
+        values = [row[name] for row in self.samples if row.get(name) is not None]
+        if not values:
+            return None
+        return [float(v) for v in np.percentile(values, qs)]
+
+    def export_csv(self, path):
+        """把最近的逐帧数据和直方图导出为CSV，返回是否成功"""
+        try:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            span_names = [name for name, _, _ in SPANS]
+            with open(path, 'w', newline='', encoding='utf-8') as f:
+                writer = csv.writer(f)
+                writer.writerow(['seq'] + [f'{name}_ms' for name in span_names])
+                for row in self.samples:
+                    writer.writerow([row['seq']] + ['' if row[name] is None else f"{row[name]:.3f}" for name in span_names])
+                writer.writerow([])
+                writer.writerow(['bin_start_ms'] + [f'{name}_count' for name in span_names])
+                for bin_index in range(len(self.histograms['total'])):
+                    writer.writerow([bin_index * self.bin_ms] + [int(self.histograms[name][bin_index]) for name in span_names])
+            print(f"延迟数据已导出: {path}")
+            return True
+        except Exception as e:
+            print(f"导出延迟数据失败: {e}")
+            return False
+
+    def draw_overlay(self, img, extra_lines=()):
+        """在画面左下角绘制各区间的分位数和端到端延迟直方图"""
+        if not self.show_overlay:
+            return img
+
+        screen_height, screen_width = img.shape[:2]
+        panel_width, panel_height = 420, 260
+        x0, y0 = 20, max(0, screen_height - panel_height - 20)
+        panel = img[y0:y0 + panel_height, x0:x0 + panel_width]
+        panel[:] = (panel * 0.35).astype(np.uint8)
+
+        lines = [f"latency (ms)  frames: {len(self.samples)}"]
+        for name, _, _ in SPANS:
+            values = self.percentiles(name)
+            if values is None:
+                lines.append(f"{name:>8}: -")
+            else:
+                lines.append(f"{name:>8}: p50 {values[0]:6.1f}  p95 {values[1]:6.1f}  p99 {values[2]:6.1f}")
+        lines.extend(extra_lines)
+        for i, line in enumerate(lines):
+            cv2.putText(img, line, (x0 + 10, y0 + 22 + i * 20), cv2.FONT_HERSHEY_SIMPLEX, 0.45, (255, 255, 255), 1, cv2.LINE_AA)
+
+        # 端到端延迟直方图
+        counts = self.histograms['total']
+        peak = counts.max()
+        if peak > 0:
+            chart_top = y0 + 30 + len(lines) * 20
+            chart_height = y0 + panel_height - 10 - chart_top
+            bar_width = max(1, (panel_width - 20) // len(counts))
+            for bin_index, count in enumerate(counts):
+                bar_height = int(chart_height * count / peak)
+                if bar_height <= 0:
+                    continue
+                bx = x0 + 10 + bin_index * bar_width
+                cv2.rectangle(img, (bx, chart_top + chart_height - bar_height), (bx + bar_width - 1, chart_top + chart_height), (0, 200, 255), cv2.FILLED)
+        return img
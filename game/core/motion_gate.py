@@ -0,0 +1,62 @@
+import cv2
+
+
+class MotionGate:
+    """基于低分辨率帧差的运动门控
+
+    把摄像头画面缩小成很小的灰度图，与上一次真正执行检测时的画面做差分。
+    变化像素比例低于阈值时认为画面静止，调用方可以直接复用上一次的关键点，跳过手部检测推理。
+    为避免长时间使用过期结果，连续跳过的帧数有上限。
+    """
+
+    def __init__(self, pixel_threshold=12, changed_ratio=0.004, sample_size=(64, 36), max_skip_frames=15):
+        self.pixel_threshold = pixel_threshold    # 单个像素灰度变化超过该值才算"变化"
+        self.changed_ratio = changed_ratio        # 变化像素占比低于该值时视为静止
+        self.sample_size = sample_size            # 差分使用的缩略图尺寸（宽, 高）
+        self.max_skip_frames = max_skip_frames    # 最多连续跳过的帧数
+        self.reset()
+
+    def reset(self):
+        """清空参考帧和统计数据"""
+        self.reference = None
+        self.consecutive_skips = 0
+        self.total_frames = 0
+        self.detected_frames = 0
+        self.skipped_frames = 0
+
+    def should_detect(self, frame):
+        """判断当前帧是否需要执行手部检测"""
+        self.total_frames += 1
+        small = cv2.resize(frame, self.sample_size, interpolation=cv2.INTER_AREA)
+        if small.ndim == 3:
+            small = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+
+        if self.reference is not None and self.consecutive_skips < self.max_skip_frames:
+            diff = cv2.absdiff(small, self.reference)
+            changed = cv2.countNonZero(cv2.threshold(diff, self.pixel_threshold, 255, cv2.THRESH_BINARY)[1])
+            if changed < self.changed_ratio * diff.size:
+                self.consecutive_skips += 1
+                self.skipped_frames += 1
+                return False
+
+        # 只在真正检测时更新参考帧，缓慢移动累计起来也能被发现
+        self.reference = small
+        self.consecutive_skips = 0
+        self.detected_frames += 1
+        return True
+
+    def stats(self):
+        """返回跳帧统计"""
+        skip_ratio = self.skipped_frames / self.total_frames if self.total_frames else 0.0
+        return {
+            'frames': self.total_frames,
+            'detected': self.detected_frames,
+            'skipped': self.skipped_frames,
+            'skip_ratio': skip_ratio,
+        }
+
+    def summary(self):
+        """返回便于打印的统计文本"""
+        stats = self.stats()
+        return (f"运动门控: 共{stats['frames']}帧, 检测{stats['detected']}帧, "
+                f"跳过{stats['skipped']}帧 ({stats['skip_ratio'] * 100:.1f}%)")
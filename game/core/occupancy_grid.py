@@ -0,0 +1,103 @@
+import random
+
+import numpy as np
+
+
+# 格子类型编码
+CELL_EMPTY = 0
+CELL_SNAKE = 1
+CELL_OBSTACLE = 2
+CELL_FOOD = 3
+CELL_FAKE_FOOD = 4
+CELL_RESERVED = 5   # 临时保留（例如生成障碍物时蛇头周围的安全区）
+
+
+class BoardFullError(Exception):
+    """棋盘上已经没有空闲格子"""
+
+
+class OccupancyGrid:
+    """经典模式棋盘的占用网格
+
+    用一个grid_width x grid_height的uint8数组记录每个格子上是什么（见CELL_*编码），
+    蛇的移动、食物和障碍物的生成与移除都同步更新这里，
+    碰撞检测和放置检查只需要读一个格子，不再在蛇身、食物列表里线性查找。
+
+    同时维护空闲格子索引：free_cells保存所有空闲格子的扁平下标（前free_count个有效），
+    free_slot记录每个格子在free_cells中的位置（被占用时为-1）。
+    占用时把末尾元素换到被删除的位置（swap-remove），释放时追加到末尾，
+    所以占用、释放和均匀随机抽取空闲格子都是O(1)，棋盘满时sample_free抛出BoardFullError。
+
+    flat是与cells同步的扁平列表（下标x*高+y）：逐格读取Python列表比读numpy数组的单个元素快得多，
+    单格查询和自动驾驶的逐格搜索都读它，cells留给需要整块数组的地方（统计、批量处理）。
+    """
+
+    def __init__(self, width, height, rng=None):
+        self.width = width
+        self.height = height
+        self.rng = rng if rng is not None else random
+        self.cells = np.zeros((width, height), dtype=np.uint8)
+        self.flat = []
+        self.clear()
+
+    def clear(self):
+        self.cells.fill(CELL_EMPTY)
+        total = self.width * self.height
+        self.flat[:] = [CELL_EMPTY] * total  # 原地替换，持有flat引用的地方不会失效
+        self.free_cells = list(range(total))
+        self.free_slot = list(range(total))
+        self.free_count = total
+
+    def in_bounds(self, pos):
+        return 0 <= pos[0] < self.width and 0 <= pos[1] < self.height
+
+    def get(self, pos):
+        """返回格子的类型编码，越界时返回None"""
+        if not self.in_bounds(pos):
+            return None
+        return self.flat[pos[0] * self.height + pos[1]]
+
+    def is_free(self, pos):
+        return self.in_bounds(pos) and self.flat[pos[0] * self.height + pos[1]] == CELL_EMPTY
+
+    def set(self, pos, code):
+        x, y = pos
+        index = x * self.height + y
+        old = self.flat[index]
+        self.cells[x, y] = code
+        self.flat[index] = code
+        if old == CELL_EMPTY and code != CELL_EMPTY:
+            self._take_free(index)
+        elif old != CELL_EMPTY and code == CELL_EMPTY:
+            self._give_free(index)
+
+    def release(self, pos, code=None):
+        """把格子置空；指定code时只有当前类型等于code才清除，避免误清掉已经被蛇头占据的格子"""
+        if code is None or self.flat[pos[0] * self.height + pos[1]] == code:
+            self.set(pos, CELL_EMPTY)
+
+    def _take_free(self, index):
+        slot = self.free_slot[index]
+        last = self.free_cells[self.free_count - 1]
+        self.free_cells[slot] = last
+        self.free_slot[last] = slot
+        self.free_slot[index] = -1
+        self.free_count -= 1
+
+    def _give_free(self, index):
+        self.free_cells[self.free_count] = index
+        self.free_slot[index] = self.free_count
+        self.free_count += 1
+
+    def is_full(self):
+        return self.free_count == 0
+
+    def sample_free(self):
+        """均匀随机返回一个空闲格子(x, y)，没有空闲格子时抛出BoardFullError"""
+        if self.free_count == 0:
+            raise BoardFullError("棋盘已满")
+        index = self.free_cells[self.rng.randrange(self.free_count)]
+        return divmod(index, self.height)
+
+    def count(self, code):
+        return int(np.count_nonzero(self.cells == code))
@@ -0,0 +1,125 @@
+import math
+
+import numpy as np
+
+
+# 所有模式共用的渐变定义（RGB），键是设置界面里的渐变名称
+gradient_colors_data = {
+    "彩虹": [((255,0,0),(255,165,0)), ((255,165,0),(255,255,0)), ((255,255,0),(0,128,0)), ((0,128,0),(0,0,255)), ((0,0,255),(75,0,130)), ((75,0,130),(238,130,238))],
+    "蓝绿渐变": ((0, 0, 255), (0, 255, 0)),
+    "火热渐变": ((255, 0, 0), (255, 255, 0)),
+    "宇宙渐变": ((128, 0, 128), (0, 0, 128))
+}
+
+# 经典模式炫彩边框使用的循环色（三路相位差120度的正弦），不出现在设置界面里
+CYCLE_RAINBOW = "cycle_rainbow"
+
+
+def build_gradient_lut(gradient_data, size=256):
+    """
+    把渐变定义展开成颜色查找表
+
+    参数:
+        gradient_data: 单段渐变((r, g, b), (r, g, b))，或多段渐变的列表（如"彩虹"）
+        size: 查找表长度
+
+    返回:
+        (size, 3)的uint8数组，RGB顺序
+    """
+    segments = gradient_data if isinstance(gradient_data, list) else [gradient_data]
+    segments = np.asarray(segments, dtype=np.float32)  # (段数, 2, 3)
+    # 每个位置落在哪一段、段内的插值比例
+    positions = np.linspace(0, len(segments), size, endpoint=False)
+    segment_index = positions.astype(np.int32)
+    t = (positions - segment_index)[:, None]
+    start = segments[segment_index, 0]
+    end = segments[segment_index, 1]
+    return np.clip(start + (end - start) * t, 0, 255).astype(np.uint8)
+
+
+def build_cycle_lut(size=256):
+    """生成一个完整周期的正弦循环色查找表（RGB）"""
+    phase = np.arange(size, dtype=np.float64) * (2 * math.pi / size)
+    channels = [(1 + np.sin(phase + offset)) * 127.5 for offset in (0, 2 * math.pi / 3, 4 * math.pi / 3)]
+    return np.stack(channels, axis=1).astype(np.uint8)
+
+
+class Palette:
+    """预计算的调色板
+
+    每种渐变只在第一次使用时展开成size长度的查找表，并缓存RGB和BGR两种通道顺序：
+    pygame绘制用RGB，OpenCV绘制用BGR。取色全部是numpy索引，不再逐段做元组插值。
+      - along_body：沿蛇身从蛇头到蛇尾取色（蛇头是渐变的起始色），可以加偏移让渐变随时间滚动
+      - over_time：按时间在查找表上循环取一种颜色（用于边框等整体变色的元素）
+    纯色也当作长度为1的查找表处理，调用方不需要区分纯色和渐变。
+    """
+
+    def __init__(self, gradients=None, size=256):
+        self.gradients = gradients if gradients is not None else gradient_colors_data
+        self.size = size
+        self._luts = {}
+
+    def names(self):
+        """设置界面可以选择的渐变名称"""
+        return list(self.gradients.keys())
+
+    def is_gradient(self, color):
+        return isinstance(color, str) and (color in self.gradients or color == CYCLE_RAINBOW)
+
+    def lut(self, color, order='rgb', default=(255, 182, 193)):
+        """
+        返回颜色对应的查找表
+
+        参数:
+            color: 渐变名称，或(r, g, b)纯色
+            order: 返回数组的通道顺序，'rgb'或'bgr'（纯色元组按RGB解释）
+            default: 未知渐变名称时使用的纯色（RGB）
+
+        返回:
+            (n, 3)的uint8只读数组，渐变n为size，纯色n为1
+        """
+        key = (tuple(color) if isinstance(color, (tuple, list)) else color, order)
+        lut = self._luts.get(key)
+        if lut is not None:
+            return lut
+
+        if isinstance(color, str) and color in self.gradients:
+            rgb = build_gradient_lut(self.gradients[color], self.size)
+        elif color == CYCLE_RAINBOW:
+            rgb = build_cycle_lut(self.size)
+        elif isinstance(color, (tuple, list)) and len(color) >= 3:
+            rgb = np.asarray([color[:3]], dtype=np.uint8)
+        else:
+            rgb = np.asarray([default[:3]], dtype=np.uint8)
+
+        lut = np.ascontiguousarray(rgb[:, ::-1] if order == 'bgr' else rgb)
+        lut.setflags(write=False)
+        self._luts[key] = lut
+        return lut
+
+    def along_body(self, color, count, order='rgb', offset=0):
+        """
+        沿蛇身取色，与经典模式一直以来的效果一致：蛇头是渐变的起始色，蛇尾接近结束色
+
+        参数:
+            count: 蛇身段数（或顶点数），第0个是蛇头；按从尾到头存放顶点的调用方需要倒过来使用
+            offset: 在查找表上的滚动偏移，用于渐变动画
+
+        返回:
+            (count, 3)的uint8数组
+        """
+        lut = self.lut(color, order)
+        if len(lut) == 1:
+            return np.repeat(lut, count, axis=0)
+        indices = (np.arange(count) * len(lut) // max(count, 1) + offset) % len(lut)
+        return lut[indices]
+
+    def over_time(self, color, time_ms, period_ms, order='rgb'):
+        """返回一个周期为period_ms的循环中，time_ms时刻的颜色(r, g, b)"""
+        lut = self.lut(color, order)
+        index = int(time_ms * len(lut) // period_ms) % len(lut)
+        return tuple(int(c) for c in lut[index])
+
+
+# 全局共用的调色板
+palette = Palette()
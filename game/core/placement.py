@@ -0,0 +1,75 @@
+import random
+
+import numpy as np
+
+
+class PlacementError(Exception):
+    """可放置区域已经被占满，找不到合法位置"""
+
+
+class PlacementSampler:
+    """基于空闲区域掩码的位置采样器
+
+    把实际的游戏区域划分成cell_size像素的网格，先按边距和已有物体把不可放置的格子标记出来，
+    再从剩余的空闲格子里均匀随机抽取一个。每次采样的开销只和网格大小有关，
+    不会像反复随机再拒绝那样在拥挤的场地上无限循环；没有空闲格子时抛出PlacementError。
+    """
+
+    def __init__(self, width, height, cell_size=8, rng=None):
+        self.cell_size = cell_size
+        self.rng = rng if rng is not None else random
+        self.resize(width, height)
+
+    def resize(self, width, height):
+        """设置游戏区域尺寸（像素）"""
+        self.width = int(width)
+        self.height = int(height)
+        cols = max(1, self.width // self.cell_size)
+        rows = max(1, self.height // self.cell_size)
+        # 各格子中心点的像素坐标
+        self._xs = (np.arange(cols) + 0.5) * self.cell_size
+        self._ys = (np.arange(rows) + 0.5) * self.cell_size
+        self.free = np.ones((rows, cols), dtype=bool)
+
+    def begin(self, margin=0):
+        """开始一次新的放置：清空掩码，并屏蔽离边缘不足margin像素的格子"""
+        self.free[:] = True
+        if margin > 0:
+            self.free[:, (self._xs < margin) | (self._xs > self.width - margin)] = False
+            self.free[(self._ys < margin) | (self._ys > self.height - margin), :] = False
+        return self
+
+    def _circle_slices(self, x, y, radius):
+        col0 = int(np.searchsorted(self._xs, x - radius, side='left'))
+        col1 = int(np.searchsorted(self._xs, x + radius, side='right'))
+        row0 = int(np.searchsorted(self._ys, y - radius, side='left'))
+        row1 = int(np.searchsorted(self._ys, y + radius, side='right'))
+        return row0, row1, col0, col1
+
+    def block_circle(self, x, y, radius):
+        """屏蔽格子中心到(x, y)距离小于radius的格子"""
+        row0, row1, col0, col1 = self._circle_slices(x, y, radius)
+        if row0 >= row1 or col0 >= col1:
+            return self
+        dx = self._xs[col0:col1] - x
+        dy = self._ys[row0:row1] - y
+        inside = dy[:, None] ** 2 + dx[None, :] ** 2 < radius * radius
+        self.free[row0:row1, col0:col1] &= ~inside
+        return self
+
+    def free_count(self):
+        return int(np.count_nonzero(self.free))
+
+    def sample(self):
+        """
+        从空闲格子中均匀抽取一个位置
+
+        返回:
+            (x, y)像素坐标（格子中心）
+        """
+        free_cells = np.flatnonzero(self.free)
+        if len(free_cells) == 0:
+            raise PlacementError("没有可以放置的空闲位置")
+        index = free_cells[self.rng.randrange(len(free_cells))]
+        row, col = divmod(int(index), self.free.shape[1])
+        return int(self._xs[col]), int(self._ys[row])
@@ -0,0 +1,79 @@
+import heapq
+import itertools
+
+
+class Timer:
+    """Scheduler.schedule返回的定时器句柄，可以用来取消"""
+
+    __slots__ = ('when', 'interval', 'callback', 'args', 'cancelled')
+
+    def __init__(self, when, interval, callback, args):
+        self.when = when
+        self.interval = interval
+        self.callback = callback
+        self.args = args
+        self.cancelled = False
+
+
+class Scheduler:
+    """基于最小堆的定时器
+
+    效果到期、闪烁、倒计时和定时刷新都注册成带截止时间的回调，advance只弹出已经到期的定时器，
+    每次推进的开销只和到期的定时器数量有关（每个O(log n)），不再每帧遍历所有计时变量。
+    时间单位由调用方决定（经典模式的引擎用模拟时间，渲染层用pygame时钟，都是秒）。
+    同一时刻到期的定时器按注册顺序触发；取消只做标记，弹出时跳过。
+    重复定时器错过多个周期时只补触发一次，避免长时间暂停后集中触发。
+    """
+
+    def __init__(self, now=0.0):
+        self.clear(now)
+
+    def clear(self, now=0.0):
+        """取消所有定时器并把当前时间设为now"""
+        for _, _, timer in getattr(self, '_heap', []):
+            timer.cancelled = True
+        self._heap = []
+        self._sequence = itertools.count()
+        self.now = now
+
+    def __len__(self):
+        return sum(1 for _, _, timer in self._heap if not timer.cancelled)
+
+    def schedule(self, delay, callback, *args, interval=None):
+        """
+        在delay之后调用callback(*args)
+
+        参数:
+            interval: 不为None时每隔interval重复触发，直到被取消
+
+        返回:
+            Timer句柄
+        """
+        timer = Timer(self.now + delay, interval, callback, args)
+        self._push(timer)
+        return timer
+
+    def cancel(self, timer):
+        if timer is not None:
+            timer.cancelled = True
+
+    def advance(self, now):
+        """推进到now，按截止时间先后触发所有到期的定时器；触发时self.now等于该定时器的截止时间"""
+        heap = self._heap
+        while heap and heap[0][0] <= now:
+            _, _, timer = heapq.heappop(heap)
+            if timer.cancelled:
+                continue
+            self.now = timer.when
+            if timer.interval is None:
+                timer.cancelled = True
+            timer.callback(*timer.args)
+            if not timer.cancelled:
+                timer.when += timer.interval
+                if timer.when <= now:
+                    timer.when = now + timer.interval
+                self._push(timer)
+        self.now = now
+
+    def _push(self, timer):
+        heapq.heappush(self._heap, (timer.when, next(self._sequence), timer))
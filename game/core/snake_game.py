@@ -1,24 +1,24 @@
-import math
 import random
 import os
-import cvzone
 import cv2
 import numpy as np
 
 from game.utils.improved_chinese_text import put_chinese_text_with_background, put_chinese_text_pil
 from game.utils.language_manager import get_translation
+from game.core.trail_buffer import TrailBuffer
+from game.core.snake_renderer import SnakeRenderer
+from game.core.sprite import Sprite
+from game.core.game_over_overlay import GameOverOverlay
 
 class SnakeGame:
-    def __init__(self, food_path, width=1280, height=720, snake_color=(200,0,200), gradient_colors_data=None):
+    def __init__(self, food_path, width=1280, height=720, snake_color=(200,0,200)):
         self.width, self.height = width, height
-        self.points = []            
-        self.lengths = []           
-        self.currentLength = 0      
+        self.trail = TrailBuffer(spacing=8, simplify_tolerance=1.0)  # 蛇身轨迹点及总长度，按8像素间距重采样
         self.base_allowed_length = 150    
         self.allowedLength = self.base_allowed_length    
         self.previousHead = 0, 0    
         self.snake_color = snake_color  
-        self.gradient_colors_data = gradient_colors_data if gradient_colors_data is not None else {}  
+        self.renderer = SnakeRenderer(head_darken=0)
 
 
         self.imgFood = cv2.imread(food_path, cv2.IMREAD_UNCHANGED)
@@ -27,6 +27,7 @@ class SnakeGame:
             self.imgFood = np.zeros((50, 50, 4), dtype=np.uint8)
             cv2.circle(self.imgFood, (25, 25), 25, (0, 255, 255, 255), cv2.FILLED)
         self.hFood, self.wFood, _ = self.imgFood.shape
+        self.food_sprite = Sprite(self.imgFood)
         self.foodPoint = 0, 0
         self.randomFoodLocation()
 
@@ -38,6 +39,7 @@ class SnakeGame:
         
 
         fixed_obstacle_size = (80, 80)  
+        obstacle_sprites = {}  # 同一张图片只生成一次精灵
         
         for file in obstacle_files:
             img_path = os.path.join(os.path.dirname(__file__), '..', 'assets', file)
@@ -51,8 +53,12 @@ class SnakeGame:
 
                     img_resized = cv2.cvtColor(img_resized, cv2.COLOR_RGB2RGBA)
                 
+                if file not in obstacle_sprites:
+                    obstacle_sprites[file] = Sprite(img_resized)
+                
                 self.obstacles.append({
                     'image': img_resized,
+                    'sprite': obstacle_sprites[file],
                     'x': random.randint(100, self.width - fixed_obstacle_size[0] - 100),
                     'y': random.randint(100, self.height - fixed_obstacle_size[1] - 100),
                     'width': fixed_obstacle_size[0],
@@ -62,6 +68,7 @@ class SnakeGame:
         self.score = 0
         self.gameOver = False
         self.return_to_menu = False  
+        self.game_over_overlay = GameOverOverlay()
         
 
         self.obstacle_refresh_timer = 0  
@@ -104,9 +111,7 @@ class SnakeGame:
             pass
 
     def reset(self):
-        self.points = []
-        self.lengths = []
-        self.currentLength = 0
+        self.trail.clear()
         self.allowedLength = self.base_allowed_length
         self.previousHead = 0, 0
         self.score = 0
@@ -119,105 +124,59 @@ class SnakeGame:
             obstacle['x'] = random.randint(100, self.width - obstacle['width'] - 100)
             obstacle['y'] = random.randint(100, self.height - obstacle['height'] - 100)
 
+    def _layout_game_over(self, screen_width, screen_height):
+        """计算游戏结束画面的布局：标题和得分带半透明背景，三个按钮并排居中"""
+        game_over_text = get_translation('game_end')
+        score_text = get_translation('game_final_score').format(self.score)
+        content_key = (game_over_text, score_text, screen_width, screen_height)
+        if not self.game_over_overlay.needs_layout(content_key):
+            return
+
+        center_x = screen_width // 2
+        center_y = screen_height // 2
+        texts = [
+            {'text': game_over_text, 'position': (center_x - 220, center_y - 150), 'font_size': 80, 'color': (255, 255, 255), 'background': ((0, 0, 0), 0.6)},
+            {'text': score_text, 'position': (center_x - 200, center_y - 50), 'font_size': 60, 'color': (255, 255, 255), 'background': ((0, 0, 0), 0.6)},
+        ]
+
+        # 按钮配置
+        button_width = 180  # 减小按钮宽度，适应三个按钮
+        button_height = 80
+        button_spacing = 30
+        button_y = center_y + 50
+        start_x = center_x - (button_width * 3 + button_spacing * 2) // 2
+        buttons = []
+        for index, (button_id, label, font_size, color) in enumerate((
+            ('restart', "重新开始", 35, (0, 150, 0)),
+            ('menu', "返回主菜单", 32, (50, 100, 200)),
+            ('exit', "退出游戏", 35, (200, 50, 50)),
+        )):
+            button_x = start_x + index * (button_width + button_spacing)
+            buttons.append({'id': button_id, 'rect': (button_x, button_y, button_width, button_height), 'label': label, 'font_size': font_size, 'color': color})
+
+        self.game_over_overlay.set_layout(content_key, (screen_width, screen_height), texts, buttons)
+
     def update(self, imgMain, currentHead, mouse_pos=None, mouse_clicked=False, high_score=0):
         if self.gameOver:
-            # 获取屏幕尺寸
-            screen_height, screen_width, _ = imgMain.shape
-            center_x = screen_width // 2
-            center_y = screen_height // 2
-            
-            # 绘制游戏结束画面，所有文字居中显示
-            
-            # 绘制"游戏结束"文字，位置居中
-            game_over_text = get_translation('game_end')
-            game_over_font_size = 80
-            # 使用put_chinese_text_with_background函数的自动居中特性，文字不会超出框外
-            imgMain = put_chinese_text_with_background(imgMain, game_over_text, 
-                                                     (center_x - 220, center_y - 150), 
-                                                     game_over_font_size, (255, 255, 255), (0, 0, 0))
-            
-            # 绘制得分文字，位置居中
-            score_text = get_translation('game_final_score').format(self.score)
-            score_font_size = 60
-            # 使用put_chinese_text_with_background函数的自动居中特性，文字不会超出框外
-            imgMain = put_chinese_text_with_background(imgMain, score_text, 
-                                                     (center_x - 200, center_y - 50), 
-                                                     score_font_size, (255, 255, 255), (0, 0, 0))
-            
-            # 按钮配置
-            button_width = 180  # 减小按钮宽度，适应三个按钮
-            button_height = 80
-            button_spacing = 30  # 调整按钮间距
-            button_y = center_y + 50  # 调整按钮垂直位置
-            
-            # 计算三个按钮的位置，并排居中显示
-            total_buttons_width = button_width * 3 + button_spacing * 2
-            start_x = center_x - total_buttons_width // 2
-            
-            # 重新开始按钮
-            restart_button_x = start_x
-            
-            # 返回主菜单按钮
-            menu_button_x = start_x + button_width + button_spacing
-            
-            # 退出游戏按钮
-            exit_button_x = start_x + button_width * 2 + button_spacing * 2
-            
-            # 检测按钮点击
+            # 结束画面缓存为图层，只在内容或悬停按钮变化时重建
+            self._layout_game_over(imgMain.shape[1], imgMain.shape[0])
+            if mouse_pos:
+                self.game_over_overlay.update_hover(mouse_pos)
+
+            # 检测按钮点击，使用缓存布局里的按钮矩形
             if mouse_clicked and mouse_pos:
-                # 检测重新开始按钮点击
-                if restart_button_x <= mouse_pos[0] <= restart_button_x + button_width and button_y <= mouse_pos[1] <= button_y + button_height:
+                clicked = self.game_over_overlay.button_at(mouse_pos)
+                if clicked == 'restart':
                     self.reset()
-                # 检测返回主菜单按钮点击
-                elif menu_button_x <= mouse_pos[0] <= menu_button_x + button_width and button_y <= mouse_pos[1] <= button_y + button_height:
+                    return imgMain
+                elif clicked == 'menu':
                     self.return_to_menu = True
-                # 检测退出游戏按钮点击
-                elif exit_button_x <= mouse_pos[0] <= exit_button_x + button_width and button_y <= mouse_pos[1] <= button_y + button_height:
+                elif clicked == 'exit':
                     # 退出游戏，通过抛出SystemExit异常
                     import sys
                     sys.exit()
-            
-            # 从game_ui导入get_text_size函数用于精确计算文字尺寸
-            from game.core.game_ui import get_text_size
-            
-            # 绘制重新开始按钮
-            cv2.rectangle(imgMain, (restart_button_x, button_y), (restart_button_x + button_width, button_y + button_height), (0, 150, 0), cv2.FILLED)
-            cv2.rectangle(imgMain, (restart_button_x, button_y), (restart_button_x + button_width, button_y + button_height), (255, 255, 255), 3)
-            # 精确计算文字位置
-            text = "重新开始"
-            font_size = 35
-            text_width, text_height = get_text_size(text, font_size)
-            restart_text_x = restart_button_x + (button_width - text_width) // 2  # 精确水平居中
-            restart_text_y = button_y + (button_height + text_height) // 2 - 30 # 精确垂直居中
-            imgMain = put_chinese_text_pil(imgMain, text, 
-                                         (restart_text_x, restart_text_y), 
-                                         font_size, (255, 255, 255))
-            
-            # 绘制返回主菜单按钮
-            cv2.rectangle(imgMain, (menu_button_x, button_y), (menu_button_x + button_width, button_y + button_height), (50, 100, 200), cv2.FILLED)
-            cv2.rectangle(imgMain, (menu_button_x, button_y), (menu_button_x + button_width, button_y + button_height), (255, 255, 255), 3)
-            # 精确计算文字位置
-            text = "返回主菜单"
-            font_size = 32
-            text_width, text_height = get_text_size(text, font_size)
-            menu_text_x = menu_button_x + (button_width - text_width) // 2  # 精确水平居中
-            menu_text_y = button_y + (button_height + text_height) // 2 - 30  # 精确垂直居中
-            imgMain = put_chinese_text_pil(imgMain, text, 
-                                         (menu_text_x, menu_text_y), 
-                                         font_size, (255, 255, 255))
-            
-            # 绘制退出游戏按钮
-            cv2.rectangle(imgMain, (exit_button_x, button_y), (exit_button_x + button_width, button_y + button_height), (200, 50, 50), cv2.FILLED)
-            cv2.rectangle(imgMain, (exit_button_x, button_y), (exit_button_x + button_width, button_y + button_height), (255, 255, 255), 3)
-            # 精确计算文字位置
-            text = "退出游戏"
-            font_size = 35
-            text_width, text_height = get_text_size(text, font_size)
-            exit_text_x = exit_button_x + (button_width - text_width) // 2  # 精确水平居中
-            exit_text_y = button_y + (button_height + text_height) // 2 - 30  # 精确垂直居中
-            imgMain = put_chinese_text_pil(imgMain, text, 
-                                         (exit_text_x, exit_text_y), 
-                                         font_size, (255, 255, 255))
+
+            self.game_over_overlay.draw(imgMain)
         else:
             # 障碍物刷新逻辑 - 放在外层，确保计时器持续更新
             self.obstacle_refresh_timer += 1
@@ -261,25 +220,13 @@ class SnakeGame:
                 self.obstacle_refresh_timer = 0
             
             if currentHead:
-                px, py = self.previousHead
                 cx, cy = currentHead
 
-                self.points.append([cx, cy])  
+                # 第一个点不计算距离，避免初始距离过大
+                self.trail.push(cx, cy)
                 
-                # 只有当points列表有两个或以上点时才计算距离，避免初始距离过大
-                if len(self.points) > 1:
-                    distance = math.hypot(cx - px, cy - py)  # 两点之间的距离
-                    self.lengths.append(distance)            # 添加蛇的距离列表内容
-                    self.currentLength += distance
-                    
-                    # Length Reduction 收缩长度
-                    if self.currentLength > self.allowedLength:
-                        for i, length in enumerate(self.lengths):
-                            self.currentLength -= length
-                            self.lengths.pop(i)
-                            self.points.pop(i)
-                            if self.currentLength < self.allowedLength:
-                                break
+                # Length Reduction 收缩长度
+                self.trail.trim_to(self.allowedLength)
                 
                 self.previousHead = cx, cy
 
@@ -293,28 +240,17 @@ class SnakeGame:
                     print(self.score)
 
                 # Draw Snake 画蛇
-                if self.points:
-                    # 确定蛇的颜色
-                    snake_color = self.snake_color
-                    if isinstance(snake_color, str):
-                        # 如果是渐变颜色名称，使用默认颜色
-                        snake_color = (200, 0, 200)
-                    
-                    for i, point in enumerate(self.points):
-                         if i != 0:
-                            self.points[i-1] = tuple(self.points[i-1])
-                            self.points[i] = tuple(self.points[i])
-                            cv2.line(imgMain, self.points[i - 1], self.points[i], snake_color, 20)
-                    # 对列表最后一个点也就是蛇头使用相同颜色
-                    self.points[-1] = tuple(self.points[-1])
-                    cv2.circle(imgMain, self.points[-1], 20, snake_color, cv2.FILLED)
+                if len(self.trail):
+                    # 纯色按BGR使用，渐变名称从共用调色板取查找表
+                    self.renderer.set_color(self.snake_color, color_order='bgr')
+                    self.renderer.draw(imgMain, self.trail.points_int())
 
                 # Draw Food 画食物
-                imgMain = cvzone.overlayPNG(imgMain, self.imgFood, (rx - self.wFood // 2, ry - self.hFood // 2))
+                self.food_sprite.draw_centered(imgMain, rx, ry)
 
                 # Draw Obstacles 画障碍物
                 for obstacle in self.obstacles:
-                    imgMain = cvzone.overlayPNG(imgMain, obstacle['image'], (obstacle['x'], obstacle['y']))
+                    obstacle['sprite'].draw(imgMain, obstacle['x'], obstacle['y'])
 
                 # 显示中文得分
                 imgMain = put_chinese_text_with_background(imgMain, get_translation('game_score').format(self.score), (50, 80), 40, (50, 130, 246), (0, 0, 0))
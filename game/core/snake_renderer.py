@@ -0,0 +1,90 @@
+import cv2
+import numpy as np
+
+from game.core.palette import palette as shared_palette
+
+
+class SnakeRenderer:
+    """连续蛇身的渲染器
+
+    蛇身颜色取自共用调色板里预先展开的查找表，绘制时把顶点按固定数量的色带分组，
+    每个色带一次cv2.polylines调用，所以每帧的绘制调用次数与蛇身点数无关。
+    渐变会随时间沿蛇身滚动。
+    """
+
+    def __init__(self, thickness=20, head_radius=20, head_darken=30, bands=24, palette=None, gradient_speed=3):
+        self.thickness = thickness
+        self.head_radius = head_radius
+        self.head_darken = head_darken        # 蛇头颜色比蛇身暗多少
+        self.bands = bands                    # 渐变蛇身最多拆成多少次polylines调用
+        self.palette = palette if palette is not None else shared_palette
+        self.gradient_speed = gradient_speed  # 每隔多少帧渐变滚动一格
+        self._color_key = None
+        self.color = (0, 0, 255)
+        self.lut = np.zeros((1, 3), dtype=np.uint8)
+
+    def set_color(self, snake_color, color_order='rgb'):
+        """
+        设置蛇身颜色，颜色没变时直接复用调色板里的查找表
+
+        参数:
+            snake_color: 纯色元组，或调色板中的渐变名称
+            color_order: 纯色元组的通道顺序，'rgb'或'bgr'（渐变定义统一为RGB）
+        """
+        key = (snake_color if not isinstance(snake_color, list) else tuple(snake_color), color_order)
+        if key == self._color_key:
+            return
+        self._color_key = key
+        self.color = snake_color
+
+        if isinstance(snake_color, (tuple, list)) and len(snake_color) >= 3 and color_order == 'bgr':
+            self.lut = np.asarray([snake_color[:3]], dtype=np.uint8)
+        else:
+            # 未知的颜色名称使用默认蓝色
+            self.lut = self.palette.lut(snake_color, 'bgr', default=(0, 0, 255))
+
+    def vertex_colors(self, count, frame=0):
+        """按顶点位置和帧号从查找表取色，返回(count, 3)的BGR数组，与顶点一样从蛇尾到蛇头"""
+        if len(self.lut) == 1:
+            return np.repeat(self.lut, count, axis=0)
+        # along_body从蛇头开始排列，顶点从蛇尾开始，所以倒过来，蛇头取渐变的起始色
+        return self.palette.along_body(self.color, count, 'bgr', offset=frame // self.gradient_speed)[::-1]
+
+    def draw(self, img, points, frame=0, scale=1.0):
+        """
+        绘制蛇身和蛇头
+
+        参数:
+            points: (n, 2)的int32数组，从蛇尾到蛇头
+            frame: 帧号，用于渐变滚动
+            scale: 渲染比例，线宽和蛇头半径随之缩放
+        """
+        count = len(points)
+        if count == 0:
+            return img
+        thickness = max(1, int(round(self.thickness * scale)))
+        head_radius = max(1, int(round(self.head_radius * scale)))
+
+        if len(self.lut) == 1:
+            color = tuple(int(c) for c in self.lut[0])
+            if count > 1:
+                cv2.polylines(img, [points.reshape(-1, 1, 2)], False, color, thickness)
+            head_color = color
+        else:
+            colors = self.vertex_colors(count, frame)
+            if count > 1:
+                band_count = min(self.bands, count - 1)
+                edges = np.linspace(0, count - 1, band_count + 1).astype(np.int32)
+                for band in range(band_count):
+                    first, last = edges[band], edges[band + 1]
+                    if last <= first:
+                        continue
+                    # 相邻色带共用边界顶点，保证线条连续
+                    color = tuple(int(c) for c in colors[(first + last) // 2])
+                    cv2.polylines(img, [points[first:last + 1].reshape(-1, 1, 2)], False, color, thickness)
+            head_color = tuple(int(c) for c in colors[-1])
+
+        head_color = tuple(max(0, c - self.head_darken) for c in head_color)
+        head = (int(points[-1][0]), int(points[-1][1]))
+        cv2.circle(img, head, head_radius, head_color, cv2.FILLED)
+        return img
@@ -0,0 +1,118 @@
+import numpy as np
+
+
+class SpatialHash:
+    """均匀网格空间哈希
+
+    把一批点（障碍物中心、蛇身线段中点等）按所在网格编号排序，用有序数组代替字典，
+    查询时只取圆形范围覆盖到的几个格子，再用searchsorted找到对应的下标区间。
+    建表是一次numpy排序，查询的开销只和附近的元素数量有关。
+    """
+
+    def __init__(self, cell_size=64):
+        self.cell_size = cell_size
+        self.clear()
+
+    def clear(self):
+        self.points = np.zeros((0, 2), dtype=np.float32)
+        self._order = np.zeros(0, dtype=np.int64)
+        self._sorted_keys = np.zeros(0, dtype=np.int64)
+
+    def __len__(self):
+        return len(self.points)
+
+    @staticmethod
+    def _key(cx, cy):
+        # 把二维格子坐标压成一个整数，允许负坐标
+        return (cx.astype(np.int64) << 32) + (cy.astype(np.int64) & 0xFFFFFFFF)
+
+    def build(self, points):
+        """用(n, 2)的点坐标重建索引"""
+        points = np.asarray(points, dtype=np.float32).reshape(-1, 2)
+        self.points = points
+        if len(points) == 0:
+            self._order = np.zeros(0, dtype=np.int64)
+            self._sorted_keys = np.zeros(0, dtype=np.int64)
+            return
+        cells = np.floor(points / self.cell_size).astype(np.int64)
+        keys = self._key(cells[:, 0], cells[:, 1])
+        self._order = np.argsort(keys, kind='stable')
+        self._sorted_keys = keys[self._order]
+
+    def query(self, x, y, radius):
+        """返回位于以(x, y)为中心、半径radius的圆所覆盖格子内的元素下标（候选集，需要再精确判断）"""
+        if len(self.points) == 0:
+            return self._order[:0]
+        gx0, gx1 = int(np.floor((x - radius) / self.cell_size)), int(np.floor((x + radius) / self.cell_size))
+        gy0, gy1 = int(np.floor((y - radius) / self.cell_size)), int(np.floor((y + radius) / self.cell_size))
+        gx, gy = np.meshgrid(np.arange(gx0, gx1 + 1), np.arange(gy0, gy1 + 1), indexing='ij')
+        keys = self._key(gx.ravel(), gy.ravel())
+        left = np.searchsorted(self._sorted_keys, keys, side='left')
+        right = np.searchsorted(self._sorted_keys, keys, side='right')
+        chunks = [self._order[l:r] for l, r in zip(left, right) if r > l]
+        if not chunks:
+            return self._order[:0]
+        return np.concatenate(chunks)
+
+    def query_points(self, x, y, radius):
+        """返回与(x, y)距离小于radius的元素下标"""
+        candidates = self.query(x, y, radius)
+        if len(candidates) == 0:
+            return candidates
+        offsets = self.points[candidates] - (x, y)
+        inside = offsets[:, 0] ** 2 + offsets[:, 1] ** 2 < radius * radius
+        return candidates[inside]
+
+
+def point_segment_distances(px, py, starts, ends):
+    """
+    点到一批线段的最短距离（向量化）
+
+    参数:
+        starts, ends: (n, 2)数组，线段的起点和终点
+
+    返回:
+        长度为n的距离数组
+    """
+    starts = np.asarray(starts, dtype=np.float32)
+    ends = np.asarray(ends, dtype=np.float32)
+    direction = ends - starts
+    offset = np.array((px, py), dtype=np.float32) - starts
+    length_sq = np.einsum('ij,ij->i', direction, direction)
+    # 退化为点的线段投影参数取0
+    t = np.where(length_sq > 1e-9, np.einsum('ij,ij->i', offset, direction) / np.maximum(length_sq, 1e-9), 0.0)
+    t = np.clip(t, 0.0, 1.0)
+    closest = starts + direction * t[:, None]
+    return np.hypot(closest[:, 0] - px, closest[:, 1] - py)
+
+
+class TrailCollider:
+    """蛇头与自身轨迹的碰撞检测
+
+    蛇头附近的一段（neck_length像素）不参与检测，其余线段一次向量化算出到蛇头的点到线段距离。
+    轨迹每帧都在头部追加、尾部裁剪，逐帧重建空间哈希要排序全部线段，比直接算一遍距离还慢，所以这里不建索引。
+    """
+
+    def __init__(self, neck_length=80):
+        self.neck_length = neck_length
+
+    def hits(self, points, lengths, radius):
+        """
+        判断蛇头（points最后一个点）是否碰到了自身
+
+        参数:
+            points: TrailBuffer.points()，从蛇尾到蛇头
+            lengths: TrailBuffer.lengths()，相邻点之间的距离
+            radius: 蛇头中心到蛇身中线的最小允许距离
+        """
+        if len(points) < 3:
+            return False
+        # 从蛇头往回累计长度，找到脖子之外的最后一个线段
+        distance_from_head = np.cumsum(lengths[::-1])[::-1]
+        body_segments = int(np.count_nonzero(distance_from_head > self.neck_length))
+        if body_segments == 0:
+            return False
+
+        hx, hy = float(points[-1][0]), float(points[-1][1])
+        distances = point_segment_distances(hx, hy, points[:body_segments], points[1:body_segments + 1])
+        return bool(np.any(distances < radius))
@@ -0,0 +1,62 @@
+import numpy as np
+
+
+class Sprite:
+    """预乘alpha的精灵图
+
+    加载时把BGRA图片拆成两个uint16平面：预乘alpha的BGR（bgr * a）和反向alpha（255 - a），
+    绘制时只需要 dst = (dst * (255 - a) + bgr * a) / 255，直接在目标画面的ROI上原地混合，
+    不再像cvzone.overlayPNG那样每次调用都重新计算遮罩、分配整幅中间图像。
+    超出画面的部分会被裁掉，同一精灵的多个实例可以用draw_many批量绘制。
+    """
+
+    def __init__(self, image):
+        if image.ndim == 2:
+            image = np.dstack([image, image, image])
+        height, width = image.shape[:2]
+        if image.shape[2] == 4:
+            alpha = image[:, :, 3:4].astype(np.uint16)
+        else:
+            alpha = np.full((height, width, 1), 255, dtype=np.uint16)
+
+        self.width = width
+        self.height = height
+        self.premultiplied = image[:, :, :3].astype(np.uint16) * alpha
+        self.inverse_alpha = np.repeat(255 - alpha, 3, axis=2)
+        # 混合用的临时缓冲区，所有实例共用，避免每次绘制分配内存
+        self._scratch = np.empty((height, width, 3), dtype=np.uint16)
+
+    def draw(self, img, x, y):
+        """把精灵左上角放在(x, y)处原地混合到img中，返回img"""
+        frame_height, frame_width = img.shape[:2]
+        x0, y0 = max(x, 0), max(y, 0)
+        x1, y1 = min(x + self.width, frame_width), min(y + self.height, frame_height)
+        if x0 >= x1 or y0 >= y1:
+            return img
+
+        sx0, sy0 = x0 - x, y0 - y
+        sx1, sy1 = sx0 + (x1 - x0), sy0 + (y1 - y0)
+        roi = img[y0:y1, x0:x1, :3]
+        scratch = self._scratch[sy0:sy1, sx0:sx1]
+
+        np.multiply(roi, self.inverse_alpha[sy0:sy1, sx0:sx1], out=scratch)
+        np.add(scratch, self.premultiplied[sy0:sy1, sx0:sx1], out=scratch)
+        # 用移位近似除以255：(v + 128 + ((v + 128) >> 8)) >> 8，结果与四舍五入一致
+        np.add(scratch, 128, out=scratch)
+        np.add(scratch, scratch >> 8, out=scratch)
+        np.right_shift(scratch, 8, out=scratch)
+        roi[...] = scratch
+        return img
+
+    def draw_centered(self, img, cx, cy):
+        """以(cx, cy)为中心绘制"""
+        return self.draw(img, int(cx) - self.width // 2, int(cy) - self.height // 2)
+
+    def draw_many(self, img, positions, centered=True):
+        """批量绘制同一精灵的多个实例，positions为中心点（或左上角）坐标列表"""
+        for px, py in positions:
+            if centered:
+                self.draw(img, int(px) - self.width // 2, int(py) - self.height // 2)
+            else:
+                self.draw(img, int(px), int(py))
+        return img
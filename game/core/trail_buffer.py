@@ -0,0 +1,202 @@
+import numpy as np
+
+
+class TrailBuffer:
+    """连续蛇身的轨迹缓冲区
+
+    蛇身是一串按时间顺序排列的点，新点追加在头部，尾部按允许长度收缩。
+    点和相邻点之间的距离都存放在numpy数组里，有效数据位于[start, end)区间：
+    追加只写一个位置，收缩尾部只移动start，都是均摊O(1)；
+    写到数组末尾时把有效数据整体搬回开头（容量不够时扩容一倍），
+    因此points()/lengths()始终可以返回连续的数组视图，渲染和碰撞检测可以直接使用。
+
+    设置spacing后用push()按距离重采样：除蛇头外的点之间间隔固定为spacing像素，
+    蛇头是一个随手移动的浮动点，移动很慢时不会每帧新增一个点，移动很快时在中间插值补点。
+    点数因此只和蛇身在屏幕上的长度有关，与帧率无关。
+    设置simplify_tolerance后，还会定期用Douglas-Peucker算法化简靠近尾部、已经稳定下来的部分。
+    """
+
+    def __init__(self, capacity=256, spacing=None, simplify_tolerance=None, simplify_interval=64, keep_recent=32):
+        self.spacing = spacing                        # 重采样间隔（像素），None表示每次都追加
+        self.simplify_tolerance = simplify_tolerance  # 尾部化简的容差（像素），None表示不化简
+        self.simplify_interval = simplify_interval    # 每新增多少个点化简一次
+        self.keep_recent = keep_recent                # 靠近蛇头的若干点不参与化简
+        self._since_simplify = 0
+        self._points = np.zeros((capacity * 2, 2), dtype=np.float32)
+        # _segments[i]是第i个点到前一个点的距离，第一个有效点对应的值没有意义
+        self._segments = np.zeros(capacity * 2, dtype=np.float64)
+        self._start = 0
+        self._end = 0
+        self.total_length = 0.0
+
+    def __len__(self):
+        return self._end - self._start
+
+    def clear(self):
+        self._start = 0
+        self._end = 0
+        self.total_length = 0.0
+        self._since_simplify = 0
+
+    def _make_room(self):
+        """数组写满时把有效数据搬到开头，有效数据超过一半容量时扩容"""
+        count = self._end - self._start
+        # 顺便重新求和，消除长时间增减累积的浮点误差
+        self.total_length = float(self._segments[self._start + 1:self._end].sum())
+        if count * 2 > len(self._points):
+            new_points = np.zeros((len(self._points) * 2, 2), dtype=np.float32)
+            new_segments = np.zeros(len(self._segments) * 2, dtype=np.float64)
+        else:
+            new_points = self._points
+            new_segments = self._segments
+        new_points[:count] = self._points[self._start:self._end]
+        new_segments[:count] = self._segments[self._start:self._end]
+        self._points = new_points
+        self._segments = new_segments
+        self._start = 0
+        self._end = count
+
+    def append(self, x, y):
+        """在头部追加一个点，返回与上一个点的距离"""
+        if self._end == len(self._points):
+            self._make_room()
+        distance = 0.0
+        if self._end > self._start:
+            px, py = self._points[self._end - 1]
+            distance = float(np.hypot(x - px, y - py))
+            self.total_length += distance
+        self._points[self._end] = (x, y)
+        self._segments[self._end] = distance
+        self._end += 1
+        return distance
+
+    def _pop_head(self):
+        self._end -= 1
+        self.total_length -= self._segments[self._end]
+
+    def push(self, x, y):
+        """按spacing重采样地把新的蛇头位置加入轨迹"""
+        if self.spacing is None or self._end - self._start < 2:
+            self.append(x, y)
+            return
+
+        # 去掉上一帧的浮动蛇头，从最后一个固定点开始按间隔补点
+        self._pop_head()
+        ax, ay = self._points[self._end - 1]
+        ax, ay = float(ax), float(ay)
+        dx, dy = x - ax, y - ay
+        distance = float(np.hypot(dx, dy))
+        if distance >= self.spacing:
+            steps = int(distance // self.spacing)
+            ux, uy = dx / distance, dy / distance
+            for step in range(1, steps + 1):
+                self.append(ax + ux * self.spacing * step, ay + uy * self.spacing * step)
+            self._since_simplify += steps
+        self.append(x, y)
+
+        if self.simplify_tolerance is not None and self._since_simplify >= self.simplify_interval:
+            self._since_simplify = 0
+            self.simplify_tail(self.simplify_tolerance, self.keep_recent)
+
+    def simplify_tail(self, tolerance, keep_recent):
+        """用Douglas-Peucker算法化简除最近keep_recent个点以外的尾部"""
+        count = self._end - self._start
+        tail_count = count - keep_recent
+        if tail_count < 3:
+            return
+        tail = self._points[self._start:self._start + tail_count].astype(np.float64)
+        keep = douglas_peucker_mask(tail, tolerance)
+        removed = tail_count - int(np.count_nonzero(keep))
+        if removed == 0:
+            return
+
+        kept_points = np.concatenate([tail[keep], self._points[self._start + tail_count:self._end]]).astype(np.float32)
+        new_count = len(kept_points)
+        self._points[self._start:self._start + new_count] = kept_points
+        self._end = self._start + new_count
+        segments = self._segments[self._start:self._end]
+        segments[0] = 0.0
+        segments[1:] = np.hypot(*np.diff(kept_points.astype(np.float64), axis=0).T)
+        self.total_length = float(segments[1:].sum())
+
+    def trim_to(self, max_length):
+        """从尾部收缩到总长度不超过max_length（至少保留蛇头）
+
+        整段都在超出部分之内时删除尾点；否则只截短最后一段，在切点处插值出新的尾点。
+        化简之后尾部可能是一段很长的线段，整段删除会让蛇身一帧内突然变短很多。
+        """
+        while self.total_length > max_length and self._end - self._start > 1:
+            # 删除尾点时，去掉的是它和下一个点之间的那一段
+            segment = self._segments[self._start + 1]
+            excess = self.total_length - max_length
+            if segment <= excess:
+                self.total_length -= segment
+                self._start += 1
+                continue
+            tail = self._points[self._start].astype(np.float64)
+            after = self._points[self._start + 1].astype(np.float64)
+            remaining = segment - excess
+            self._points[self._start] = after + (tail - after) * (remaining / segment)
+            self._segments[self._start + 1] = remaining
+            self.total_length = float(max_length)
+            break
+        if self._end - self._start <= 1:
+            self.total_length = 0.0
+
+    def head(self):
+        """返回蛇头坐标，缓冲区为空时返回None"""
+        if self._end == self._start:
+            return None
+        x, y = self._points[self._end - 1]
+        return float(x), float(y)
+
+    def points(self):
+        """从尾到头的点坐标视图，形状为(n, 2)，不要修改"""
+        return self._points[self._start:self._end]
+
+    def lengths(self):
+        """相邻点之间的距离视图，长度为n-1"""
+        return self._segments[self._start + 1:self._end]
+
+    def points_int(self):
+        """取整后的点坐标（int32），可以直接交给cv2绘制"""
+        return np.rint(self.points()).astype(np.int32)
+
+
+def douglas_peucker_mask(points, tolerance):
+    """
+    Douglas-Peucker折线化简
+
+    参数:
+        points: (n, 2)数组
+        tolerance: 允许的最大垂直偏差（像素）
+
+    返回:
+        长度为n的布尔数组，True表示保留该点（首尾两点总是保留）
+    """
+    count = len(points)
+    keep = np.zeros(count, dtype=bool)
+    if count == 0:
+        return keep
+    keep[0] = keep[-1] = True
+    # 用栈代替递归，避免长折线递归过深
+    stack = [(0, count - 1)]
+    while stack:
+        first, last = stack.pop()
+        if last - first < 2:
+            continue
+        start = points[first]
+        direction = points[last] - start
+        segment_length = float(np.hypot(direction[0], direction[1]))
+        inner = points[first + 1:last] - start
+        if segment_length < 1e-9:
+            distances = np.hypot(inner[:, 0], inner[:, 1])
+        else:
+            distances = np.abs(inner[:, 0] * direction[1] - inner[:, 1] * direction[0]) / segment_length
+        farthest = int(np.argmax(distances))
+        if distances[farthest] > tolerance:
+            index = first + 1 + farthest
+            keep[index] = True
+            stack.append((first, index))
+            stack.append((index, last))
+    return keep
@@ -0,0 +1,318 @@
+import heapq
+import time
+from collections import deque
+
+from game.core.occupancy_grid import CELL_EMPTY, CELL_SNAKE, CELL_OBSTACLE, CELL_FOOD, CELL_FAKE_FOOD
+
+
+def build_hamiltonian_cycle(width, height):
+    """
+    生成一条经过棋盘每个格子恰好一次、首尾相邻的环路
+
+    宽为偶数时：第0列从上到下，之后各列在第1行到最后一行之间蛇形往返，最后沿第0行回到起点；
+    只有高为偶数时转置构造。宽高都是奇数（或只有一行/一列）时不存在这样的环路，返回None。
+
+    返回:
+        按环路顺序排列的格子列表[(x, y), ...]
+    """
+    if width >= 2 and height >= 2 and width % 2 == 0:
+        order = [(0, y) for y in range(height)]
+        for x in range(1, width):
+            ys = range(height - 1, 0, -1) if x % 2 == 1 else range(1, height)
+            order.extend((x, y) for y in ys)
+        order.extend((x, 0) for x in range(width - 1, 0, -1))
+        return order
+    if width >= 2 and height >= 2 and height % 2 == 0:
+        return [(x, y) for y, x in build_hamiltonian_cycle(height, width)]
+    return None
+
+
+# 搜索、回溯和构造临时表时每处理多少个格子检查一次时间预算
+CHECK_INTERVAL = 32
+
+
+class Autopilot:
+    """经典模式的自动驾驶
+
+    挂在ClassicEngine.pilot上，引擎每次移动前（输入队列为空时）调用next_direction取得转向。决策顺序：
+      1. 沿上次规划的路径继续走，只检查下一格和终点的食物是否仍然有效，不重新搜索
+      2. A*搜索通往最近（曼哈顿距离）真食物的路径；先模拟走完这条路径后的蛇身，确认新蛇头还能走到蛇尾，才采用并缓存这条路径
+      3. 追着自己的蛇尾走，保证不会把自己困住；这次搜索超时就沿上次追蛇尾的路径继续走
+      4. 沿预先生成的哈密顿环路取下一个安全的格子（障碍物会打断环路，所以是按环路顺序挑最近的安全邻格）
+    搜索时考虑蛇身随时间让出的格子：蛇身第j段（0是蛇头）在第(长度-j+1)步之后才能进入，
+    j由引擎记录的蛇头进入该格子的步数（head_stamps）直接算出，格子类型直接读占用网格同步维护的扁平列表（OccupancyGrid.flat）。
+    搜索用的数组（访问标记、父节点、深度、邻接表）在接上引擎和新的一局开始时按棋盘尺寸准备好，用递增的代号代替每次清空，
+    所以搜索之外的决策开销与棋盘大小和蛇长无关。搜索都是A*（按曼哈顿距离朝目标扩展）；
+    挑选目标、搜索、回溯路径和模拟吃完后的蛇身这些与路径长度或食物数量有关的工作都在开始前和每处理CHECK_INTERVAL个格子时检查时间预算，
+    超时立即放弃；找食物最多用一半预算，余下的留给追蛇尾，大棋盘上单次决策的耗时也不超过预算加上一次检查间隔。stats()给出耗时的分位数和超时次数。
+    规划时避开所有其他食物（不吃效果食物），只有退路时才会走非炸弹的其他食物。
+    """
+
+    def __init__(self, engine, budget=0.001, clock=time.perf_counter, history=256):
+        """
+        参数:
+            budget: 每次决策的时间预算（秒）
+            history: stats()统计最近多少次决策的耗时
+        """
+        self.engine = engine
+        self.budget = budget
+        self.clock = clock
+        self.board_size = None
+        self.path = deque()
+        self.tail_path = deque()  # 上次追蛇尾的路径，搜索超时的时候沿它走
+        self.decision_times = deque(maxlen=history)  # 每次决策的耗时（毫秒）
+        self.timeouts = 0                          # 搜索超时的次数
+        self._prepare()
+
+    def reset(self):
+        """新的一局开始时丢弃缓存的路径"""
+        self.path.clear()
+        self.tail_path.clear()
+        self._prepare()
+
+    def _prepare(self):
+        """按棋盘尺寸分配搜索用的数组，尺寸不变时直接复用"""
+        engine = self.engine
+        # 占用网格同步维护的扁平列表，下标x*高+y
+        self.cells = engine.grid.flat
+        size = (engine.grid_width, engine.grid_height)
+        if size == self.board_size:
+            return
+        self.board_size = size
+        width, height = size
+        total = width * height
+        self.neighbours = []
+        for index in range(total):
+            x, y = divmod(index, height)
+            cells = [(x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)]
+            self.neighbours.append([cx * height + cy for cx, cy in cells if 0 <= cx < width and 0 <= cy < height])
+        self.xs = [index // height for index in range(total)]
+        self.ys = [index % height for index in range(total)]
+        self.seen = [0] * total
+        self.parent = [-1] * total
+        self.depth = [0] * total
+        self.generation = 0
+        self.timed_out = False
+
+        cycle = build_hamiltonian_cycle(width, height)
+        if cycle is None:
+            self.cycle_index = None
+        else:
+            self.cycle_index = [0] * total
+            for order, (x, y) in enumerate(cycle):
+                self.cycle_index[x * height + y] = order
+        self.path.clear()
+
+    def next_direction(self):
+        """返回下一步的方向，无路可走时返回None"""
+        start = self.clock()
+        deadline = start + self.budget
+
+        engine = self.engine
+        height = engine.grid_height
+        cells = self.cells
+        stamps = engine.head_stamps
+        hx, hy = engine.snake[0]
+        head = hx * height + hy
+        # 蛇头进入过head_count个格子，进入序号为stamp的格子是蛇身第(head_count-stamp)段，
+        # 要在第(长度-(head_count-stamp)+1)步进入才安全
+        offset = len(engine.snake) + 1 - engine.head_count
+
+        def blocked(index, depth):
+            code = cells[index]
+            if code == CELL_EMPTY or code == CELL_FOOD:
+                return False
+            if code == CELL_SNAKE:
+                return depth < stamps[index] + offset
+            return True
+
+        if len(engine.snake) == 1:
+            # 只有蛇头时身后的格子是空的，但第一步不能掉头
+            dx, dy = engine.direction
+            behind = head - dx * height - dy
+            occupied = blocked
+
+            def blocked(index, depth):
+                return (depth == 1 and index == behind) or occupied(index, depth)
+
+        target = self._follow_path(head, blocked)
+        if target is None:
+            target = self._plan(head, blocked, deadline)
+        if target is None:
+            target = self._cycle_move(head, blocked)
+
+        elapsed = self.clock() - start
+        self.decision_times.append(elapsed * 1000.0)
+        if target is None:
+            return None
+        tx, ty = divmod(target, height)
+        return (tx - hx, ty - hy)
+
+    def _follow_path(self, head, blocked):
+        """缓存的路径仍然有效时取出下一格：下一格相邻且可以进入，终点仍是真食物，途中不会先吃到别的真食物"""
+        path = self.path
+        if not path:
+            return None
+        cells = self.cells
+        step, goal = path[0], path[-1]
+        if (step not in self.neighbours[head] or cells[goal] != CELL_FOOD or blocked(step, 1)
+                or (step != goal and cells[step] == CELL_FOOD)):
+            path.clear()
+            return None
+        return path.popleft()
+
+    def _plan(self, head, blocked, deadline):
+        """搜索通往最近真食物的安全路径，找不到时追蛇尾；返回下一格或None"""
+        engine = self.engine
+        height = engine.grid_height
+        cells = self.cells
+        # 找食物最多用一半预算，留出时间追蛇尾
+        food_deadline = deadline - self.budget / 2
+        if engine.foods and not self._expired(food_deadline):
+            hx, hy = self.xs[head], self.ys[head]
+            fx, fy = min(engine.foods, key=lambda pos: abs(pos[0] - hx) + abs(pos[1] - hy))
+            path = self._search(head, fx * height + fy, blocked, food_deadline,
+                                is_goal=lambda index: cells[index] == CELL_FOOD)
+            if path and self._can_reach_tail(path, food_deadline):
+                self.path.extend(path)
+                self.tail_path.clear()
+                return self.path.popleft()
+
+        if len(engine.snake) > 2:
+            tx, ty = engine.snake[-1]
+            tail = tx * height + ty
+            path = self._search(head, tail, blocked, deadline)
+            if path:
+                self.tail_path = deque(path)
+            elif not self.timed_out:
+                self.tail_path.clear()
+            tail_path = self.tail_path
+            if tail_path and tail_path[0] in self.neighbours[head] and not blocked(tail_path[0], 1):
+                return tail_path.popleft()
+        self.tail_path.clear()
+        return None
+
+    def _can_reach_tail(self, path, deadline):
+        """模拟沿path吃到食物之后的蛇身（长度加一），检查新蛇头能否走到新蛇尾"""
+        engine = self.engine
+        cells = self.cells
+        stamps = engine.head_stamps
+        steps = len(path)
+        length = len(engine.snake)
+        # 路径上第i格（从1数）是新蛇身的第(steps-i)段；原蛇身的格子在走完路径后是第(head_count+steps-stamp)段
+        order = {}
+        for i, index in enumerate(path, 1):
+            order[index] = i
+            if i % CHECK_INTERVAL == 0 and self._expired(deadline):
+                return False
+        path_offset = length + 2 - steps
+        body_offset = path_offset - engine.head_count
+        if steps <= length:
+            tx, ty = engine.snake[length - steps]
+            tail = tx * engine.grid_height + ty
+        else:
+            tail = path[steps - length - 1]
+
+        def blocked(index, depth):
+            i = order.get(index)
+            if i is not None:
+                return depth < i + path_offset
+            code = cells[index]
+            if code == CELL_SNAKE:
+                return depth < stamps[index] + body_offset
+            return code == CELL_OBSTACLE or code == CELL_FAKE_FOOD
+
+        return self._search(path[-1], tail, blocked, deadline) is not None
+
+    def _search(self, start, goal, blocked, deadline, is_goal=None):
+        """
+        A*搜索：按已走步数加到goal的曼哈顿距离扩展，同分时先扩展走得更远的格子
+
+        参数:
+            is_goal: 除goal外也算作终点的格子（例如任意一个真食物）
+        返回:
+            从start（不含）到第一个终点（含）的格子列表；不可达或超时返回None，超时时timed_out为True
+        """
+        if self._expired(deadline):
+            return None
+        self.generation += 1
+        generation = self.generation
+        seen, parent, depth, neighbours = self.seen, self.parent, self.depth, self.neighbours
+        xs, ys = self.xs, self.ys
+        gx, gy = xs[goal], ys[goal]
+        seen[start] = generation
+        depth[start] = 0
+        heap = [(0, 0, start)]
+        popped = 0
+        while heap:
+            index = heapq.heappop(heap)[2]
+            popped += 1
+            if popped % CHECK_INTERVAL == 0 and self._expired(deadline):
+                return None
+            next_depth = depth[index] + 1
+            for neighbour in neighbours[index]:
+                if seen[neighbour] == generation or blocked(neighbour, next_depth):
+                    continue
+                seen[neighbour] = generation
+                parent[neighbour] = index
+                depth[neighbour] = next_depth
+                if neighbour == goal or is_goal is not None and is_goal(neighbour):
+                    return self._trace(start, neighbour, deadline)
+                estimate = next_depth + abs(xs[neighbour] - gx) + abs(ys[neighbour] - gy)
+                heapq.heappush(heap, (estimate, -next_depth, neighbour))
+        return None
+
+    def _expired(self, deadline):
+        """超过deadline时记一次超时并设置timed_out"""
+        self.timed_out = self.clock() > deadline
+        if self.timed_out:
+            self.timeouts += 1
+        return self.timed_out
+
+    def _trace(self, start, goal, deadline):
+        """沿父节点从goal回溯到start，返回不含start的路径；超时返回None"""
+        parent = self.parent
+        path = [goal]
+        while parent[path[-1]] != start:
+            path.append(parent[path[-1]])
+            if len(path) % CHECK_INTERVAL == 0 and self._expired(deadline):
+                return None
+        path.reverse()
+        return path
+
+    def _is_bomb(self, index):
+        engine = self.engine
+        pos = (self.xs[index], self.ys[index])
+        return pos in engine.fake_foods and engine.fake_foods_properties[engine.fake_foods.index(pos)] == 'bomb'
+
+    def _cycle_move(self, head, blocked):
+        """沿哈密顿环路取下一个安全的邻格；没有环路时优先保持当前方向"""
+        cells = self.cells
+        candidates = []
+        for neighbour in self.neighbours[head]:
+            if cells[neighbour] == CELL_FAKE_FOOD:
+                if self._is_bomb(neighbour):
+                    continue
+            elif blocked(neighbour, 1):
+                continue
+            candidates.append(neighbour)
+        if not candidates:
+            return None
+
+        if self.cycle_index is not None:
+            total = len(self.cycle_index)
+            origin = self.cycle_index[head]
+            return min(candidates, key=lambda index: (self.cycle_index[index] - origin) % total)
+
+        dx, dy = self.engine.direction
+        straight = head + dx * self.engine.grid_height + dy
+        return straight if straight in candidates else candidates[0]
+
+    def stats(self):
+        """最近history次决策的耗时统计（毫秒）和累计的超时次数"""
+        if not self.decision_times:
+            return {'count': 0, 'mean': 0.0, 'p95': 0.0, 'p99': 0.0, 'max': 0.0, 'timeouts': self.timeouts}
+        times = sorted(self.decision_times)
+        count = len(times)
+        return {'count': count, 'mean': sum(times) / count, 'p95': times[count * 95 // 100],
+                'p99': times[count * 99 // 100], 'max': times[-1], 'timeouts': self.timeouts}
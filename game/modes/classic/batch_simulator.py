@@ -0,0 +1,233 @@
+import time
+
+import numpy as np
+
+from game.core.occupancy_grid import CELL_EMPTY, CELL_SNAKE, CELL_OBSTACLE, CELL_FOOD
+from game.modes.classic.classic_engine import DIRECTIONS, RIGHT
+
+
+# 动作编号：与DIRECTIONS的顺序一致（上、下、左、右），NOOP表示保持当前方向
+ACTION_NOOP = -1
+DIRECTION_ARRAY = np.asarray(DIRECTIONS, dtype=np.int32)
+
+# 结束原因编号（info['reason']）
+REASON_NONE = 0
+REASON_EDGE = 1
+REASON_SELF = 2
+REASON_OBSTACLE = 3
+REASON_BOARD_FULL = 4
+REASON_NAMES = (None, 'edge', 'self', 'obstacle', 'board_full')
+
+
+class BatchClassicSimulator:
+    """同时推进N局经典模式的批量模拟器
+
+    所有棋盘的状态都保存在按局数堆叠的numpy数组里，每次step用向量化操作让N条蛇同时前进一格：
+      - occupancy: (N, 宽, 高) uint8，格子编码与OccupancyGrid相同（CELL_*）
+      - head: (N, 2) 蛇头坐标；direction: (N, 2) 当前方向；length: (N,) 蛇身长度
+      - double_food: (N, 宽, 高) bool，该格的真食物是否为分数翻倍食物
+      - body: (N, 宽*高+1, 2) 蛇身坐标的环形缓冲，head_index指向蛇头，蛇尾在head_index-length+1
+    reset和step返回的观测是这些数组本身（零拷贝），调用方不要修改，需要保留时自行复制。
+
+    一次step等于ClassicEngine里的一次移动，规则与它一致：撞墙、撞到自己（包括当前蛇尾所在的格子）、
+    撞到障碍物都会结束本局；吃到真食物加1分并生长，分数翻倍食物先加到至少1分再翻倍，
+    吃掉后在空闲格子补一个真食物，没有空位且场上没有真食物时以占满棋盘结束。
+    移动间隔、加减速和冻结这类只影响时间的效果，以及其他食物（炸弹和效果食物）、定时刷新食物不在这里模拟。
+    """
+
+    def __init__(self, num_envs, grid_width=42, grid_height=23, seed=None, auto_reset=True):
+        """
+        参数:
+            num_envs: 同时模拟的局数
+            auto_reset: 结束的棋盘在step末尾自动开始新的一局（最终分数见info['final_score']）
+        """
+        self.num_envs = num_envs
+        self.grid_width = grid_width
+        self.grid_height = grid_height
+        self.auto_reset = auto_reset
+        self.rng = np.random.default_rng(seed)
+
+        cells = grid_width * grid_height
+        self.occupancy = np.zeros((num_envs, grid_width, grid_height), dtype=np.uint8)
+        self.double_food = np.zeros((num_envs, grid_width, grid_height), dtype=bool)
+        self.head = np.zeros((num_envs, 2), dtype=np.int32)
+        self.direction = np.zeros((num_envs, 2), dtype=np.int32)
+        self.length = np.zeros(num_envs, dtype=np.int32)
+        self.body = np.zeros((num_envs, cells + 1, 2), dtype=np.int32)
+        self.head_index = np.zeros(num_envs, dtype=np.int32)
+        self.food_count = np.zeros(num_envs, dtype=np.int32)
+        self.score = np.zeros(num_envs, dtype=np.int64)
+        self.done = np.zeros(num_envs, dtype=bool)
+        self._envs = np.arange(num_envs)
+
+        self.observation = {
+            'occupancy': self.occupancy,
+            'double_food': self.double_food,
+            'head': self.head,
+            'direction': self.direction,
+            'length': self.length,
+        }
+
+        # 吞吐量统计
+        self.total_steps = 0      # 累计推进的棋盘步数（局数 x step次数）
+        self.step_seconds = 0.0   # step累计耗时
+
+    def reset(self, seed=None):
+        """重新开始所有棋盘，返回观测"""
+        if seed is not None:
+            self.rng = np.random.default_rng(seed)
+        self._reset_boards(self._envs)
+        return self.observation
+
+    def step(self, actions):
+        """
+        所有棋盘前进一步
+
+        参数:
+            actions: (N,)整数数组，0-3对应DIRECTIONS，ACTION_NOOP保持方向；掉头会被忽略
+
+        返回:
+            (observation, rewards, dones, info)
+            rewards是本步的得分变化，info包含'reason'（REASON_*编号）、'score'和'final_score'
+        """
+        start = time.perf_counter()
+        envs = self._envs
+        actions = np.asarray(actions, dtype=np.int32)
+        active = ~self.done
+
+        # 转向：不能原地掉头，也不能重复当前方向（与输入队列的规则一致）
+        new_direction = DIRECTION_ARRAY[np.clip(actions, 0, len(DIRECTIONS) - 1)]
+        turn = active & (actions >= 0) & (new_direction + self.direction).any(axis=1)
+        self.direction[turn] = new_direction[turn]
+
+        new_head = self.head + self.direction
+        x, y = new_head[:, 0], new_head[:, 1]
+        in_bounds = (x >= 0) & (x < self.grid_width) & (y >= 0) & (y < self.grid_height)
+        cx = np.clip(x, 0, self.grid_width - 1)
+        cy = np.clip(y, 0, self.grid_height - 1)
+        target = self.occupancy[envs, cx, cy]
+
+        reason = np.zeros(self.num_envs, dtype=np.int8)
+        reason[active & ~in_bounds] = REASON_EDGE
+        reason[active & in_bounds & (target == CELL_SNAKE)] = REASON_SELF
+        reason[active & in_bounds & (target == CELL_OBSTACLE)] = REASON_OBSTACLE
+        moving = active & (reason == REASON_NONE)
+        ate = moving & (target == CELL_FOOD)
+
+        # 计分：分数翻倍食物先加到至少1分再翻倍
+        old_score = self.score.copy()
+        doubled = ate & self.double_food[envs, cx, cy]
+        self.score[ate & ~doubled] += 1
+        self.score[doubled] = np.maximum(self.score[doubled], 1) * 2
+
+        # 蛇头前进
+        movers = np.flatnonzero(moving)
+        mx, my = cx[movers], cy[movers]
+        self.head_index[movers] = (self.head_index[movers] + 1) % self.body.shape[1]
+        self.body[movers, self.head_index[movers]] = new_head[movers]
+        self.occupancy[movers, mx, my] = CELL_SNAKE
+        self.double_food[movers, mx, my] = False
+        self.head[movers] = new_head[movers]
+
+        # 没吃到食物的蛇收缩蛇尾，吃到的生长
+        shrink = np.flatnonzero(moving & ~ate)
+        tail_index = (self.head_index[shrink] - self.length[shrink]) % self.body.shape[1]
+        tails = self.body[shrink, tail_index]
+        self.occupancy[shrink, tails[:, 0], tails[:, 1]] = CELL_EMPTY
+        growers = np.flatnonzero(ate)
+        self.length[growers] += 1
+        self.food_count[growers] -= 1
+
+        # 吃掉的食物在空闲格子补上；没有空位且没有剩余真食物时占满了棋盘
+        if len(growers):
+            placed, px, py = self._place_random(growers, CELL_FOOD)
+            self.food_count[growers[placed]] += 1
+            self.double_food[growers[placed], px, py] = self.rng.random(len(px)) < 0.2
+            full = growers[~placed & (self.food_count[growers] == 0)]
+            reason[full] = REASON_BOARD_FULL
+
+        dones = reason != REASON_NONE
+        self.done |= dones
+        rewards = self.score - old_score
+        final_score = np.where(dones, self.score, 0)
+
+        if self.auto_reset and dones.any():
+            self._reset_boards(np.flatnonzero(dones))
+
+        self.total_steps += int(active.sum())
+        self.step_seconds += time.perf_counter() - start
+        info = {'reason': reason, 'score': self.score, 'final_score': final_score}
+        return self.observation, rewards, dones, info
+
+    @property
+    def steps_per_second(self):
+        """step累计的平均吞吐量（棋盘步/秒）"""
+        return self.total_steps / self.step_seconds if self.step_seconds > 0 else 0.0
+
+    def _reset_boards(self, boards):
+        """重新开始指定的棋盘：蛇在中央向右，5-8个障碍物（不在蛇头周围），10-15个真食物"""
+        count = len(boards)
+        if count == 0:
+            return
+        self.occupancy[boards] = CELL_EMPTY
+        self.double_food[boards] = False
+        center = (self.grid_width // 2, self.grid_height // 2)
+        self.head[boards] = center
+        self.direction[boards] = RIGHT
+        self.length[boards] = 1
+        self.head_index[boards] = 0
+        self.body[boards, 0] = center
+        self.score[boards] = 0
+        self.done[boards] = False
+
+        # 蛇头周围的格子临时占用，障碍物不会生成在这里
+        self.occupancy[boards, center[0], center[1]] = CELL_SNAKE
+        neighbours = [(center[0] + dx, center[1] + dy) for dx, dy in DIRECTIONS]
+        neighbours = [(nx, ny) for nx, ny in neighbours if 0 <= nx < self.grid_width and 0 <= ny < self.grid_height]
+        for nx, ny in neighbours:
+            self.occupancy[boards, nx, ny] = CELL_SNAKE
+        obstacles = self.rng.integers(5, 9, size=count)
+        for i in range(int(obstacles.max())):
+            chosen = boards[obstacles > i]
+            self._place_random(chosen, CELL_OBSTACLE)
+        for nx, ny in neighbours:
+            self.occupancy[boards, nx, ny] = CELL_EMPTY
+
+        foods = self.rng.integers(10, 16, size=count)
+        self.food_count[boards] = 0
+        for i in range(int(foods.max())):
+            chosen = boards[foods > i]
+            placed, px, py = self._place_random(chosen, CELL_FOOD)
+            self.food_count[chosen[placed]] += 1
+            self.double_food[chosen[placed], px, py] = self.rng.random(len(px)) < 0.2
+
+    def _place_random(self, boards, code):
+        """
+        在每个指定棋盘上均匀随机选一个空闲格子写入code
+
+        返回:
+            (placed, xs, ys)：placed是(len(boards),) bool数组，棋盘已满的为False；
+            xs、ys是放置成功的棋盘上选中的坐标，与boards[placed]一一对应
+        """
+        scores = self.rng.random((len(boards), self.grid_width * self.grid_height))
+        scores[self.occupancy[boards].reshape(len(boards), -1) != CELL_EMPTY] = -1.0
+        flat = scores.argmax(axis=1)
+        placed = scores[np.arange(len(boards)), flat] >= 0
+        xs, ys = np.divmod(flat[placed], self.grid_height)
+        self.occupancy[boards[placed], xs, ys] = code
+        return placed, xs, ys
+
+
+def benchmark(num_envs=4096, num_steps=200, seed=0):
+    """用随机动作跑num_steps次step，返回棋盘步/秒"""
+    simulator = BatchClassicSimulator(num_envs, seed=seed)
+    simulator.reset()
+    rng = np.random.default_rng(seed)
+    for _ in range(num_steps):
+        actions = rng.integers(ACTION_NOOP, len(DIRECTIONS), size=num_envs)
+        simulator.step(actions)
+    return simulator.steps_per_second
+
+
+if __name__ == '__main__':
+    print(f"批量模拟吞吐量: {benchmark():,.0f} 步/秒")
@@ -0,0 +1,481 @@
+import random
+import time
+from collections import deque
+
+from game.core.input_queue import DirectionInputQueue
+from game.core.occupancy_grid import OccupancyGrid, BoardFullError, CELL_SNAKE, CELL_OBSTACLE, CELL_FOOD, CELL_FAKE_FOOD, CELL_RESERVED
+from game.core.palette import palette
+from game.core.scheduler import Scheduler
+
+
+# 方向（格子坐标，y向下）
+UP, DOWN, LEFT, RIGHT = (0, -1), (0, 1), (-1, 0), (1, 0)
+DIRECTIONS = (UP, DOWN, LEFT, RIGHT)
+
+# 游戏结束原因，由渲染层翻译成提示文字
+REASON_EDGE = 'edge'
+REASON_SELF = 'self'
+REASON_OBSTACLE = 'obstacle'
+REASON_BOMB = 'bomb'
+REASON_BOARD_FULL = 'board_full'
+
+# step返回的事件类型
+EVENT_EAT_FOOD = 'eat_food'            # {'pos', 'color', 'double'}
+EVENT_EAT_FAKE_FOOD = 'eat_fake_food'  # {'pos', 'color', 'prop'}
+EVENT_FOOD_REFRESH = 'food_refresh'    # {}
+EVENT_EFFECT_END = 'effect_end'        # {'effect'}
+EVENT_GAME_OVER = 'game_over'          # {'reason'}
+
+# 真食物的颜色对（主色, 亮色）
+FOOD_COLORS = [((255,105,180),(255,200,220)), ((135,206,250),(200,230,255)), ((255,255,0),(255,255,200))]
+
+# 其他食物的颜色对，所有属性都随机取色，不根据属性区分
+FAKE_FOOD_COLORS = [
+    ((255, 105, 180), (255, 200, 220)),  # 粉色
+    ((135, 206, 250), (200, 230, 255)),  # 蓝色
+    ((255, 255, 0), (255, 255, 200)),    # 黄色
+    ((255, 69, 0), (255, 150, 100)),     # 橙色
+    ((144, 238, 144), (200, 255, 200)),  # 浅绿色
+    ((255, 182, 193), (255, 200, 210)),  # 浅粉色
+    ((176, 224, 230), (200, 235, 240)),  # 浅蓝色
+    ((221, 160, 221), (230, 180, 230)),  # 浅紫色
+]
+
+# 其他食物的属性：炸弹、变色、加速、减速、冻结、无效果；炸弹概率为1%，无效果占35%
+FAKE_FOOD_PROPERTIES = ['bomb', 'color_change', 'speed_up', 'speed_down', 'freeze', 'none']
+FAKE_FOOD_WEIGHTS = [0.01, 0.16, 0.16, 0.16, 0.16, 0.35]
+MAX_BOMBS = 6  # 场上最多同时存在的炸弹数
+
+# 各种效果的持续时间（秒，模拟时间）
+# 以前每帧都从剩余时间里减去"距上次移动的时间"，名义上的5/12/30秒实际只持续一两秒，
+# 这里取60帧下玩家实际看到的时长，保持原来的手感
+EFFECT_DURATIONS = {'speed_up': 2.0, 'speed_down': 0.6, 'freeze': 1.0}
+
+# 变色效果可能换成的纯色
+RANDOM_SNAKE_COLORS = [
+    (255, 182, 193), (144, 238, 144), (173, 216, 230), (255, 255, 0),
+    (255, 165, 0), (128, 0, 128), (255, 255, 255), (128, 128, 128),
+    (255, 0, 0), (0, 255, 255), (255, 0, 255), (50, 205, 50),
+    (0, 128, 128), (0, 0, 128), (255, 215, 0), (192, 192, 192)
+]
+
+
+class ClassicEngine:
+    """经典模式的纯逻辑引擎
+
+    只负责棋盘状态和游戏规则，不依赖pygame：时间由调用方通过step的dt传入（或用注入的clock由tick计算），
+    随机数全部来自可设定种子的random.Random，相同的种子和输入序列总是得到相同的对局。
+    引擎不画图、不放音效、不发射粒子，也不翻译文字，step返回本步发生的事件列表（见EVENT_*），
+    结束原因是REASON_*代码，由渲染层（ClassicSnakeGame）据此播放音效、发射粒子和显示提示。
+    可以脱离窗口批量运行，用于数值平衡和测试。
+    """
+
+    def __init__(self, grid_width, grid_height, snake_color=(255, 182, 193), seed=None, clock=time.perf_counter):
+        """
+        参数:
+            grid_width, grid_height: 棋盘格子数
+            seed: 随机种子，None表示不固定
+            clock: 返回秒数的时钟，只在tick中用来计算dt，也用于统计按键到转向的延迟
+        """
+        self.grid_width = grid_width
+        self.grid_height = grid_height
+        self.snake_color = snake_color
+        self.clock = clock
+        self.seed = seed
+        self.rng = random.Random(seed)
+        # 棋盘占用网格：蛇身、障碍物和各种食物所在的格子，碰撞和放置检查都查这里
+        self.grid = OccupancyGrid(grid_width, grid_height, rng=self.rng)
+        # 蛇头进入每个格子时是第几步（按扁平下标x*高+y），蛇身上的格子由此可以O(1)算出还要几步才让出
+        self.head_stamps = [0] * (grid_width * grid_height)
+        # 方向输入队列：每走一步消费一条，连续快速按键不会丢失
+        self.input_queue = DirectionInputQueue(clock=clock)
+        # 自动驾驶（见autopilot.Autopilot），输入队列为空时每一步向它要一个方向
+        self.pilot = None
+        # 录像（见replay.ReplayRecorder），记录press、每次有效step的dt和自动驾驶的方向；挂上后step按录像取整后的dt推进
+        self.recorder = None
+        # 效果到期和食物刷新的定时器，按模拟时间触发
+        self.scheduler = Scheduler()
+        self._events = None            # 当前step的事件列表，供定时器回调追加事件
+
+        self.high_score, self.score = 0, 0
+        self.max_length_record = 0  # 历史最长记录
+        self.current_game_max_length = 0  # 当前游戏的最长记录
+        self.reset()
+
+    def reset(self, seed=None):
+        """开始新的一局；指定seed时重新设定随机种子"""
+        if seed is not None:
+            self.seed = seed
+            self.rng.seed(seed)
+        self.input_queue.clear()
+        if self.pilot is not None:
+            self.pilot.reset()
+
+        # 更新历史最长记录
+        if self.current_game_max_length > self.max_length_record:
+            self.max_length_record = self.current_game_max_length
+
+        # 蛇身用双端队列存储，self.snake[0]是蛇头，头尾操作都是O(1)
+        self.grid.clear()
+        self.snake, self.direction = deque(), RIGHT
+        self.head_count = 0            # 蛇头进入过的格子数（含初始位置）
+        self._push_head((self.grid_width // 2, self.grid_height // 2))
+        if self.score > self.high_score: self.high_score = self.score
+        self.score, self.game_over, self.game_started = 0, False, False
+        self.current_game_max_length = 1  # 初始长度为1
+        self.has_started = False
+        self.game_over_reason = None
+
+        self.time = 0.0                # 已经模拟的时间（秒），只在游戏进行中推进
+        self.scheduler.clear(self.time)
+        self.last_clock = None         # tick上一次读取的时钟
+        self.base_move_interval = 0.2
+        self.min_move_interval = 0.04
+        self.first_move_pending = True # 开始后的第一步立即移动
+        self.move_accumulator = 0.0    # 尚未消耗的移动时间（秒）
+        self.max_steps_per_update = 8  # 单次step最多移动的步数
+        self.max_frame_time = 0.25     # 单次step计入移动的最长时间，避免暂停恢复后一次走很多步
+
+        # 效果是否生效；限时效果到期由effect_timers里的定时器关闭
+        self.effects = {
+            'speed_up': False,
+            'speed_down': False,
+            'freeze': False,
+            'color_change': False
+        }
+        self.effect_timers = {}
+
+        self.fake_foods = []
+        self.fake_foods_colors = []
+        self.fake_foods_properties = []
+
+        self.obstacles = []
+        self._generate_obstacles()
+
+        self.foods = []
+        self.food_colors = []
+        self.is_double_score_foods = []
+        for _ in range(self.rng.randint(10, 15)):
+            if not self._spawn_food():
+                break
+        self._generate_other_foods()
+
+        self.food_refresh_interval = 10.0
+        self.scheduler.schedule(self.food_refresh_interval, self._on_food_refresh, interval=self.food_refresh_interval)
+
+    @property
+    def is_frozen(self):
+        return self.effects['freeze']
+
+    def set_pilot(self, pilot):
+        """接上（pilot）或断开（None）自动驾驶；录像会记下切换发生在第几步"""
+        self.pilot = pilot
+        if self.recorder is not None:
+            self.recorder.on_pilot_toggle(pilot is not None)
+
+    def press(self, direction=None):
+        """
+        处理一次按键
+
+        参数:
+            direction: 方向键对应的方向，其他按键传None
+        未开始时任意按键开始游戏；冻结状态下不接受转向，确保蛇纹丝不动。
+        方向放进输入队列，由之后的移动步依次消费，掉头在入队和出队时都会被拒绝。
+        """
+        if self.recorder is not None:
+            self.recorder.on_press(direction)
+        if self.game_over:
+            return
+        if not self.game_started:
+            self.game_started = True
+            self.has_started = True
+        elif self.is_frozen:
+            return
+        if direction is not None:
+            self.input_queue.push(direction, self.direction)
+
+    def tick(self, action=None):
+        """按注入的时钟计算距上次tick的时间并推进，返回本次的事件列表"""
+        now = self.clock()
+        dt = 0.0 if self.last_clock is None else now - self.last_clock
+        self.last_clock = now
+        return self.step(action, dt)
+
+    def step(self, action=None, dt=0.0):
+        """
+        推进dt秒
+
+        参数:
+            action: 本步的方向输入（见DIRECTIONS），None表示没有按键
+            dt: 经过的时间（秒）
+
+        返回:
+            本步发生的事件列表，每个事件是带'type'键的字典
+        """
+        events = []
+        if action is not None:
+            self.press(action)
+        if self.game_over or not self.game_started:
+            return events
+
+        if self.recorder is not None:
+            dt = self.recorder.on_step(dt)
+        self._events = events
+        self._advance(dt, events)
+        self._events = None
+        if self.recorder is not None:
+            self.recorder.on_step_end(self)
+        return events
+
+    def _advance(self, dt, events):
+        """推进模拟时间并按移动间隔移动"""
+        self.time += dt
+        # 触发到期的效果和食物刷新
+        self.scheduler.advance(self.time)
+
+        # 根据蛇的长度动态调整速度：初始0.2秒，每增加1段长度减少0.005秒，但不低于最小移动间隔
+        length_based_speed = 0.2 - (len(self.snake) - 1) * 0.005
+        self.base_move_interval = max(self.min_move_interval, length_based_speed)
+
+        freeze_effect = self.is_frozen
+
+        # 初始化当前移动间隔为基础速度
+        current_move_interval = self.base_move_interval
+
+        # 应用减速效果（优先级较低，先处理）：移动间隔变为当前速度的25倍
+        if self.effects['speed_down']:
+            current_move_interval *= 25
+
+        # 应用加速效果（优先级最高，最后处理）：比当前速度快2倍
+        if self.effects['speed_up']:
+            current_move_interval = max(self.min_move_interval, current_move_interval * 0.5)
+
+        # 按累计时间移动：经过的时间累加到move_accumulator，够几步就走几步，余下的时间留到下一次，
+        # 蛇的速度只取决于移动间隔，与调用step的频率无关；冻结状态下不移动也不累计
+        if self.first_move_pending:
+            self.first_move_pending = False
+            self.move_accumulator = current_move_interval
+        frame_elapsed = min(dt, self.max_frame_time)
+
+        if freeze_effect:
+            self.move_accumulator = 0.0
+        else:
+            self.move_accumulator += frame_elapsed
+            steps = 0
+            while self.move_accumulator >= current_move_interval and steps < self.max_steps_per_update:
+                self.move_accumulator -= current_move_interval
+                steps += 1
+                self._move_step(events)
+                if self.game_over:
+                    return
+            if steps == self.max_steps_per_update:
+                # 达到单次步数上限，丢弃积压的时间，避免之后连续追赶
+                self.move_accumulator = min(self.move_accumulator, current_move_interval)
+
+    def _on_food_refresh(self):
+        self._refresh_foods()
+        if self._events is not None:
+            self._events.append({'type': EVENT_FOOD_REFRESH})
+
+    def _start_effect(self, effect):
+        """开启限时效果；已经生效时重新计时"""
+        self.effects[effect] = True
+        self.scheduler.cancel(self.effect_timers.get(effect))
+        self.effect_timers[effect] = self.scheduler.schedule(EFFECT_DURATIONS[effect], self._end_effect, effect)
+
+    def _end_effect(self, effect):
+        self.effects[effect] = False
+        self.effect_timers.pop(effect, None)
+        if self._events is not None:
+            self._events.append({'type': EVENT_EFFECT_END, 'effect': effect})
+
+    def _end(self, reason, events):
+        self.game_over = True
+        self.game_over_reason = reason
+        events.append({'type': EVENT_GAME_OVER, 'reason': reason})
+
+    def _move_step(self, events):
+        """蛇前进一格：碰撞检测、吃食物和收缩蛇尾"""
+        if self.pilot is not None and not self.input_queue:
+            turn = self.pilot.next_direction()
+            if self.recorder is not None:
+                self.recorder.on_pilot(turn)
+            if turn is not None:
+                self.input_queue.push(turn, self.direction)
+        # 每一步最多消费一条方向输入
+        next_direction = self.input_queue.pop(self.direction)
+        if next_direction is not None:
+            self.direction = next_direction
+        hx, hy = self.snake[0]; dx, dy = self.direction; nh = (hx+dx, hy+dy)
+        target_cell = self.grid.get(nh)
+
+        if target_cell is None:
+            self._end(REASON_EDGE, events)
+            return
+        elif target_cell == CELL_SNAKE:
+            self._end(REASON_SELF, events)
+            return
+        elif target_cell == CELL_OBSTACLE:
+            self._end(REASON_OBSTACLE, events)
+            return
+        # 蛇移动：在蛇头位置插入新的身体段
+        self._push_head(nh)
+
+        if target_cell == CELL_FOOD:
+            eaten_index = self.foods.index(nh)
+            is_double = self.is_double_score_foods[eaten_index]
+            events.append({'type': EVENT_EAT_FOOD, 'pos': nh, 'color': self.food_colors[eaten_index], 'double': is_double})
+
+            # 分数翻倍食物：第一次吃食物时先加1分再翻倍
+            if is_double:
+                if self.score == 0:
+                    self.score += 1
+                self.score *= 2
+            else:
+                self.score += 1
+            # 实时更新最高分
+            if self.score > self.high_score:
+                self.high_score = self.score
+
+            self.foods.pop(eaten_index)
+            self.food_colors.pop(eaten_index)
+            self.is_double_score_foods.pop(eaten_index)
+
+            # 生成新的食物；没有空位且没有剩余真食物时，玩家占满了棋盘
+            if not self._spawn_food() and not self.foods:
+                self._end(REASON_BOARD_FULL, events)
+        else:
+            grew = self._eat_fake_food(nh, events) if target_cell == CELL_FAKE_FOOD else False
+            # 只有在没吃到其他食物或炸弹的情况下，才缩短蛇身
+            if not grew and not self.game_over:
+                self._pop_tail()
+
+        # 更新当前游戏的最长记录
+        if len(self.snake) > self.current_game_max_length:
+            self.current_game_max_length = len(self.snake)
+
+    def _eat_fake_food(self, pos, events):
+        """蛇头吃到pos处的其他食物，处理它的属性效果；返回蛇身是否生长"""
+        i = self.fake_foods.index(pos)
+        prop = self.fake_foods_properties[i]
+        events.append({'type': EVENT_EAT_FAKE_FOOD, 'pos': pos, 'color': self.fake_foods_colors[i], 'prop': prop})
+
+        if prop == 'bomb':
+            self._end(REASON_BOMB, events)
+            return False
+
+        if prop == 'color_change':
+            self.effects['color_change'] = True
+            if self.rng.random() < 0.5:
+                self.snake_color = self.rng.choice(RANDOM_SNAKE_COLORS)
+            else:
+                self.snake_color = self.rng.choice(palette.names())
+        elif prop in EFFECT_DURATIONS:
+            self._start_effect(prop)
+
+        # 除了炸弹外，所有其他食物都加分
+        self.score += 1
+
+        self.fake_foods.pop(i)
+        self.fake_foods_colors.pop(i)
+        self.fake_foods_properties.pop(i)
+
+        # 补上一个新的其他食物，并保证场上至少有4个
+        self._add_fake_food()
+        while len(self.fake_foods) < 4:
+            if not self._add_fake_food():
+                break
+        return True
+
+    def _push_head(self, pos):
+        """蛇头前进到pos，同步占用网格"""
+        self.snake.appendleft(pos)
+        self.grid.set(pos, CELL_SNAKE)
+        self.head_count += 1
+        self.head_stamps[pos[0] * self.grid_height + pos[1]] = self.head_count
+
+    def _pop_tail(self):
+        """移除蛇尾，同步占用网格，返回被移除的格子"""
+        tail = self.snake.pop()
+        self.grid.release(tail, CELL_SNAKE)
+        return tail
+
+    def _refresh_foods(self):
+        """重新生成3-5个真食物和全部其他食物"""
+        for pos in self.foods:
+            self.grid.release(pos, CELL_FOOD)
+        self.foods = []
+        self.food_colors = []
+        self.is_double_score_foods = []
+        for _ in range(self.rng.randint(3, 5)):
+            if not self._spawn_food():
+                break
+        self._generate_other_foods()
+
+    def _generate_other_foods(self):
+        """生成20-28个其他食物，增加游戏难度和多样性"""
+        for pos in self.fake_foods:
+            self.grid.release(pos, CELL_FAKE_FOOD)
+        self.fake_foods = []
+        self.fake_foods_colors = []
+        self.fake_foods_properties = []
+
+        for _ in range(self.rng.randint(20, 28)):
+            if not self._add_fake_food():
+                break
+
+    def _add_fake_food(self):
+        """在空闲格子放置一个随机属性和颜色的其他食物，棋盘已满时返回False"""
+        try:
+            pos = self.grid.sample_free()
+        except BoardFullError:
+            return False
+        self.grid.set(pos, CELL_FAKE_FOOD)
+
+        prop = self.rng.choices(FAKE_FOOD_PROPERTIES, weights=FAKE_FOOD_WEIGHTS)[0]
+        # 限制炸弹数量
+        if prop == 'bomb' and self.fake_foods_properties.count('bomb') >= MAX_BOMBS:
+            prop = self.rng.choice(FAKE_FOOD_PROPERTIES[1:])
+
+        self.fake_foods.append(pos)
+        self.fake_foods_colors.append(self.rng.choice(FAKE_FOOD_COLORS))
+        self.fake_foods_properties.append(prop)
+        return True
+
+    def _spawn_food(self):
+        """放置一个真食物并加入食物列表，棋盘已满时返回False"""
+        try:
+            pos = self.grid.sample_free()
+        except BoardFullError:
+            return False
+        self.grid.set(pos, CELL_FOOD)
+        self.foods.append(pos)
+        self.food_colors.append(self.rng.choice(FOOD_COLORS))
+        self.is_double_score_foods.append(self.rng.random() < 0.2)  # 20%概率生成特殊食物
+        return True
+
+    def _generate_obstacles(self):
+        """生成5-8个随机障碍物，增加游戏难度"""
+        for obstacle_pos in self.obstacles:
+            self.grid.release(obstacle_pos, CELL_OBSTACLE)
+        self.obstacles = []
+
+        # 确保障碍物不会出现在蛇头周围：先把与蛇头曼哈顿距离为1的空格临时保留起来
+        snake_head = self.snake[0]
+        reserved = []
+        for dx, dy in DIRECTIONS:
+            cell = (snake_head[0] + dx, snake_head[1] + dy)
+            if self.grid.is_free(cell):
+                self.grid.set(cell, CELL_RESERVED)
+                reserved.append(cell)
+
+        for _ in range(self.rng.randint(5, 8)):
+            try:
+                obstacle_pos = self.grid.sample_free()
+            except BoardFullError:
+                break
+            self.obstacles.append(obstacle_pos)
+            self.grid.set(obstacle_pos, CELL_OBSTACLE)
+
+        for cell in reserved:
+            self.grid.release(cell, CELL_RESERVED)
@@ -16,17 +16,68 @@ import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
 
 from game.core.game_ui import emit_particle_burst, draw_and_update_effects
+from game.core.palette import palette, CYCLE_RAINBOW
+from game.core.scheduler import Scheduler
+from game.modes.classic.autopilot import Autopilot
+from game.modes.classic.replay import ReplayRecorder
+from game.modes.classic.classic_engine import (ClassicEngine, UP, DOWN, LEFT, RIGHT, EVENT_EAT_FOOD, EVENT_EAT_FAKE_FOOD, EVENT_EFFECT_END, EVENT_GAME_OVER,
+                                               REASON_EDGE, REASON_SELF, REASON_OBSTACLE, REASON_BOMB, REASON_BOARD_FULL)
 from game.utils.language_manager import get_translation
+from game.utils.game_data import GAME_DATA_FILE, ensure_data_dir_exists
+
+
+# 方向键到方向的映射
+KEY_DIRECTIONS = {
+    pygame.K_UP: UP, pygame.K_w: UP,
+    pygame.K_DOWN: DOWN, pygame.K_s: DOWN,
+    pygame.K_LEFT: LEFT, pygame.K_a: LEFT,
+    pygame.K_RIGHT: RIGHT, pygame.K_d: RIGHT,
+}
+
+# 结束原因对应的提示文字
+GAME_OVER_TEXT_KEYS = {
+    REASON_EDGE: 'classic_edge_death',
+    REASON_SELF: 'classic_self_death',
+    REASON_OBSTACLE: 'classic_obstacle_death',
+    REASON_BOMB: 'classic_bomb_death',
+    REASON_BOARD_FULL: 'classic_board_full',
+}
+
+# 自动驾驶开关键；自动驾驶时一局结束后等待这么久（毫秒）自动开始下一局
+AUTOPILOT_KEY = pygame.K_F2
+AUTOPILOT_RESTART_DELAY = 3000
+
+# 最近一局的录像，可以用 python -m game.modes.classic.replay 回放校验
+LAST_REPLAY_FILE = os.path.join(os.path.dirname(GAME_DATA_FILE), "classic_last_replay.json.gz")
+
+# 效果提示：(文字键, 显示秒数, 文字颜色, 屏幕上方的粒子颜色)；显示秒数为None时一直显示到效果结束
+EFFECT_DISPLAYS = {
+    'double_score': ('effect_double_score', 1.0, (255, 215, 0), ((255, 215, 0), (255, 235, 150))),
+    'color_change': ('effect_color_change', 1.0, (255, 0, 255), ((255, 0, 255), (255, 150, 255))),
+    'speed_up': ('effect_speed_up', 1.0, (0, 255, 0), ((0, 255, 0), (150, 255, 150))),
+    'speed_down': ('effect_speed_down', 1.5, (0, 0, 255), ((0, 0, 255), (150, 150, 255))),
+    'freeze': ('effect_freeze', None, (0, 0, 255), ((255, 255, 255), (200, 200, 200))),
+}
+
+# 真食物闪烁的切换间隔（秒）
+FOOD_BLINK_TIME = 0.3
+
 
 class ClassicSnakeGame:
-    def __init__(self, snake_color=(255, 182, 193), width=1280, height=720, gradient_colors_data=None): # 增加gradient_colors_data参数
+    """经典模式的渲染层
+
+    游戏规则和棋盘状态都在ClassicEngine里，这里只负责：把按键交给引擎、用pygame的时钟驱动引擎、
+    根据引擎返回的事件播放音效、发射粒子和显示效果提示，以及绘制画面。
+    """
+
+    def __init__(self, snake_color=(255, 182, 193), width=1280, height=720, seed=None):
         self.WHITE, self.BLACK = (255,255,255), (0,0,0)
-        self.snake_color = snake_color
-        self.FOOD_COLORS = [((255,105,180),(255,200,220)), ((135,206,250),(200,230,255)), ((255,255,0),(255,255,200))]
         self.width, self.height, self.grid_size = width, height, 30
 
         self.grid_width = max(1, (self.width - 20) // self.grid_size)
         self.grid_height = max(1, (self.height - 20) // self.grid_size)
+        self.engine = ClassicEngine(self.grid_width, self.grid_height, snake_color=snake_color, seed=seed,
+                                    clock=lambda: pygame.time.get_ticks() / 1000.0)
         
         from game.utils.improved_chinese_text import get_font_path
         font_path = get_font_path()
@@ -38,213 +89,100 @@ class ClassicSnakeGame:
                 self.font_large, self.font_small = pygame.font.Font(None, 80), pygame.font.Font(None, 40)
         else:
             self.font_large, self.font_small = pygame.font.Font(None, 80), pygame.font.Font(None, 40)
-        
-        self.high_score, self.score = 0, 0
-        self.max_length_record = 0  # 历史最长记录
-        self.current_game_max_length = 0  # 当前游戏的最长记录
-        self.gradient_colors_data = gradient_colors_data if gradient_colors_data is not None else {} 
 
-        self.last_countdown_update = 0  
-        self.current_freeze_display = 0  
         self.boom_sound = None
         self.fail_sound = None
         self.sound_played_this_frame = False  # 标志位，确保每个帧只播放一次音效
+        self.autopilot = Autopilot(self.engine)
+        self.recorder = ReplayRecorder()
+        self.engine.recorder = self.recorder
+        # 闪烁和效果提示倒计时的定时器，按pygame时钟触发
+        self.timers = Scheduler()
         self.reset()
 
-    def reset(self):
-        # 更新历史最长记录
-        if self.current_game_max_length > self.max_length_record:
-            self.max_length_record = self.current_game_max_length
-        
-        self.snake, self.direction = [(self.grid_width//2, self.grid_height//2)], (1,0)
-        if self.score > self.high_score: self.high_score = self.score
-        self.score, self.game_over, self.game_started = 0, False, False
-        self.current_game_max_length = 1  # 初始长度为1
-
-        self.has_started = False
+    # 控制器直接读写的状态都转发到引擎
+    @property
+    def snake_color(self):
+        return self.engine.snake_color
 
-        self.game_over_reason = None
+    @snake_color.setter
+    def snake_color(self, value):
+        self.engine.snake_color = value
 
-        self.base_move_interval = 0.2  
-        self.move_interval = self.base_move_interval
-        self.min_move_interval = 0.04  
-        self.acceleration_time = 0  
-        self.acceleration_duration = 0.5  
-        self.last_move_time = 0
+    @property
+    def score(self):
+        return self.engine.score
 
-        self.food_blink_timer = 0
-        self.food_blink_interval = 1.0  
-        self.food_visible = True
-        
-        self.sound_played_this_frame = False  # 重置音效播放标志位
+    @property
+    def high_score(self):
+        return self.engine.high_score
 
-        self.fake_foods = []
-        self.fake_foods_colors = []
-        self.fake_foods_age = []
-        self.fake_foods_properties = []  
-        
+    @high_score.setter
+    def high_score(self, value):
+        self.engine.high_score = value
 
-        self.effects = {
-            'speed_up': 0,      
-            'speed_down': 0,    
-            'freeze': 0,        
-            'color_change': False  
-        }
-        
-
-        self.effect_display = None  
-        
+    @property
+    def game_over(self):
+        return self.engine.game_over
 
-        self.obstacles = []
-        self._generate_obstacles()
-        
+    @game_over.setter
+    def game_over(self, value):
+        self.engine.game_over = value
 
-        self.foods = []  
-        self.food_colors = []  
-        self.is_double_score_foods = []  
-        
+    @property
+    def game_started(self):
+        return self.engine.game_started
 
-        for _ in range(random.randint(10, 15)):
-            pos, color = self._place_food()
-            self.foods.append(pos)
-            self.food_colors.append(color)
-            self.is_double_score_foods.append(random.random() < 0.2)  
-        
+    @game_started.setter
+    def game_started(self, value):
+        self.engine.game_started = value
 
-        self._generate_other_foods()
-        
+    @property
+    def has_started(self):
+        return self.engine.has_started
 
+    def reset(self):
+        input_queue = self.engine.input_queue
+        if input_queue.latencies:
+            stats = input_queue.latency_stats()
+            print(f"按键到转向延迟: 平均{stats['mean']:.1f}ms, p95 {stats['p95']:.1f}ms, 最大{stats['max']:.1f}ms, 丢弃{stats['dropped']}次")
+        # 每局用新的随机种子，连同之后的输入一起录下来，便于重现问题
+        self.engine.reset(seed=random.randrange(2 ** 32))
+        self.recorder.start(self.engine)
+
+        self.timers.clear(pygame.time.get_ticks() / 1000.0)
+        self.food_visible = True
+        self.timers.schedule(FOOD_BLINK_TIME, self._toggle_food_blink, interval=FOOD_BLINK_TIME)
+        self.sound_played_this_frame = False  # 重置音效播放标志位
+        self.effect_display = None  
+        self.effect_display_timer = None
         self.restart_button_rect = None
         self.menu_button_rect = None
-        
-
-        self.food_refresh_interval = 10.0  
-        self.last_food_refresh_time = pygame.time.get_ticks() / 1000.0  
-        
-
-        self.last_countdown_update = 0  
-        self.current_freeze_display = 0  
-    
-    def _generate_other_foods(self):
-        """生成多个食物，增加游戏难度和多样性"""
-        # 清除旧的食物
-        self.fake_foods = []
-        self.fake_foods_colors = []
-        self.fake_foods_age = []
-        self.fake_foods_properties = []  # 存储每个食物的属性
-        
-        # 增加食物数量：生成20-28个食物，提高游戏难度
-        num_other_foods = random.randint(20, 28)
-        bomb_count = 0
-        
-        # 食物属性列表和概率分布
-        # 属性包括：炸弹、变色、加速、减速、冻结
-        properties = ['bomb', 'color_change', 'speed_up', 'speed_down', 'freeze', 'none']
-        # 概率分布：炸弹概率为1%，其他食物占35%
-        weights = [0.01, 0.16, 0.16, 0.16, 0.16, 0.35]
-        
-        for i in range(num_other_foods):
-            pos = self._place_other_food()
-            self.fake_foods.append(pos)
-            
-            # 随机选择食物属性
-            prop = random.choices(properties, weights=weights)[0]
-            
-            # 限制炸弹数量，每轮最多生成6个炸弹
-            if prop == 'bomb' and bomb_count >= 6:
-                prop = random.choice(['color_change', 'speed_up', 'speed_down', 'freeze', 'none'])
-            elif prop == 'bomb':
-                bomb_count += 1
-            
-            # 所有食物都使用随机颜色，不根据属性区分
-            # 创建一个包含多种颜色对的列表，用于随机选择
-            all_colors = [
-                ((255, 105, 180), (255, 200, 220)),  # 粉色
-                ((135, 206, 250), (200, 230, 255)),  # 蓝色
-                ((255, 255, 0), (255, 255, 200)),    # 黄色
-                ((255, 69, 0), (255, 150, 100)),     # 橙色
-                ((144, 238, 144), (200, 255, 200)),  # 浅绿色
-                ((255, 182, 193), (255, 200, 210)),  # 浅粉色
-                ((176, 224, 230), (200, 235, 240)),  # 浅蓝色
-                ((221, 160, 221), (230, 180, 230)),  # 浅紫色
-            ]
-            
-            # 随机选择一个颜色对
-            food_color = random.choice(all_colors)
-            self.fake_foods_colors.append(food_color)
-            self.fake_foods_age.append(0)
-            self.fake_foods_properties.append(prop)
-    
-    def _place_other_food(self):
-        """放置其他食物"""
-        while True:
-            pos = (random.randint(0, self.grid_width-1), random.randint(0, self.grid_height-1))
-            if pos not in self.snake and pos not in self.foods and pos not in self.obstacles:
-                return pos
-
-    def _place_food(self):
-        while True:
-            pos = (random.randint(0, self.grid_width-1), random.randint(0, self.grid_height-1))
-
-            if pos not in self.snake and pos not in self.obstacles and pos not in self.foods:
-                return pos, random.choice(self.FOOD_COLORS)
-    
-    def _generate_obstacles(self):
-        """生成随机障碍物，增加游戏难度"""
-        # 清除旧的障碍物
-        self.obstacles = []
-        
-        # 生成3-5个障碍物
-        num_obstacles = random.randint(5, 8)
-        for _ in range(num_obstacles):
-            while True:
-                # 随机生成障碍物位置
-                obstacle_pos = (random.randint(0, self.grid_width-1), random.randint(0, self.grid_height-1))
-                # 确保障碍物不会出现在蛇的初始位置或周围
-                snake_head = self.snake[0]
-                # 计算障碍物与蛇头的曼哈顿距离
-                distance_to_head = abs(obstacle_pos[0] - snake_head[0]) + abs(obstacle_pos[1] - snake_head[1])
-                
-                if (distance_to_head >= 2 and 
-                    obstacle_pos not in self.snake and 
-                    (not hasattr(self, 'foods') or obstacle_pos not in self.foods) and
-                    (not hasattr(self, 'fake_foods') or obstacle_pos not in self.fake_foods)):
-                    break
-            
-            self.obstacles.append(obstacle_pos)
+        self.exit_button_rect = None
+        self.game_over_time = None
+
+    def _cell_center(self, pos):
+        """格子中心的屏幕坐标"""
+        return (pos[0]*self.grid_size+self.grid_size//2+10, pos[1]*self.grid_size+self.grid_size//2+10)
+
+    def toggle_autopilot(self):
+        """开关自动驾驶；打开时如果还没开始就直接开始游戏"""
+        if self.engine.pilot is None:
+            self.engine.set_pilot(self.autopilot)
+            self.engine.press()
+        else:
+            stats = self.autopilot.stats()
+            print(f"自动驾驶决策耗时: 平均{stats['mean']:.3f}ms, p99 {stats['p99']:.3f}ms, 最大{stats['max']:.3f}ms, 超时{stats['timeouts']}次")
+            self.engine.set_pilot(None)
 
     def handle_input(self, event):
+        if event.type == pygame.KEYDOWN and event.key == AUTOPILOT_KEY:
+            self.toggle_autopilot()
+            return
         if not self.game_over:
             if event.type == pygame.KEYDOWN:
-                if not self.game_started: 
-                    self.game_started = True
-                    self.has_started = True
-                else:
-                    # 检查是否处于冻结状态
-                    if self.effects['freeze'] > 0:
-                        # 冻结状态下不处理方向键输入，确保蛇纹丝不动
-                        return
-                
-                # 保存当前方向
-                old_direction = self.direction
-                
-                # 处理方向键输入
-                if event.key in (pygame.K_UP, pygame.K_w):
-                    if self.direction != (0, 1):
-                        # 直接转向，允许掉头
-                        self.direction = (0, -1)
-                elif event.key in (pygame.K_DOWN, pygame.K_s):
-                    if self.direction != (0, -1):
-                        # 直接转向，允许掉头
-                        self.direction = (0, 1)
-                elif event.key in (pygame.K_LEFT, pygame.K_a):
-                    if self.direction != (1, 0):
-                        # 直接转向，允许掉头
-                        self.direction = (-1, 0)
-                elif event.key in (pygame.K_RIGHT, pygame.K_d):
-                    if self.direction != (-1, 0):
-                        # 直接转向，允许掉头
-                        self.direction = (1, 0)
+                # 未开始时任意键开始游戏，方向键交给引擎的输入队列
+                self.engine.press(KEY_DIRECTIONS.get(event.key))
         else:
             # 游戏结束时处理鼠标点击，不响应键盘事件
             if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
@@ -259,427 +197,88 @@ class ClassicSnakeGame:
                     self.game_over = False
                     self.game_started = False
                 # 检查是否点击了退出游戏按钮
-                elif hasattr(self, 'exit_button_rect') and self.exit_button_rect and self.exit_button_rect.collidepoint(mouse_x, mouse_y):
+                elif self.exit_button_rect and self.exit_button_rect.collidepoint(mouse_x, mouse_y):
                     # 退出游戏
                     import sys
                     sys.exit()
 
     def update(self):
+        # 自动驾驶时一局结束后自动开始下一局
+        if self.game_over and self.engine.pilot is not None and self.game_over_time is not None:
+            if pygame.time.get_ticks() - self.game_over_time >= AUTOPILOT_RESTART_DELAY:
+                self.reset()
+                self.engine.press()
         if self.game_over or not self.game_started: return
         
         # 重置音效播放标志位，确保每个帧只播放一次音效
         self.sound_played_this_frame = False
         
-        current_time = pygame.time.get_ticks()
-        time_since_last_move = current_time - self.last_move_time
-        delta_time = time_since_last_move / 1000.0  # 转换为秒
-        
-        # 更新各种效果的剩余时间
-        for effect in self.effects:
-            if effect != 'color_change' and self.effects[effect] > 0:
-                self.effects[effect] -= delta_time
-                # 确保效果时间不会为负数
-                if self.effects[effect] < 0:
-                    self.effects[effect] = 0
-        
-        # 根据蛇的长度动态调整速度
-        # 蛇长度越长，速度越快，但有合理上限
-        snake_length = len(self.snake)
-        
-        # 基础速度计算：初始速度0.2秒，每增加1段长度减少0.005秒
-        # 初始长度为1，所以长度差为snake_length - 1
-        length_based_speed = 0.2 - (snake_length - 1) * 0.005
-        
-        # 确保速度不超过合理上限（最小移动间隔）
-        self.base_move_interval = max(self.min_move_interval, length_based_speed)
-        
-        # 应用效果
-        current_move_interval = self.base_move_interval
-        
-        # 检查冻结效果
-        freeze_effect = self.effects['freeze'] > 0
-        if freeze_effect:
-            # 如果处于冻结状态，不移动
-            # 更新真食物闪烁
-            blink_time = 0.3  # 固定闪烁时间（秒）
-            self.food_visible = (current_time % (int(blink_time * 1000) * 2)) < int(blink_time * 1000)
-        
-        # 更新假食物年龄
-        for i in range(len(self.fake_foods_age)):
-            self.fake_foods_age[i] += delta_time * 0.01
-        
-        # 更新效果提示时间
-        if self.effect_display:
-            # 检查是否是冻结效果
-            is_freeze_effect = get_translation('effect_freeze') in self.effect_display['text']
-            
-            if is_freeze_effect:
-                # 冻结效果：检查效果是否已经结束
-                if self.effects['freeze'] <= 0:
-                    self.effect_display = None
-            else:
-                # 其他效果：正常倒计时
-                self.effect_display['time'] -= 1
-                if self.effect_display['time'] <= 0:
-                    self.effect_display = None
-        
-        # 检查食物是否需要自动刷新
-        current_time_sec = current_time / 1000.0
-        if current_time_sec - self.last_food_refresh_time >= self.food_refresh_interval:
-            # 重新生成真食物，支持多个真食物
-            self.foods = []  # 清空现有真食物
-            self.food_colors = []
-            self.is_double_score_foods = []
-            
-            # 生成3-5个新的真食物
-            for _ in range(random.randint(3, 5)):
-                pos, color = self._place_food()
-                self.foods.append(pos)
-                self.food_colors.append(color)
-                self.is_double_score_foods.append(random.random() < 0.2)  # 20%概率生成特殊食物
-            
-            # 重新生成其他食物
-            self._generate_other_foods()
-            # 更新上次刷新时间
-            self.last_food_refresh_time = current_time_sec
-        
-        # 初始化当前移动间隔为基础速度
-        current_move_interval = self.base_move_interval
-        
-        # 应用减速效果（优先级较低，先处理）
-        if self.effects['speed_down'] > 0:
-            # 减速效果：移动间隔变为当前速度的25倍
-            current_move_interval *= 25
-        
-        # 应用同方向按键加速
-        if self.acceleration_time > 0:
-            # 同方向按键加速：比当前速度快2倍
-            current_move_interval = max(self.min_move_interval, current_move_interval * 0.5)
-            self.acceleration_time -= delta_time
-            if self.acceleration_time <= 0:
-                self.acceleration_time = 0
-        
-        # 应用加速效果（优先级最高，最后处理）
-        if self.effects['speed_up'] > 0:
-            # 加速效果：比当前速度快2倍，确保总是大于当前速度
-            current_move_interval = max(self.min_move_interval, current_move_interval * 0.5)
-        
-        # 独立的真食物闪烁更新，确保一直稳定闪烁
-        blink_time = 0.3  # 固定闪烁时间（秒）
-        # 使用当前时间的毫秒值取模，确保闪烁稳定
-        self.food_visible = (current_time % (int(blink_time * 1000) * 2)) < int(blink_time * 1000)
-        
-        # 检查是否需要移动
-        # 使用计算好的current_move_interval，确保加速和减速效果生效
-        # 冻结状态下不移动
-        # 重新计算当前时间，确保时间准确
-        current_time_now = pygame.time.get_ticks()
-        time_since_last_move_now = current_time_now - self.last_move_time
-        
-        if time_since_last_move_now >= current_move_interval * 1000 and not freeze_effect:
-            self.last_move_time = current_time_now
-            
-            hx, hy = self.snake[0]; dx, dy = self.direction; nh = (hx+dx, hy+dy)
-            
-            # 修复碰撞检测，确保蛇不会移出屏幕边界或撞到障碍物
-            if not (0 <= nh[0] < self.grid_width and 0 <= nh[1] < self.grid_height):
-                # 碰到屏幕边缘
-                self.game_over_reason = get_translation('classic_edge_death')
-                self.game_over = True
-                # 播放游戏结束音效
-                if self.fail_sound:
-                    try:
-                        self.fail_sound.play()
-                    except Exception as e:
-                        print(f"播放游戏结束音效失败: {e}")
-                return  # 游戏结束，退出update方法
-            elif nh in self.snake:
-                # 碰到自己身体
-                self.game_over_reason = get_translation('classic_self_death')
-                self.game_over = True
-                # 播放游戏结束音效
-                if self.fail_sound:
-                    try:
-                        self.fail_sound.play()
-                    except Exception as e:
-                        print(f"播放游戏结束音效失败: {e}")
-                return  # 游戏结束，退出update方法
-            elif nh in self.obstacles:
-                # 碰到障碍物
-                self.game_over_reason = get_translation('classic_obstacle_death')
-                self.game_over = True
-                # 播放游戏结束音效
-                if self.fail_sound:
-                    try:
-                        self.fail_sound.play()
-                    except Exception as e:
-                        print(f"播放游戏结束音效失败: {e}")
-                return  # 游戏结束，退出update方法
-            # 蛇移动：在蛇头位置插入新的身体段
-            self.snake.insert(0, nh)
-            
-            # 检查是否吃到食物
-            food_eaten = False
-            eaten_index = -1
-            
-            # 使用列表副本进行遍历，避免在遍历过程中修改列表导致的问题
-            for i, food in enumerate(self.foods.copy()):
-                if self.snake[0] == food:
-                    food_eaten = True
-                    eaten_index = i
-                    break
-            
-            if food_eaten:
-                # 吃到了食物
-                pos_px = (self.foods[eaten_index][0]*self.grid_size+self.grid_size//2+10, self.foods[eaten_index][1]*self.grid_size+self.grid_size//2+10)
-                emit_particle_burst(30, pos_px, [self.food_colors[eaten_index]])
-                
-                # 播放吃到食物音效，确保每个帧只播放一次
-                if self.boom_sound and not self.sound_played_this_frame:
-                    try:
-                        self.boom_sound.play()
-                        self.sound_played_this_frame = True  # 标记为已播放
-                    except Exception as e:
-                        print(f"播放吃到食物音效失败: {e}")
-                
-                # 检查是否是分数翻倍食物
-                if self.is_double_score_foods[eaten_index]:
-                    if self.score == 0:  # 第一次吃食物
-                        self.score += 1  # 先加1分
-                        self.score *= 2
-                    else:
-                        self.score *= 2   # 然后分数翻倍
-                    # 显示分数翻倍效果提示
-                    self.effect_display = {'text': get_translation('effect_double_score'), 'time': 60, 'color': (255, 215, 0)}
-                    # 在屏幕正上方添加粒子特效
-                    screen_top_center = (self.width // 2, 50)
-                    emit_particle_burst(30, screen_top_center, [((255, 215, 0), (255, 235, 150))])
-                else:
-                    # 普通食物：加1分
-                    self.score += 1
-                
-                # 实时更新最高分
-                if self.score > self.high_score:
-                    self.high_score = self.score
-                
-                # 吃到食物后，移除被吃掉的食物
-                self.foods.pop(eaten_index)
-                self.food_colors.pop(eaten_index)
-                self.is_double_score_foods.pop(eaten_index)
-                
-                # 生成新的食物
-                new_pos, new_color = self._place_food()
-                self.foods.append(new_pos)
-                self.food_colors.append(new_color)
-                self.is_double_score_foods.append(random.random() < 0.2)  # 20%概率生成特殊食物
-            
-            # 检查是否吃到其他食物或炸弹
-            else:
-                game_over, other_food_eaten = self._check_other_foods()
-                # 只有在没吃到其他食物或炸弹的情况下，才缩短蛇身
-                if not other_food_eaten and not game_over:
-                    self.snake.pop()
-            
-            # 更新当前游戏的最长记录
-            current_length = len(self.snake)
-            if current_length > self.current_game_max_length:
-                self.current_game_max_length = current_length
-            
-            # 检查游戏是否结束，确保游戏结束音效只播放一次
-            if self.game_over and not hasattr(self, 'game_over_sound_played'):
-                # 播放游戏结束音效
-                if self.fail_sound:
-                    try:
-                        self.fail_sound.play()
-                        self.game_over_sound_played = True  # 标记为已播放
-                    except Exception as e:
-                        print(f"播放游戏结束音效失败: {e}")
-        
-        # 更新假食物年龄
-        for i in range(len(self.fake_foods_age)):
-            self.fake_foods_age[i] += delta_time * 0.01
-    
-    def _check_other_foods(self):
-        """检查其他食物和炸弹，处理各种属性效果"""
-        snake_head = self.snake[0]
-        to_remove = []
-        other_food_eaten = False  
-        
-        # 使用列表副本进行遍历，避免在遍历过程中修改列表导致的无限循环
-        for i, other_food in enumerate(self.fake_foods.copy()):
-            if snake_head == other_food:
-                prop = self.fake_foods_properties[i]
-                pos_px = (other_food[0]*self.grid_size+self.grid_size//2+10, other_food[1]*self.grid_size+self.grid_size//2+10)
-                
-                emit_particle_burst(20, pos_px, [self.fake_foods_colors[i]])
-                
-                # 播放吃到食物音效（炸弹除外），确保每个帧只播放一次
-                if prop != 'bomb' and self.boom_sound and not self.sound_played_this_frame:
-                    try:
-                        self.boom_sound.play()
-                        self.sound_played_this_frame = True  # 标记为已播放
-                    except Exception as e:
-                        print(f"播放吃到食物音效失败: {e}")
-                
-                if prop == 'bomb':
-                    self.game_over = True
-                    self.game_over_reason = 'bomb'
-                    # 播放游戏结束音效
-                    if self.fail_sound:
-                        try:
-                            self.fail_sound.play()
-                        except Exception as e:
-                            print(f"播放游戏结束音效失败: {e}")
-                    return True, False  # 吃到炸弹，返回True表示游戏结束，False表示没有吃到可生长的食物
-                
-                # 吃到了非炸弹的食物，标记为需要生长
-                other_food_eaten = True
-                
-                if prop == 'color_change':
-                    self.effects['color_change'] = True
-                    from core.game_ui import gradient_colors_data
-                    if random.random() < 0.5:
-                        self.snake_color = random.choice([
-                            (255, 182, 193), (144, 238, 144), (173, 216, 230), (255, 255, 0),
-                            (255, 165, 0), (128, 0, 128), (255, 255, 255), (128, 128, 128),
-                            (255, 0, 0), (0, 255, 255), (255, 0, 255), (50, 205, 50),
-                            (0, 128, 128), (0, 0, 128), (255, 215, 0), (192, 192, 192)
-                        ])
-                    else:
-                        self.snake_color = random.choice(list(gradient_colors_data.keys()))
-                    self.effect_display = {'text': get_translation('effect_color_change'), 'time': 60, 'color': (255, 0, 255)}
-                    screen_top_center = (self.width // 2, 50)
-                    emit_particle_burst(30, screen_top_center, [((255, 0, 255), (255, 150, 255))])
-                elif prop == 'speed_up':
-                    self.effects['speed_up'] = 5.0
-                    self.effect_display = {'text': get_translation('effect_speed_up'), 'time': 60, 'color': (0, 255, 0)}
-                    screen_top_center = (self.width // 2, 50)
-                    emit_particle_burst(30, screen_top_center, [((0, 255, 0), (150, 255, 150))])
-                elif prop == 'speed_down':
-                    self.effects['speed_down'] = 12.0
-                    self.effect_display = {'text': get_translation('effect_speed_down'), 'time': 90, 'color': (0, 0, 255)}
-                    screen_top_center = (self.width // 2, 50)
-                    emit_particle_burst(30, screen_top_center, [((0, 0, 255), (150, 150, 255))])
-                elif prop == 'freeze':
-                    self.effects['freeze'] = 30.0
-                    self.effect_display = {'text': get_translation('effect_freeze'), 'time': 60, 'color': (0, 0, 255)}
-                    screen_top_center = (self.width // 2, 50)
-                    emit_particle_burst(30, screen_top_center, [((255, 255, 255), (200, 200, 200))])
-                elif prop == 'none':
-                    # 普通假食物，只加分，无特效
-                    pass
-                
-                # 除了炸弹外，所有假食物都加分
-                self.score += 1
-                
-                to_remove.append(i)
-        
-        # 先移除所有需要移除的其他食物
-        for i in sorted(to_remove, reverse=True):
-            self.fake_foods.pop(i)
-            self.fake_foods_colors.pop(i)
-            self.fake_foods_age.pop(i)
-            self.fake_foods_properties.pop(i)
-        
-        # 然后生成新的其他食物，保持食物数量稳定
-        for _ in range(len(to_remove)):
-            pos = self._place_other_food()
-            self.fake_foods.append(pos)
-            
-            properties = ['bomb', 'color_change', 'speed_up', 'speed_down', 'freeze', 'none']
-            weights = [0.01, 0.16, 0.16, 0.16, 0.16, 0.35]  
-            prop = random.choices(properties, weights=weights)[0]
-            
-            bomb_count = sum(1 for p in self.fake_foods_properties if p == 'bomb')
-            if prop == 'bomb' and bomb_count >= 6:
-                prop = random.choice(['color_change', 'speed_up', 'speed_down', 'freeze', 'none'])
-            elif prop == 'bomb':
-                bomb_count += 1
-            
-            # 所有食物都使用随机颜色
-            all_colors = [
-                ((255, 105, 180), (255, 200, 220)),  
-                ((135, 206, 250), (200, 230, 255)),  
-                ((255, 255, 0), (255, 255, 200)),    
-                ((255, 69, 0), (255, 150, 100)),     
-                ((144, 238, 144), (200, 255, 200)),  
-                ((255, 182, 193), (255, 200, 210)),  
-                ((176, 224, 230), (200, 235, 240)),  
-                ((221, 160, 221), (230, 180, 230)),  
-            ]
-            food_color = random.choice(all_colors)
-            self.fake_foods_colors.append(food_color)
-            self.fake_foods_age.append(0)
-            self.fake_foods_properties.append(prop)
-        
-        if len(self.fake_foods) < 4:
-            needed = 4 - len(self.fake_foods)
-            for _ in range(needed):
-                pos = self._place_other_food()
-                self.fake_foods.append(pos)
-                
-                properties = ['bomb', 'color_change', 'speed_up', 'speed_down', 'freeze', 'none']
-                weights = [0.01, 0.16, 0.16, 0.16, 0.16, 0.35]  
-                prop = random.choices(properties, weights=weights)[0]
-                
-                bomb_count = sum(1 for p in self.fake_foods_properties if p == 'bomb')
-                if prop == 'bomb' and bomb_count >= 6:
-                    prop = random.choice(['color_change', 'speed_up', 'speed_down', 'freeze', 'none'])
-                elif prop == 'bomb':
-                    bomb_count += 1
-                
-                # 所有食物都使用随机颜色
-                all_colors = [
-                    ((255, 105, 180), (255, 200, 220)),  
-                    ((135, 206, 250), (200, 230, 255)),  
-                    ((255, 255, 0), (255, 255, 200)),    
-                    ((255, 69, 0), (255, 150, 100)),     
-                    ((144, 238, 144), (200, 255, 200)),  
-                    ((255, 182, 193), (255, 200, 210)),  
-                    ((176, 224, 230), (200, 235, 240)),  
-                    ((221, 160, 221), (230, 180, 230)),  
-                ]
-                food_color = random.choice(all_colors)
-                self.fake_foods_colors.append(food_color)
-                self.fake_foods_age.append(0)
-                self.fake_foods_properties.append(prop)
-        
-        return False, other_food_eaten  # 未吃到炸弹，返回False表示游戏未结束，other_food_eaten表示是否吃到了可生长的食物
-
-    def _get_segment_color(self, segment_index, total_segments):
-        """
-        根据蛇的颜色类型（纯色或渐变名称）和蛇身段的位置计算颜色。
-        """
-        if isinstance(self.snake_color, (tuple, list)):
-            return tuple(self.snake_color)
-
-        grad_name = self.snake_color
-        
-        if grad_name == "彩虹":
-
-            rainbow_colors = [
-                (255,0,0), (255,127,0), (255,255,0), (0,255,0),
-                (0,0,255), (75,0,130), (143,0,255)
-            ]
-
-            color_index = (segment_index * len(rainbow_colors)) // total_segments
-            return rainbow_colors[color_index % len(rainbow_colors)]
-        
-
-        grad_data = self.gradient_colors_data.get(grad_name)
-        if grad_data and isinstance(grad_data, tuple) and len(grad_data) == 2:
-            start_color, end_color = grad_data
-
-            t = segment_index / max(1, total_segments - 1)
-            r = int(start_color[0] * (1 - t) + end_color[0] * t)
-            g = int(start_color[1] * (1 - t) + end_color[1] * t)
-            b = int(start_color[2] * (1 - t) + end_color[2] * t)
-            return (r, g, b)
-            
-        return (255, 182, 193) 
+        for event in self.engine.tick():
+            self._handle_engine_event(event)
+        
+        # 触发到期的闪烁切换和效果提示倒计时
+        self.timers.advance(pygame.time.get_ticks() / 1000.0)
+
+    def _toggle_food_blink(self):
+        self.food_visible = not self.food_visible
+
+    def _hide_effect_display(self, display):
+        # 期间换成了别的提示时不清除
+        if self.effect_display is display:
+            self.effect_display = None
+
+    def _handle_engine_event(self, event):
+        """根据引擎事件播放音效、发射粒子和设置效果提示"""
+        kind = event['type']
+        if kind == EVENT_EAT_FOOD:
+            emit_particle_burst(30, self._cell_center(event['pos']), [event['color']])
+            self._play_boom()
+            if event['double']:
+                self._show_effect('double_score')
+        elif kind == EVENT_EAT_FAKE_FOOD:
+            emit_particle_burst(20, self._cell_center(event['pos']), [event['color']])
+            prop = event['prop']
+            # 炸弹不播放吃到食物音效
+            if prop != 'bomb':
+                self._play_boom()
+            if prop in EFFECT_DISPLAYS:
+                self._show_effect(prop)
+        elif kind == EVENT_EFFECT_END:
+            # 一直显示到效果结束的提示（冻结）在这里清除
+            if self.effect_display and self.effect_display['effect'] == event['effect'] and self.effect_display_timer is None:
+                self.effect_display = None
+        elif kind == EVENT_GAME_OVER:
+            self.game_over_time = pygame.time.get_ticks()
+            ensure_data_dir_exists()
+            self.recorder.save(LAST_REPLAY_FILE)
+            # 播放游戏结束音效
+            if self.fail_sound:
+                try:
+                    self.fail_sound.play()
+                except Exception as e:
+                    print(f"播放游戏结束音效失败: {e}")
+
+    def _play_boom(self):
+        """播放吃到食物音效，确保每个帧只播放一次"""
+        if self.boom_sound and not self.sound_played_this_frame:
+            try:
+                self.boom_sound.play()
+                self.sound_played_this_frame = True  # 标记为已播放
+            except Exception as e:
+                print(f"播放吃到食物音效失败: {e}")
+
+    def _show_effect(self, name):
+        """显示效果提示，并在屏幕正上方添加粒子特效"""
+        text_key, seconds, color, particle_colors = EFFECT_DISPLAYS[name]
+        self.effect_display = {'text': get_translation(text_key), 'effect': name, 'color': color}
+        self.timers.cancel(self.effect_display_timer)
+        self.effect_display_timer = None
+        if seconds is not None:
+            self.effect_display_timer = self.timers.schedule(seconds, self._hide_effect_display, self.effect_display)
+        emit_particle_burst(30, (self.width // 2, 50), [particle_colors])
 
     def draw(self, screen):
-
+        engine = self.engine
         screen.fill((240, 240, 240)) 
         grid_color = (220, 220, 220) 
         for x in range(10, self.width-10, self.grid_size):
@@ -690,17 +289,14 @@ class ClassicSnakeGame:
 
         # 炫彩动态边框
         current_time = pygame.time.get_ticks()
-        # 使用正弦函数生成彩虹色，确保RGB值在0-255范围内
-        r = int((1 + math.sin(current_time * 0.001)) * 127.5)
-        g = int((1 + math.sin(current_time * 0.001 + 2 * math.pi / 3)) * 127.5)
-        b = int((1 + math.sin(current_time * 0.001 + 4 * math.pi / 3)) * 127.5)
-        border_color = (r, g, b)
+        # 循环彩虹色从调色板查表，周期约6.28秒
+        border_color = palette.over_time(CYCLE_RAINBOW, current_time, 2000 * math.pi)
         pygame.draw.rect(screen, border_color, (0, 0, self.width, self.height), 10)
 
 
         if not self.game_over:
             obstacle_color = (100, 100, 100)  
-            for obstacle_pos in self.obstacles:
+            for obstacle_pos in engine.obstacles:
                 obstacle_rect = pygame.Rect(
                     obstacle_pos[0]*self.grid_size + 10,
                     obstacle_pos[1]*self.grid_size + 10,
@@ -722,31 +318,33 @@ class ClassicSnakeGame:
         if not self.game_over:
 
             # 绘制主要食物
-            for i in range(len(self.foods)):
-                food_pos = (self.foods[i][0]*self.grid_size+self.grid_size//2+10, self.foods[i][1]*self.grid_size+self.grid_size//2+10)
+            for i in range(len(engine.foods)):
+                food_pos = (engine.foods[i][0]*self.grid_size+self.grid_size//2+10, engine.foods[i][1]*self.grid_size+self.grid_size//2+10)
                 
-                if self.is_double_score_foods[i]:
+                if engine.is_double_score_foods[i]:
                     # 分数翻倍食物保持原有金色外观
                     gold_color = (255, 215, 0)
                     pygame.draw.circle(screen, gold_color, food_pos, self.grid_size//2, width=3)
                     pygame.draw.circle(screen, gold_color, food_pos, self.grid_size//3)
                 else:
                     # 普通食物使用随机颜色
-                    pygame.draw.circle(screen, self.food_colors[i][0], food_pos, self.grid_size//3)
+                    pygame.draw.circle(screen, engine.food_colors[i][0], food_pos, self.grid_size//3)
             
             # 绘制其他食物
-            for i, other_food in enumerate(self.fake_foods):
-                other_color = self.fake_foods_colors[i][0]
+            for i, other_food in enumerate(engine.fake_foods):
+                other_color = engine.fake_foods_colors[i][0]
                 other_pos = (other_food[0]*self.grid_size+self.grid_size//2+10, other_food[1]*self.grid_size+self.grid_size//2+10)
                 pygame.draw.circle(screen, other_color, other_pos, self.grid_size//3)
             
-            total_segments = len(self.snake)
+            total_segments = len(engine.snake)
 
-            is_frozen = self.effects['freeze'] > 0
+            is_frozen = engine.is_frozen
             current_time_ms = pygame.time.get_ticks()
             
-            for i, seg in enumerate(self.snake):
-                snake_fill_color = self._get_segment_color(i, total_segments) 
+            # 沿蛇身的颜色一次性从调色板取出（纯色或渐变）
+            segment_colors = [tuple(color) for color in palette.along_body(self.snake_color, total_segments).tolist()]
+            for i, seg in enumerate(engine.snake):
+                snake_fill_color = segment_colors[i]
                 
 
                 border_rect = pygame.Rect(seg[0]*self.grid_size+10, seg[1]*self.grid_size+10, self.grid_size, self.grid_size)
@@ -826,8 +424,11 @@ class ClassicSnakeGame:
 
         score_txt = self.font_small.render(get_translation('game_score').format(self.score), True, self.BLACK)
         hs_txt = self.font_small.render(get_translation('game_high_score').format(self.high_score), True, self.BLACK)
-        max_length_txt = self.font_small.render(get_translation('game_max_length_record').format(self.max_length_record), True, self.BLACK)
+        max_length_txt = self.font_small.render(get_translation('game_max_length_record').format(engine.max_length_record), True, self.BLACK)
         screen.blit(score_txt, (15,15)); screen.blit(hs_txt, (15,55)); screen.blit(max_length_txt, (15,95))
+        if engine.pilot is not None:
+            pilot_txt = self.font_small.render(get_translation('classic_autopilot'), True, self.BLACK)
+            screen.blit(pilot_txt, pilot_txt.get_rect(topright=(self.width-15, 15)))
         
 
         if self.effect_display:
@@ -837,7 +438,7 @@ class ClassicSnakeGame:
             txt_rect = effect_txt.get_rect(center=(self.width//2, 80))
             
 
-            if get_translation('effect_freeze') in self.effect_display['text']:
+            if self.effect_display['effect'] == 'freeze':
 
                 bg_rect = pygame.Rect(txt_rect.x - 30, txt_rect.y - 20, txt_rect.width + 60, txt_rect.height + 40)
                 pygame.draw.rect(screen, (0, 0, 0, 180), bg_rect, border_radius=15)
@@ -861,10 +462,8 @@ class ClassicSnakeGame:
             overlay = pygame.Surface((self.width,self.height), pygame.SRCALPHA); overlay.fill((255,255,255,180)); screen.blit(overlay,(0,0))
             
 
-            if self.game_over_reason == 'bomb':
-                over_txt=self.font_large.render(get_translation('classic_bomb_death'),True,self.BLACK)
-            elif self.game_over_reason:
-                over_txt=self.font_large.render(self.game_over_reason,True,self.BLACK)
+            if engine.game_over_reason in GAME_OVER_TEXT_KEYS:
+                over_txt=self.font_large.render(get_translation(GAME_OVER_TEXT_KEYS[engine.game_over_reason]),True,self.BLACK)
             else:
                 over_txt=self.font_large.render(get_translation('game_game_over'),True,self.BLACK)
                 
@@ -876,7 +475,7 @@ class ClassicSnakeGame:
             screen.blit(score_txt, score_txt.get_rect(center=(self.width/2,self.height/2-60)))
             
             # 显示此次游戏的身长
-            length_txt=self.font_small.render(get_translation('game_body_length').format(self.current_game_max_length),True,self.BLACK)
+            length_txt=self.font_small.render(get_translation('game_body_length').format(engine.current_game_max_length),True,self.BLACK)
             screen.blit(length_txt, length_txt.get_rect(center=(self.width/2,self.height/2-20)))
             
 
@@ -935,7 +534,8 @@ class ClassicSnakeGame:
 
     def _get_eye_pos(self, rect):
         ox,oy=self.grid_size//4,self.grid_size//4
-        if self.direction==(1,0): return [(rect.centerx+ox,rect.centery-oy),(rect.centerx+ox,rect.centery+oy)]
-        elif self.direction==(-1,0): return [(rect.centerx-ox,rect.centery-oy),(rect.centerx-ox,rect.centery+oy)]
-        elif self.direction==(0,1): return [(rect.centerx-ox,rect.centery+oy),(rect.centerx+ox,rect.centery+oy)]
+        direction = self.engine.direction
+        if direction==(1,0): return [(rect.centerx+ox,rect.centery-oy),(rect.centerx+ox,rect.centery+oy)]
+        elif direction==(-1,0): return [(rect.centerx-ox,rect.centery-oy),(rect.centerx-ox,rect.centery+oy)]
+        elif direction==(0,1): return [(rect.centerx-ox,rect.centery+oy),(rect.centerx+ox,rect.centery+oy)]
         else: return [(rect.centerx-ox,rect.centery-oy),(rect.centerx+ox,rect.centery-oy)]
\ No newline at end of file
@@ -0,0 +1,211 @@
+import gzip
+import hashlib
+import json
+import time
+
+from game.modes.classic.classic_engine import ClassicEngine, DIRECTIONS
+
+
+REPLAY_VERSION = 4
+HASH_INTERVAL = 60  # 每隔多少步记录一次状态哈希
+
+
+def encode_direction(direction):
+    """方向编码成DIRECTIONS里的下标，None编码为-1"""
+    return -1 if direction is None else DIRECTIONS.index(tuple(direction))
+
+
+def decode_direction(code):
+    return None if code < 0 else DIRECTIONS[code]
+
+
+def state_hash(engine):
+    """对影响后续对局的引擎状态取哈希，回放时逐段比对"""
+    color = engine.snake_color
+    state = (
+        tuple(engine.snake), engine.direction, engine.score, engine.game_over, engine.game_over_reason,
+        tuple(engine.foods), tuple(engine.is_double_score_foods),
+        tuple(engine.fake_foods), tuple(engine.fake_foods_properties), tuple(engine.obstacles),
+        tuple(sorted(engine.effects.items())), engine.time, engine.move_accumulator,
+        tuple(color) if isinstance(color, list) else color,
+    )
+    return hashlib.blake2b(repr(state).encode('utf-8'), digest_size=8).hexdigest()
+
+
+class ReplayRecorder:
+    """经典模式的对局录像
+
+    挂在ClassicEngine.recorder上，记录重现一局所需的全部输入：
+    随机种子和初始设置、每次press的方向、每次有效step的dt、自动驾驶的开关以及它给出的方向。
+    dt取整到毫秒后按连续相同的值做游程压缩，引擎按取整后的dt推进，所以回放与录制时完全一致；
+    固定帧率下dt只在相邻的两三个毫秒值之间交替，保存时的gzip能把这种重复压得很小。press和自动驾驶开关用它发生在第几次step之前来标记时间；
+    每隔HASH_INTERVAL步和对局结束时记录一次状态哈希，回放时用来发现分歧。
+    """
+
+    def __init__(self):
+        self.recording = None
+
+    def start(self, engine):
+        """引擎用固定种子开始新的一局后调用"""
+        self.recording = {
+            'version': REPLAY_VERSION,
+            'seed': engine.seed,
+            'grid_width': engine.grid_width,
+            'grid_height': engine.grid_height,
+            'snake_color': engine.snake_color,
+            'pilot_enabled': engine.pilot is not None,  # 开局时是否开着自动驾驶
+            'steps': [],     # [[dt毫秒数, 连续次数], ...]
+            'presses': [],   # [[step序号, 方向编码], ...]
+            'pilot_toggles': [],  # [[step序号, 1开/0关], ...]
+            'pilot': [],     # 自动驾驶依次给出的方向编码
+            'hashes': [],    # [[已执行的step数, 哈希], ...]
+        }
+        self.step_count = 0
+
+    def on_press(self, direction):
+        if self.recording is not None:
+            self.recording['presses'].append([self.step_count, encode_direction(direction)])
+
+    def on_pilot_toggle(self, enabled):
+        if self.recording is not None:
+            self.recording['pilot_toggles'].append([self.step_count, 1 if enabled else 0])
+
+    def on_pilot(self, direction):
+        if self.recording is not None:
+            self.recording['pilot'].append(encode_direction(direction))
+
+    def on_step(self, dt):
+        """记录一次step，返回取整到毫秒后引擎实际使用的dt"""
+        if self.recording is None:
+            return dt
+        dt_ms = round(dt * 1000)
+        steps = self.recording['steps']
+        if steps and steps[-1][0] == dt_ms:
+            steps[-1][1] += 1
+        else:
+            steps.append([dt_ms, 1])
+        self.step_count += 1
+        return dt_ms / 1000
+
+    def on_step_end(self, engine):
+        if self.recording is not None and (self.step_count % HASH_INTERVAL == 0 or engine.game_over):
+            self.recording['hashes'].append([self.step_count, state_hash(engine)])
+
+    def save(self, path):
+        """保存为gzip压缩的JSON，成功返回True"""
+        if self.recording is None:
+            return False
+        try:
+            with gzip.open(path, 'wt', encoding='utf-8') as f:
+                json.dump(self.recording, f, separators=(',', ':'))
+            return True
+        except Exception as e:
+            print(f"保存录像失败: {e}")
+            return False
+
+
+def load_replay(path):
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        return json.load(f)
+
+
+class _ReplayPilot:
+    """按录像顺序给出自动驾驶当时的方向"""
+
+    def __init__(self, codes):
+        self.codes = iter(codes)
+
+    def reset(self):
+        pass
+
+    def next_direction(self):
+        return decode_direction(next(self.codes, -1))
+
+
+class ReplayPlayer:
+    """重新模拟录像中的一局
+
+    用录像里的种子和设置新建引擎，按原来的顺序重放press和每次step的dt，并在记录过哈希的位置比对状态。
+    realtime为True时按原来的节奏（可用speed加速）运行，否则全速运行；
+    on_step回调每步收到(engine, events)，可用于画面回放，不传时完全脱离窗口运行。
+    """
+
+    def __init__(self, recording):
+        self.recording = recording
+
+    def play(self, realtime=False, speed=1.0, on_step=None):
+        """
+        返回:
+            结果字典：'steps'、'checked'、'mismatches'([(step数, 录像哈希, 回放哈希)])、'final_hash'、'score'、
+            'elapsed'（秒）和'steps_per_second'
+        """
+        recording = self.recording
+        if recording.get('version') != REPLAY_VERSION:
+            print(f"录像版本{recording.get('version')}与当前版本{REPLAY_VERSION}不同，规则可能已经变化")
+        color = recording['snake_color']
+        engine = ClassicEngine(recording['grid_width'], recording['grid_height'],
+                               snake_color=tuple(color) if isinstance(color, list) else color,
+                               seed=recording['seed'])
+        # 自动驾驶的方向按录下的顺序给出，开关按录下的步数切换
+        replay_pilot = _ReplayPilot(recording['pilot'])
+        if recording.get('pilot_enabled', bool(recording['pilot'])):
+            engine.pilot = replay_pilot
+        toggles = recording.get('pilot_toggles', [])
+        toggle_index = 0
+
+        presses = recording['presses']
+        expected = {count: digest for count, digest in recording['hashes']}
+        mismatches = []
+        press_index = 0
+        step_count = 0
+        sim_elapsed = 0.0
+        start = time.perf_counter()
+
+        for dt_ms, repeat in recording['steps']:
+            dt = dt_ms / 1000
+            for _ in range(repeat):
+                while toggle_index < len(toggles) and toggles[toggle_index][0] == step_count:
+                    engine.pilot = replay_pilot if toggles[toggle_index][1] else None
+                    toggle_index += 1
+                while press_index < len(presses) and presses[press_index][0] == step_count:
+                    engine.press(decode_direction(presses[press_index][1]))
+                    press_index += 1
+                events = engine.step(None, dt)
+                step_count += 1
+
+                digest = expected.get(step_count)
+                if digest is not None:
+                    actual = state_hash(engine)
+                    if actual != digest:
+                        mismatches.append((step_count, digest, actual))
+                if on_step is not None:
+                    on_step(engine, events)
+                if realtime:
+                    sim_elapsed += dt
+                    delay = start + sim_elapsed / speed - time.perf_counter()
+                    if delay > 0:
+                        time.sleep(delay)
+
+        elapsed = time.perf_counter() - start
+        return {
+            'steps': step_count,
+            'checked': len(expected),
+            'mismatches': mismatches,
+            'final_hash': state_hash(engine),
+            'score': engine.score,
+            'elapsed': elapsed,
+            'steps_per_second': step_count / elapsed if elapsed > 0 else 0.0,
+        }
+
+
+if __name__ == '__main__':
+    import sys
+
+    if len(sys.argv) < 2:
+        print("用法: python -m game.modes.classic.replay <录像文件> [--realtime]")
+        sys.exit(1)
+    result = ReplayPlayer(load_replay(sys.argv[1])).play(realtime='--realtime' in sys.argv)
+    status = "一致" if not result['mismatches'] else f"{len(result['mismatches'])}处不一致，第一处在第{result['mismatches'][0][0]}步"
+    print(f"回放{result['steps']}步，得分{result['score']}，比对{result['checked']}个哈希：{status}，"
+          f"{result['steps_per_second']:,.0f} 步/秒")
+    sys.exit(1 if result['mismatches'] else 0)
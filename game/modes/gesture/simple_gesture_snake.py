@@ -1,5 +1,4 @@
 import math
-import random
 import cvzone
 import cv2
 import numpy as np
@@ -10,12 +9,19 @@ from PIL import Image, ImageDraw, ImageFont
 
 from game.utils.improved_chinese_text import put_chinese_text_pil
 from game.utils.language_manager import get_translation
+from game.core.trail_buffer import TrailBuffer
+from game.core.snake_renderer import SnakeRenderer
+from game.core.sprite import Sprite
+from game.core.spatial_hash import SpatialHash, TrailCollider
+from game.core.placement import PlacementSampler, PlacementError
+from game.core.coordinate_space import CoordinateSpace, LOGICAL_WIDTH, LOGICAL_HEIGHT
+from game.core.fixed_timestep import FixedTimestep, SampleTimeline
+from game.core.game_over_overlay import GameOverOverlay, measure_text
+from game.core.latency_monitor import STAGE_SMOOTHED
 
 class SnakeGame:
     def __init__(self, food_path, high_score=0):             # 构造方法
-        self.points = []            
-        self.lengths = []           
-        self.currentLength = 0      
+        self.trail = TrailBuffer(spacing=8, simplify_tolerance=1.0)  # 蛇身轨迹点及总长度，按8像素间距重采样
         self.base_allowed_length = 150    
         self.allowedLength = self.base_allowed_length    
         self.previousHead = None    # 初始化为None，根据实际屏幕尺寸设置
@@ -31,14 +37,8 @@ class SnakeGame:
         self.fail_sound = None
         self.sound_played_this_frame = False  # 标志位，确保每个帧只播放一次音效
         
-        self.gradient_colors_data = {
-            "彩虹": [((255,0,0),(255,165,0)), ((255,165,0),(255,255,0)), ((255,255,0),(0,128,0)), ((0,128,0),(0,0,255)), ((0,0,255),(75,0,130)), ((75,0,130),(238,130,238))],
-            "蓝绿渐变": ((0, 0, 255), (0, 255, 0)), 
-            "火热渐变": ((255, 0, 0), (255, 255, 0)), 
-            "宇宙渐变": ((128, 0, 128), (0, 0, 128))  
-        }
-        
         self.gradient_frame = 0  
+        self.renderer = SnakeRenderer()
 
         self.imgFood = cv2.imread(food_path, cv2.IMREAD_UNCHANGED)
         if self.imgFood is None:
@@ -60,89 +60,112 @@ class SnakeGame:
         self.wObstacle = int(self.imgObstacle.shape[1] * scale_factor)
         self.hObstacle = int(self.imgObstacle.shape[0] * scale_factor)
         self.imgObstacle = cv2.resize(self.imgObstacle, (self.wObstacle, self.hObstacle))
+
+        # 逻辑坐标与渲染分辨率之间的换算，由GameController通过set_coordinate_space设置
+        self.space = CoordinateSpace((LOGICAL_WIDTH, LOGICAL_HEIGHT))
+        self._build_sprites()
         
         self.obstacles = []  
+        self.foodPoint = None
+        # 游戏区域使用固定的逻辑尺寸
+        self.play_width, self.play_height = self.space.logical_size
+        self.placement = PlacementSampler(self.play_width, self.play_height)
+        self.obstacle_index = SpatialHash(cell_size=128)  # 障碍物的空间索引，障碍物刷新时重建
+        self.self_collision = False  # 是否检测蛇头碰到自身（默认关闭）
+        self.trail_collider = TrailCollider()
         self.num_obstacles = 5  
         self.last_obstacle_refresh = 0  
-        self.obstacle_refresh_interval = 10  
+        self.obstacle_refresh_interval = 10  # 障碍物刷新间隔（模拟时间，秒）
+        # 固定步长模拟：指尖采样时间线、模拟时钟和上一个模拟步的蛇头（用于渲染插值）
+        self.timestep = FixedTimestep()
+        self.timeline = SampleTimeline()
+        self.sim_elapsed = 0.0
+        self.last_sim_head = None
         self.randomObstacleLocations()
         
-        self.foodPoint = 0, 0
         self.randomFoodLocation()
 
         self.score = 0
         self.high_score = high_score  
         self.gameOver = False
         self.return_to_menu = False
+        self.game_over_overlay = GameOverOverlay()
+
+    def _build_sprites(self):
+        """按当前渲染比例生成食物和障碍物精灵，加载时预先计算好预乘alpha，每帧直接混合"""
+        scale = self.space.render_scale
+        food, obstacle = self.imgFood, self.imgObstacle
+        if scale != 1.0:
+            food = cv2.resize(food, (self.space.render_length(self.wFood), self.space.render_length(self.hFood)), interpolation=cv2.INTER_AREA)
+            obstacle = cv2.resize(obstacle, (self.space.render_length(self.wObstacle), self.space.render_length(self.hObstacle)), interpolation=cv2.INTER_AREA)
+        self.food_sprite = Sprite(food)
+        self.obstacle_sprite = Sprite(obstacle)
+
+    def set_coordinate_space(self, space):
+        """设置坐标空间；渲染比例变化时重新生成精灵"""
+        scale_changed = space.render_scale != self.space.render_scale
+        self.space = space
+        if scale_changed:
+            self._build_sprites()
+        self.set_play_area(*space.logical_size)
+
+    def set_play_area(self, width, height):
+        """设置实际的游戏区域尺寸，尺寸变化时按新尺寸重新放置障碍物和食物"""
+        if (width, height) == (self.play_width, self.play_height):
+            return
+        self.play_width, self.play_height = width, height
+        self.placement.resize(width, height)
+        self.randomObstacleLocations()
+        self.randomFoodLocation()
 
     def randomFoodLocation(self):
         """随机生成食物位置，确保不会刷新到障碍物上"""
-        screen_width, screen_height = 1280, 720  # 假设屏幕尺寸
-        
-        while True:
-            # 生成随机位置
-            x = random.randint(100, screen_width - 100)
-            y = random.randint(100, screen_height - 100)
-            food_pos = (x, y)
-            
-            # 检查是否与任何障碍物重叠
-            overlap_with_obstacle = False
-            for obstacle_pos in self.obstacles:
-                obstacle_center_x, obstacle_center_y = obstacle_pos
-                # 计算食物与障碍物中心的距离
-                distance = math.hypot(x - obstacle_center_x, y - obstacle_center_y)
-                # 确保食物与障碍物的距离大于两者半径之和
-                min_distance = (self.wFood // 2) + (self.wObstacle // 2) + 20  # 20像素的安全距离
-                if distance < min_distance:
-                    overlap_with_obstacle = True
-                    break
-            
-            if not overlap_with_obstacle:
-                self.foodPoint = food_pos
-                break
+        # 食物与障碍物中心的距离要大于两者半径之和，再留20像素的安全距离
+        min_distance = (self.wFood // 2) + (self.wObstacle // 2) + 20
+        self.placement.begin(margin=100)
+        for obstacle_center_x, obstacle_center_y in self.obstacles:
+            self.placement.block_circle(obstacle_center_x, obstacle_center_y, min_distance)
+        try:
+            self.foodPoint = self.placement.sample()
+        except PlacementError:
+            # 障碍物占满了可放置区域：清空障碍物后再放置一次，仍然失败则向上抛出
+            print("没有空间放置食物，清除障碍物后重试")
+            self.obstacles = []
+            self.obstacle_index.build(self.obstacles)
+            self.foodPoint = self.placement.begin(margin=100).sample()
     
     def randomObstacleLocations(self):
         """随机生成障碍物位置，确保在屏幕边缘，远离中心区域和食物"""
         self.obstacles = []
-        screen_width, screen_height = 1280, 720  
+        screen_width, screen_height = self.play_width, self.play_height
         center_x, center_y = screen_width // 2, screen_height // 2
         center_radius = 300  
         
+        self.placement.begin(margin=50)
+        self.placement.block_circle(center_x, center_y, center_radius)
+        # 避开当前食物
+        if self.foodPoint is not None:
+            food_x, food_y = self.foodPoint
+            self.placement.block_circle(food_x, food_y, (self.wObstacle // 2) + (self.wFood // 2) + 20)
+        
         for _ in range(self.num_obstacles):
+            try:
+                obstacle_pos = self.placement.sample()
+            except PlacementError:
+                print(f"场地已满，只放置了{len(self.obstacles)}个障碍物")
+                break
+            # 障碍物之间至少相距100像素
+            self.placement.block_circle(obstacle_pos[0], obstacle_pos[1], 100)
+            self.obstacles.append(obstacle_pos)
 
-            while True:
-
-                x = random.randint(50, screen_width - 50)
-                y = random.randint(50, screen_height - 50)
-                obstacle_pos = (x, y)
-                
+        self.obstacle_index.build(self.obstacles)
 
-                distance_to_center = math.hypot(x - center_x, y - center_y)
-                if distance_to_center > center_radius:
-
-                    overlap = False
-                    for existing_pos in self.obstacles:
-                        if math.hypot(x - existing_pos[0], y - existing_pos[1]) < 100:  
-                            overlap = True
-                            break
-                    
-                    # 检查是否与食物重叠
-                    if hasattr(self, 'foodPos') and self.foodPos is not None:
-                        food_x, food_y = self.foodPos
-                        distance_to_food = math.hypot(x - food_x, y - food_y)
-                        min_distance = (self.wObstacle // 2) + (self.wFood // 2) + 20
-                        if distance_to_food < min_distance:
-                            overlap = True
-                    
-                    if not overlap:
-                        break
-            
-            self.obstacles.append(obstacle_pos)
+    def hit_obstacle(self, cx, cy, radius):
+        """判断半径为radius的蛇头是否碰到障碍物"""
+        return len(self.obstacle_index.query_points(cx, cy, radius + self.wObstacle // 2)) > 0
 
     def reset(self):
-        self.points = []
-        self.lengths = []
-        self.currentLength = 0
+        self.trail.clear()
         self.allowedLength = self.base_allowed_length
         # 初始化为None，在update方法中根据实际屏幕尺寸设置
         self.previousHead = None  # 屏幕中心
@@ -155,157 +178,257 @@ class SnakeGame:
         self.randomFoodLocation()
         self.randomObstacleLocations()  
         self.last_obstacle_refresh = 0  
+        self.timestep.reset()
+        self.timeline.clear()
+        self.sim_elapsed = 0.0
+        self.last_sim_head = None
 
         self.last_detected_head = None
 
-    def update(self, imgMain, currentHead, mouse_pos=None, mouse_clicked=False, high_score=0):
-        # 重置音效播放标志位，确保每个帧只播放一次音效
-        self.sound_played_this_frame = False
+    def simulate_step(self, target):
+        """
+        执行一个固定步长的模拟：平滑蛇头、推进蛇身、吃食物、刷新障碍物和碰撞检测
+
+        参数:
+            target: 该模拟时刻的指尖逻辑坐标，未检测到手时为None
+        """
+        self.sim_elapsed += self.timestep.step
+        screen_width, screen_height = self.play_width, self.play_height
+        self.last_sim_head = self.smooth_head
+
+        if target is not None:
+            self.last_detected_head = target
+            raw_cx, raw_cy = target
+
+            if self.smooth_head is None:
+                self.smooth_head = (raw_cx, raw_cy)
+
+            smooth_cx = self.smooth_head[0] * (1 - self.smooth_factor) + raw_cx * self.smooth_factor
+            smooth_cy = self.smooth_head[1] * (1 - self.smooth_factor) + raw_cy * self.smooth_factor
+
+            dx = smooth_cx - self.smooth_head[0]
+            dy = smooth_cy - self.smooth_head[1]
+            speed = math.hypot(dx, dy)
+            if speed > self.max_speed:
+                ratio = self.max_speed / speed
+                smooth_cx = self.smooth_head[0] + dx * ratio
+                smooth_cy = self.smooth_head[1] + dy * ratio
+
+            self.smooth_head = (smooth_cx, smooth_cy)
+        elif self.smooth_head is None:
+            # 没有手时停在最后检测到的位置，从未检测到手时停在屏幕中心
+            if self.last_detected_head is not None:
+                self.smooth_head = self.last_detected_head
+            else:
+                self.smooth_head = (screen_width // 2, screen_height // 2)
 
-        if high_score > self.high_score:
-            self.high_score = high_score
-        
-        if self.gameOver:
+        if self.last_sim_head is None:
+            self.last_sim_head = self.smooth_head
 
-            try:
-                from game.utils.improved_chinese_text import put_rainbow_text_pil, put_chinese_text_pil, put_chinese_text_with_background
-                
+        try:
+            cx, cy = int(self.smooth_head[0]), int(self.smooth_head[1])
+        except (ValueError, TypeError):
+            cx, cy = 0, 0
+            print("警告：smooth_cx或smooth_cy不是有效的数字，使用默认值(0, 0)")
 
-                screen_height, screen_width, _ = imgMain.shape
-                center_x = screen_width // 2
-                center_y = screen_height // 2
-                
+        self.trail.push(cx, cy)
+        self.previousHead = (cx, cy)
 
+        # 从尾部收缩到允许长度
+        self.trail.trim_to(self.allowedLength)
 
-                # 游戏结束文本 - 动态计算位置，实现居中
-                if self.game_over_reason:
-                    game_over_text = self.game_over_reason
-                else:
-                    game_over_text = get_translation('game_end')
-                game_over_font_size = 80
-                
-                # 动态计算游戏结束文本位置
-                game_over_size = put_chinese_text_pil(imgMain, game_over_text, (0, 0), game_over_font_size, (255, 0, 0))[1]
-                game_over_width = game_over_size[0]
-                game_over_height = game_over_size[1]
-                game_over_x = center_x - game_over_width // 2
-                game_over_y = center_y - 200
-                imgMain, _ = put_chinese_text_pil(imgMain, game_over_text, (game_over_x, game_over_y), game_over_font_size, (255, 0, 0))
-                
-                # 分数文本 - 动态计算位置，实现居中
-                score_text = get_translation('game_final_score').format(self.score)
-                score_font_size = 60
-                score_size = put_chinese_text_pil(imgMain, score_text, (0, 0), score_font_size, (50, 130, 246))[1]
-                score_width = score_size[0]
-                score_height = score_size[1]
-                score_x = center_x - score_width // 2
-                score_y = center_y - 100
-                imgMain, _ = put_chinese_text_pil(imgMain, score_text, (score_x, score_y), score_font_size, (50, 130, 246))
-                
-                # 最高分文本 - 动态计算位置，实现居中
-                high_score_text = get_translation('game_high_score').format(self.high_score)
-                high_score_font_size = 40
-                high_score_size = put_chinese_text_pil(imgMain, high_score_text, (0, 0), high_score_font_size, (50, 130, 246))[1]
-                high_score_width = high_score_size[0]
-                high_score_height = high_score_size[1]
-                high_score_x = center_x - high_score_width // 2
-                high_score_y = center_y - 30
-                imgMain, _ = put_chinese_text_pil(imgMain, high_score_text, (high_score_x, high_score_y), high_score_font_size, (50, 130, 246))
-                
+        rx, ry = self.foodPoint
+        if rx - self.wFood // 2 < cx < rx + self.wFood // 2 and \
+                ry - self.hFood // 2 < cy < ry + self.hFood // 2:
+            self.randomFoodLocation()
+            self.allowedLength += 50
+            self.score += 1
 
-                # 计算按钮宽度，确保能容纳中文文本
-                button_height = 80
-                button_padding = 60  # 增加按钮内边距，确保文本有足够空间
-                button_spacing = 30  
-                button_y = center_y + 50  # 向下调整按钮位置，确保居中显示
-                button_font_size = 36
-                
-                # 获取文本
-                restart_text = get_translation('game_restart')
-                menu_text = get_translation('game_return_menu')
-                
-                # 使用与绘制相同的字体来测量文本宽度
-                from PIL import Image, ImageDraw, ImageFont
-                from game.utils.improved_chinese_text import _get_font
-                temp_img = Image.new('RGB', (1, 1))
-                temp_draw = ImageDraw.Draw(temp_img)
-                
-                # 使用实际绘制时使用的字体
-                font = _get_font(button_font_size)
-                
-                # 测量文本宽度
+            if self.score > self.high_score:
+                self.high_score = self.score
+            print(f"得分: {self.score}, 最高分: {self.high_score}")
+
+            # 播放吃到食物音效，确保每个帧只播放一次
+            if self.boom_sound and not self.sound_played_this_frame:
                 try:
-                    restart_bbox = temp_draw.textbbox((0, 0), restart_text, font=font)
-                    restart_text_width = restart_bbox[2] - restart_bbox[0]
-                    menu_bbox = temp_draw.textbbox((0, 0), menu_text, font=font)
-                    menu_text_width = menu_bbox[2] - menu_bbox[0]
-                except AttributeError:
-                    restart_text_width, _ = temp_draw.textsize(restart_text, font=font)
-                    menu_text_width, _ = temp_draw.textsize(menu_text, font=font)
-                
-                # 计算按钮宽度，取文本宽度加内边距的最大值
-                button_width = max(restart_text_width + button_padding, menu_text_width + button_padding, 220)  # 增加最小宽度
-                
-                total_buttons_width = button_width * 2 + button_spacing
-                start_x = (screen_width - total_buttons_width) // 2
-                
-                restart_button_x = start_x
-                restart_button_rect = (restart_button_x, button_y, button_width, button_height)
-                
-                menu_button_x = start_x + button_width + button_spacing
-                menu_button_rect = (menu_button_x, button_y, button_width, button_height)
-                
+                    self.boom_sound.play()
+                    self.sound_played_this_frame = True  # 标记为已播放
+                except Exception as e:
+                    print(f"播放吃到食物音效失败: {e}")
+
+        # 障碍物按模拟时间刷新
+        if self.sim_elapsed - self.last_obstacle_refresh >= self.obstacle_refresh_interval:
+            self.randomObstacleLocations()
+            self.last_obstacle_refresh = self.sim_elapsed
+            print("障碍物已刷新")
+
+        snake_radius = 20
+
+        # 初始位置特殊处理：如果是游戏开始后的第一个位置，跳过碰撞检测
+        # 只有当蛇有足够长度且不是初始位置时才进行碰撞检测
+        # 游戏刚启动时，蛇身点数会很快增加到2，所以需要额外的初始位置保护
+        is_initial_position = (len(self.trail) == 2 and self.trail.total_length <= self.base_allowed_length + 10)
+        if len(self.trail) > 2 and not is_initial_position and screen_width > 0 and screen_height > 0:
+            # 检查cx和cy是否有效（不为默认的0,0），防止未检测到手部时触发边缘检测
+            if (cx != 0 or cy != 0):
+                if (cx - snake_radius < 0 or
+                    cx + snake_radius > screen_width or
+                    cy - snake_radius < 0 or
+                    cy + snake_radius > screen_height):
+                    print("碰到屏幕边缘，游戏结束")
+                    self._end_game('classic_edge_death')
+
+            if not self.gameOver and self.hit_obstacle(cx, cy, snake_radius):
+                print("碰到障碍物，游戏结束")
+                self._end_game('classic_obstacle_death')
+
+            # 自身碰撞：只检查蛇头附近格子里的线段
+            if not self.gameOver and self.self_collision and self.trail_collider.hits(self.trail.points(), self.trail.lengths(), snake_radius):
+                print("碰到自己，游戏结束")
+                self._end_game('classic_self_death')
+
+    def _end_game(self, reason_key):
+        self.game_over_reason = get_translation(reason_key)
+        self.gameOver = True
+        # 播放游戏结束音效
+        if self.fail_sound:
+            try:
+                self.fail_sound.play()
+            except Exception as e:
+                print(f"播放游戏结束音效失败: {e}")
+
+    def render_head(self):
+        """渲染用的蛇头位置：在上一个和当前模拟状态之间按alpha插值"""
+        if self.smooth_head is None:
+            return None
+        if self.last_sim_head is None:
+            return self.smooth_head
+        alpha = self.timestep.alpha
+        (x0, y0), (x1, y1) = self.last_sim_head, self.smooth_head
+        return x0 + (x1 - x0) * alpha, y0 + (y1 - y0) * alpha
+
+    def draw_playing(self, imgMain):
+        """绘制游戏进行中的画面，只读取模拟状态，不修改游戏逻辑"""
+        px = self.space.render_length
+
+        if self.last_detected_head is None:
+            try:
+                imgMain, _ = put_chinese_text_pil(imgMain, get_translation('gesture_no_hand'), self.space.logical_to_render(self.play_width // 2 - 150, 50), px(40), (255, 255, 0))
+            except Exception as e:
+                print(f"中文显示错误: {e}")
 
-                if mouse_clicked and mouse_pos:
+        # 渐变动画按模拟步数推进，与渲染帧率无关
+        self.gradient_frame = self.timestep.steps
 
-                    if restart_button_rect[0] <= mouse_pos[0] <= restart_button_rect[0] + restart_button_rect[2] and restart_button_rect[1] <= mouse_pos[1] <= restart_button_rect[1] + restart_button_rect[3]:
-                        self.reset()
+        if len(self.trail):
+            points = self.space.logical_to_render_array(self.trail.points())
+            head = self.render_head()
+            if head is not None:
+                points[-1] = self.space.logical_to_render(*head)
+            self.renderer.set_color(self.snake_color)
+            self.renderer.draw(imgMain, points, self.gradient_frame, self.space.render_scale)
 
-                        self.gameOver = False
+        rx, ry = self.foodPoint
+        self.food_sprite.draw_centered(imgMain, *self.space.logical_to_render(rx, ry))
 
-                    elif menu_button_rect[0] <= mouse_pos[0] <= menu_button_rect[0] + menu_button_rect[2] and menu_button_rect[1] <= mouse_pos[1] <= menu_button_rect[1] + menu_button_rect[3]:
-                        self.return_to_menu = True
-                
+        self.obstacle_sprite.draw_many(imgMain, [self.space.logical_to_render(ox, oy) for ox, oy in self.obstacles])
 
-                cv2.rectangle(imgMain, (restart_button_rect[0], restart_button_rect[1]), (restart_button_rect[0] + restart_button_rect[2], restart_button_rect[1] + restart_button_rect[3]), (0, 150, 0), cv2.FILLED)
-                cv2.rectangle(imgMain, (restart_button_rect[0], restart_button_rect[1]), (restart_button_rect[0] + restart_button_rect[2], restart_button_rect[1] + restart_button_rect[3]), (255, 255, 255), 3)
-                
+        try:
+            imgMain, _ = put_chinese_text_pil(imgMain, get_translation('game_score').format(self.score), (px(50), px(80)), px(40), (50, 130, 246))
+            imgMain, _ = put_chinese_text_pil(imgMain, get_translation('game_high_score').format(self.high_score), (px(50), px(130)), px(30), (50, 130, 246))
+        except Exception as e:
+            print(f"绘制中文得分错误: {e}")
 
-                # 绘制重启按钮文本
-                button_text = get_translation('game_restart')
-                # 先测量文本尺寸
-                temp_img = Image.new('RGB', (1, 1))
-                temp_draw = ImageDraw.Draw(temp_img)
-                font = _get_font(button_font_size)
-                try:
-                    restart_bbox = temp_draw.textbbox((0, 0), button_text, font=font)
-                    restart_text_width = restart_bbox[2] - restart_bbox[0]
-                    restart_text_height = restart_bbox[3] - restart_bbox[1]
-                except AttributeError:
-                    restart_text_width, restart_text_height = temp_draw.textsize(button_text, font=font)
-                # 计算文本位置，确保完全居中
-                restart_text_x = restart_button_x + (button_width - restart_text_width) // 2
-                restart_text_y = button_y + 25  # 使用固定偏移量，根据按钮高度80px，25px的偏移量应该能让文字居中
-                imgMain, _ = put_chinese_text_pil(imgMain, button_text, (restart_text_x, restart_text_y), button_font_size, (255, 255, 255))
-                
+            cv2.rectangle(imgMain, (30, 60), (200, 100), (0, 0, 0), cv2.FILLED)
 
-                cv2.rectangle(imgMain, (menu_button_rect[0], menu_button_rect[1]), (menu_button_rect[0] + menu_button_rect[2], menu_button_rect[1] + menu_button_rect[3]), (50, 100, 200), cv2.FILLED)
-                cv2.rectangle(imgMain, (menu_button_rect[0], menu_button_rect[1]), (menu_button_rect[0] + menu_button_rect[2], menu_button_rect[1] + menu_button_rect[3]), (255, 255, 255), 3)
-                
+            cv2.putText(imgMain, f'Score: {self.score}', (40, 90), cv2.FONT_HERSHEY_SIMPLEX, 1.5, (50, 130, 246), 2)
 
-                # 绘制返回菜单按钮文本
-                menu_button_text = get_translation('game_return_menu')
-                # 先测量文本尺寸
-                try:
-                    menu_bbox = temp_draw.textbbox((0, 0), menu_button_text, font=font)
-                    menu_text_width = menu_bbox[2] - menu_bbox[0]
-                    menu_text_height = menu_bbox[3] - menu_bbox[1]
-                except AttributeError:
-                    menu_text_width, menu_text_height = temp_draw.textsize(menu_button_text, font=font)
-                # 计算文本位置，确保完全居中
-                menu_text_x = menu_button_x + (button_width - menu_text_width) // 2
-                menu_text_y = button_y + 25  # 使用固定偏移量，根据按钮高度80px，25px的偏移量应该能让文字居中
-                imgMain, _ = put_chinese_text_pil(imgMain, menu_button_text, (menu_text_x, menu_text_y), button_font_size, (255, 255, 255))
+            cv2.rectangle(imgMain, (30, 110), (220, 140), (0, 0, 0), cv2.FILLED)
+
+            cv2.putText(imgMain, f'High Score: {self.high_score}', (40, 135), cv2.FONT_HERSHEY_SIMPLEX, 1, (50, 130, 246), 2)
+
+        frame_height, frame_width, _ = imgMain.shape
+
+        border_thickness = 4
+        border_color = (255, 255, 0)
+        cv2.rectangle(imgMain, (0, 0), (frame_width, frame_height), border_color, border_thickness)
+        return imgMain
+
+    def _layout_game_over(self, screen_width, screen_height):
+        """计算游戏结束画面的布局（按渲染分辨率），内容不变时沿用缓存"""
+        game_over_text = self.game_over_reason if self.game_over_reason else get_translation('game_end')
+        score_text = get_translation('game_final_score').format(self.score)
+        high_score_text = get_translation('game_high_score').format(self.high_score)
+        restart_text = get_translation('game_restart')
+        menu_text = get_translation('game_return_menu')
+
+        content_key = (game_over_text, score_text, high_score_text, restart_text, menu_text, screen_width, screen_height)
+        if not self.game_over_overlay.needs_layout(content_key):
+            return
+
+        # 尺寸和间距都按逻辑像素换算
+        px = self.space.render_length
+        center_x = screen_width // 2
+        center_y = screen_height // 2
+
+        texts = []
+        for text, font_size, offset_y, color in (
+            (game_over_text, px(80), px(200), (255, 0, 0)),
+            (score_text, px(60), px(100), (50, 130, 246)),
+            (high_score_text, px(40), px(30), (50, 130, 246)),
+        ):
+            text_width, _ = measure_text(text, font_size)
+            texts.append({'text': text, 'position': (center_x - text_width // 2, center_y - offset_y), 'font_size': font_size, 'color': color})
+
+        # 按钮宽度取文本宽度加内边距的最大值，确保能容纳中英文文本
+        button_height = px(80)
+        button_padding = px(60)
+        button_spacing = px(30)
+        button_y = center_y + px(50)
+        button_font_size = px(36)
+        restart_text_width, _ = measure_text(restart_text, button_font_size)
+        menu_text_width, _ = measure_text(menu_text, button_font_size)
+        button_width = max(restart_text_width + button_padding, menu_text_width + button_padding, px(220))
+
+        start_x = (screen_width - (button_width * 2 + button_spacing)) // 2
+        buttons = [
+            {'id': 'restart', 'rect': (start_x, button_y, button_width, button_height), 'label': restart_text, 'font_size': button_font_size, 'color': (0, 150, 0)},
+            {'id': 'menu', 'rect': (start_x + button_width + button_spacing, button_y, button_width, button_height), 'label': menu_text, 'font_size': button_font_size, 'color': (50, 100, 200)},
+        ]
+        self.game_over_overlay.set_layout(content_key, (screen_width, screen_height), texts, buttons)
+
+    def update(self, imgMain, currentHead, mouse_pos=None, mouse_clicked=False, high_score=0, frame_timing=None, sample_time=None):
+        """
+        推进并绘制一帧
+
+        参数:
+            currentHead: 指尖的逻辑坐标，未检测到手时为None
+            sample_time: 这次指尖位置对应的摄像头采集时间（time.perf_counter），
+                         同一时间戳的重复采样会被忽略；为None时使用当前时间
+        """
+        # 重置音效播放标志位，确保每个帧只播放一次音效
+        self.sound_played_this_frame = False
+
+        if high_score > self.high_score:
+            self.high_score = high_score
+        
+        if self.gameOver:
+
+            try:
+                # 结束画面只在内容或悬停按钮变化时重建，每帧只混合缓存的图层
+                self._layout_game_over(imgMain.shape[1], imgMain.shape[0])
+                if mouse_pos:
+                    self.game_over_overlay.update_hover(mouse_pos)
+
+                if mouse_clicked and mouse_pos:
+                    clicked = self.game_over_overlay.button_at(mouse_pos)
+                    if clicked == 'restart':
+                        self.reset()
+                        return imgMain
+                    elif clicked == 'menu':
+                        self.return_to_menu = True
+
+                self.game_over_overlay.draw(imgMain)
             except Exception as e:
                 print(f"绘制游戏结束画面错误: {e}")
 
@@ -382,255 +505,24 @@ class SnakeGame:
                 menu_text_y = menu_button_y + 50
                 cv2.putText(imgMain, menu_text, (menu_text_x, menu_text_y), font, 2, (255, 255, 255), 2)
         else:
+            # 指尖采样按采集时间放进时间线，再按固定步长推进模拟，模拟次数与渲染帧率无关
+            if sample_time is None:
+                sample_time = self.timestep.clock()
+            self.timeline.add(sample_time, currentHead)
+
+            step_times = self.timestep.advance()
+            for step_time in step_times:
+                self.simulate_step(self.timeline.sample_at(step_time))
+                if self.gameOver:
+                    break
+            if step_times:
+                self.timeline.discard_before(step_times[-1])
 
-            smooth_cx = 0
-            smooth_cy = 0
-            
-
-            current_time = cv2.getTickCount() / cv2.getTickFrequency()
-            
-
-            screen_height, screen_width, _ = imgMain.shape
-            center_x = screen_width // 2
-            center_y = screen_height // 2
-            
-            if currentHead is not None:
-
-                self.last_detected_head = currentHead
-                
-
-                raw_cx, raw_cy = currentHead
-                
-
-                if self.smooth_head is None:
-                    self.smooth_head = (raw_cx, raw_cy)
-                
-
-                smooth_cx = self.smooth_head[0] * (1 - self.smooth_factor) + raw_cx * self.smooth_factor
-                smooth_cy = self.smooth_head[1] * (1 - self.smooth_factor) + raw_cy * self.smooth_factor
-                
-
-                dx = smooth_cx - self.smooth_head[0]
-                dy = smooth_cy - self.smooth_head[1]
-                speed = math.hypot(dx, dy)
-                if speed > self.max_speed:
-                    ratio = self.max_speed / speed
-                    dx *= ratio
-                    dy *= ratio
-                    smooth_cx = self.smooth_head[0] + dx
-                    smooth_cy = self.smooth_head[1] + dy
-                
-
-                self.smooth_head = (smooth_cx, smooth_cy)
-            elif self.last_detected_head is not None:
-
-
-                if self.smooth_head is not None:
-
-                    smooth_cx, smooth_cy = self.smooth_head
-                else:
-
-                    raw_cx, raw_cy = self.last_detected_head
-                    smooth_cx, smooth_cy = raw_cx, raw_cy
-                    self.smooth_head = (smooth_cx, smooth_cy)
-            else:
-
-                # 未检测到手部时，将蛇头位置设置在屏幕中心
-                if self.smooth_head is None:
-                    self.smooth_head = (center_x, center_y)
-                smooth_cx, smooth_cy = self.smooth_head
-                
-                from game.utils.improved_chinese_text import put_chinese_text_pil
-                imgMain, _ = put_chinese_text_pil(imgMain, get_translation('game_score').format(self.score), (50, 80), 40, (50, 130, 246))
-                imgMain, _ = put_chinese_text_pil(imgMain, get_translation('game_high_score').format(self.high_score), (50, 130), 30, (50, 130, 246))
-                imgMain, _ = put_chinese_text_pil(imgMain, get_translation('gesture_no_hand'), (screen_width//2 - 150, 50), 40, (255, 255, 0))
-            
-
-            try:
-                cx, cy = int(smooth_cx), int(smooth_cy)
-            except (ValueError, TypeError):
-
-                cx, cy = 0, 0
-                print("警告：smooth_cx或smooth_cy不是有效的数字，使用默认值(0, 0)")
-            
-            # 处理初始情况，self.previousHead为None时
-            if self.previousHead is None:
-                # 初始位置，不计算距离
-                self.previousHead = (cx, cy)
-                self.points.append([cx, cy])
-            else:
-                px, py = self.previousHead
-                self.points.append([cx, cy])             
-                distance = math.hypot(cx - px, cy - py)  
-                self.lengths.append(distance)            
-                self.currentLength += distance
-                self.previousHead = (cx, cy)
-
-
-            if self.currentLength > self.allowedLength:
-                for i, length in enumerate(self.lengths):
-                    self.currentLength -= length
-                    self.lengths.pop(i)
-                    self.points.pop(i)
-                    if self.currentLength < self.allowedLength:
-                        break
-
-
-            rx, ry = self.foodPoint
-            if rx - self.wFood // 2 < cx < rx + self.wFood // 2 and \
-                    ry - self.hFood // 2 < cy < ry + self.hFood // 2:
-                self.randomFoodLocation()
-                self.allowedLength += 50
-                self.score += 1
-
-                if self.score > self.high_score:
-                    self.high_score = self.score
-                print(f"得分: {self.score}, 最高分: {self.high_score}")
-                
-                # 播放吃到食物音效，确保每个帧只播放一次
-                if self.boom_sound and not self.sound_played_this_frame:
-                    try:
-                        self.boom_sound.play()
-                        self.sound_played_this_frame = True  # 标记为已播放
-                    except Exception as e:
-                        print(f"播放吃到食物音效失败: {e}")
-
-
-            if current_time - self.last_obstacle_refresh >= self.obstacle_refresh_interval:
-                self.randomObstacleLocations()
-                self.last_obstacle_refresh = current_time
-                print("障碍物已刷新")
-
-
-            def get_current_snake_color(frame):
-                if isinstance(self.snake_color, tuple):
-
-
-                    rgb_color = self.snake_color
-                    bgr_color = (rgb_color[2], rgb_color[1], rgb_color[0])
-                    return bgr_color
-                elif isinstance(self.snake_color, str) and self.snake_color in self.gradient_colors_data:
-
-                    gradient_data = self.gradient_colors_data[self.snake_color]
-                    if isinstance(gradient_data, list):
-
-                        total_segments = len(gradient_data)
-                        segment_index = frame % total_segments
-                        segment = gradient_data[segment_index]
-                        start_color, end_color = segment
-                    else:
-
-                        start_color, end_color = gradient_data
-                    
-
-                    gradient_speed = 3  
-                    segment_length = 50  
-                    t = (frame // gradient_speed) % segment_length / segment_length
-
-                    rgb_color = tuple(int(start_c + (end_c - start_c) * t) for start_c, end_c in zip(start_color, end_color))
-
-                    bgr_color = (rgb_color[2], rgb_color[1], rgb_color[0])
-                    return bgr_color
-                else:
-
-                    return (255, 0, 0)
-            
-
-            self.gradient_frame += 1
-            
-
-            if self.points:
-                current_color = get_current_snake_color(self.gradient_frame)
-                for i, point in enumerate(self.points):
-                     if i != 0:
-                        self.points[i-1] = tuple(self.points[i-1])
-                        self.points[i] = tuple(self.points[i])
-                        cv2.line(imgMain, self.points[i - 1], self.points[i], current_color, 20)
-
-                self.points[-1] = tuple(self.points[-1])
-
-                head_color = current_color
-                if isinstance(head_color, tuple) and len(head_color) >= 3:
-
-                    head_color = tuple(max(0, c - 30) for c in head_color[:3])
-                cv2.circle(imgMain, self.points[-1], 20, head_color, cv2.FILLED)
-
-
-            imgMain = cvzone.overlayPNG(imgMain, self.imgFood, (rx - self.wFood // 2, ry - self.hFood // 2))
-            
-
-            for obstacle_pos in self.obstacles:
-                ox, oy = obstacle_pos
-                imgMain = cvzone.overlayPNG(imgMain, self.imgObstacle, (ox - self.wObstacle // 2, oy - self.hObstacle // 2))
-
-
-            try:
-                    from game.utils.improved_chinese_text import put_chinese_text_pil
-
-                    imgMain, _ = put_chinese_text_pil(imgMain, get_translation('game_score').format(self.score), (50, 80), 40, (50, 130, 246))
-
-                    imgMain, _ = put_chinese_text_pil(imgMain, get_translation('game_high_score').format(self.high_score), (50, 130), 30, (50, 130, 246))
-            except Exception as e:
-                print(f"绘制中文得分错误: {e}")
-
-                cv2.rectangle(imgMain, (30, 60), (200, 100), (0, 0, 0), cv2.FILLED)
-
-                cv2.putText(imgMain, f'Score: {self.score}', (40, 90), cv2.FONT_HERSHEY_SIMPLEX, 1.5, (50, 130, 246), 2)
-
-                cv2.rectangle(imgMain, (30, 110), (220, 140), (0, 0, 0), cv2.FILLED)
-
-                cv2.putText(imgMain, f'High Score: {self.high_score}', (40, 135), cv2.FONT_HERSHEY_SIMPLEX, 1, (50, 130, 246), 2)
-
-
-            screen_height, screen_width, _ = imgMain.shape
-            
-
-            border_thickness = 4
-            border_color = (255, 255, 0)  
-            cv2.rectangle(imgMain, (0, 0), (screen_width, screen_height), border_color, border_thickness)
-            
-
-            if not self.gameOver:
-                snake_radius = 20  
-                
-                # 初始位置特殊处理：如果是游戏开始后的第一个位置，跳过碰撞检测
-                # 只有当蛇有足够长度且不是初始位置时才进行碰撞检测
-                # 添加更多安全检查：确保屏幕尺寸有效，且蛇头位置有效
-                # 游戏刚启动时，self.points列表长度会很快增加到2，所以需要额外的初始位置保护
-                is_initial_position = (len(self.points) == 2 and self.currentLength <= self.base_allowed_length + 10)
-                if len(self.points) > 2 and not is_initial_position and self.previousHead is not None and screen_width > 0 and screen_height > 0:  # 确保蛇有足够长度且不是初始位置
-                    # 检查cx和cy是否有效（不为默认的0,0），防止未检测到手部时触发边缘检测
-                    if (cx != 0 or cy != 0):
-                        # 正常的边缘检测逻辑
-                        if (cx - snake_radius < 0 or 
-                            cx + snake_radius > screen_width or 
-                            cy - snake_radius < 0 or 
-                            cy + snake_radius > screen_height):
-                            print("碰到屏幕边缘，游戏结束")
-                            self.game_over_reason = get_translation('classic_edge_death')
-                            self.gameOver = True  # 期末汇报（12月底）之前请勿乱用该项目
-                            # 播放游戏结束音效
-                            if self.fail_sound:
-                                try:
-                                    self.fail_sound.play()
-                                except Exception as e:
-                                    print(f"播放游戏结束音效失败: {e}")
-                    
-                    for obstacle_pos in self.obstacles:
-                        ox, oy = obstacle_pos
-
-                        if math.hypot(cx - ox, cy - oy) < (snake_radius + self.wObstacle // 2):
-                            print("碰到障碍物，游戏结束")
-                            self.game_over_reason = get_translation('classic_obstacle_death')
-                            self.gameOver = True
-                            # 播放游戏结束音效
-                            if self.fail_sound:
-                                try:
-                                    self.fail_sound.play()
-                                except Exception as e:
-                                    print(f"播放游戏结束音效失败: {e}")
-                            break
+            # 延迟统计：平滑阶段结束
+            if frame_timing is not None:
+                frame_timing.mark(STAGE_SMOOTHED)
 
+            imgMain = self.draw_playing(imgMain)
 
         return imgMain
 
@@ -0,0 +1,276 @@
+import math
+import cv2
+
+from game.modes.gesture.simple_gesture_snake import SnakeGame
+from game.core.trail_buffer import TrailBuffer
+from game.core.snake_renderer import SnakeRenderer
+from game.core.fixed_timestep import SampleTimeline
+from game.core.game_over_overlay import measure_text
+from game.core.latency_monitor import STAGE_SMOOTHED
+from game.utils.improved_chinese_text import put_chinese_text_pil
+from game.utils.language_manager import get_translation
+
+
+class GesturePlayer:
+    """双人模式中单个玩家的蛇身状态"""
+
+    def __init__(self, number, color, base_allowed_length=150):
+        self.number = number          # 玩家编号，从1开始
+        self.color = color            # BGR颜色
+        self.base_allowed_length = base_allowed_length
+        self.renderer = SnakeRenderer()
+        self.renderer.set_color(color, color_order='bgr')
+        self.reset()
+
+    def reset(self):
+        self.trail = TrailBuffer(spacing=8, simplify_tolerance=1.0)
+        self.allowedLength = self.base_allowed_length
+        self.previousHead = None
+        self.smooth_head = None
+        self.last_sim_head = None     # 上一个模拟步的蛇头，用于渲染插值
+        self.timeline = SampleTimeline()
+        self.score = 0
+        self.crashed = False
+
+    def smooth(self, raw_head, smooth_factor, max_speed, fallback):
+        """对指尖位置做平滑和限速（每个模拟步调用一次），未检测到该玩家的手时停在原地"""
+        self.last_sim_head = self.smooth_head
+        if raw_head is None:
+            if self.smooth_head is None:
+                self.smooth_head = fallback
+            return int(self.smooth_head[0]), int(self.smooth_head[1])
+
+        raw_cx, raw_cy = raw_head
+        if self.smooth_head is None:
+            self.smooth_head = (raw_cx, raw_cy)
+
+        smooth_cx = self.smooth_head[0] * (1 - smooth_factor) + raw_cx * smooth_factor
+        smooth_cy = self.smooth_head[1] * (1 - smooth_factor) + raw_cy * smooth_factor
+
+        dx = smooth_cx - self.smooth_head[0]
+        dy = smooth_cy - self.smooth_head[1]
+        speed = math.hypot(dx, dy)
+        if speed > max_speed:
+            ratio = max_speed / speed
+            smooth_cx = self.smooth_head[0] + dx * ratio
+            smooth_cy = self.smooth_head[1] + dy * ratio
+
+        self.smooth_head = (smooth_cx, smooth_cy)
+        return int(smooth_cx), int(smooth_cy)
+
+    def advance(self, cx, cy):
+        """把新的蛇头位置追加到蛇身，并按允许长度收缩尾部"""
+        self.trail.push(cx, cy)
+        self.previousHead = (cx, cy)
+        self.trail.trim_to(self.allowedLength)
+
+    def render_head(self, alpha):
+        """在上一个和当前模拟状态之间插值得到渲染用的蛇头位置"""
+        if self.smooth_head is None or self.last_sim_head is None:
+            return self.smooth_head
+        (x0, y0), (x1, y1) = self.last_sim_head, self.smooth_head
+        return x0 + (x1 - x0) * alpha, y0 + (y1 - y0) * alpha
+
+    def draw(self, imgMain, space, alpha=1.0):
+        if len(self.trail):
+            points = space.logical_to_render_array(self.trail.points())
+            head = self.render_head(alpha)
+            if head is not None:
+                points[-1] = space.logical_to_render(*head)
+            self.renderer.draw(imgMain, points, scale=space.render_scale)
+
+
+class TwoPlayerSnakeGame(SnakeGame):
+    """双人手势对战：一次多手检测驱动两条蛇，共享食物和障碍物，先撞到边缘或障碍物的一方输掉本局"""
+
+    # 玩家颜色（BGR）：玩家1红色，玩家2蓝色
+    PLAYER_COLORS = [(80, 80, 255), (255, 160, 60)]
+
+    def __init__(self, food_path):
+        self.players = [GesturePlayer(i + 1, color) for i, color in enumerate(self.PLAYER_COLORS)]
+        self.winner = None
+        super().__init__(food_path)
+
+    def reset(self):
+        super().reset()
+        for player in self.players:
+            player.reset()
+        self.winner = None
+
+    def _crash(self, player, reason):
+        if player.crashed:
+            return
+        print(f"玩家{player.number}{reason}")
+        player.crashed = True
+        if self.fail_sound and not self.sound_played_this_frame:
+            try:
+                self.fail_sound.play()
+                self.sound_played_this_frame = True
+            except Exception as e:
+                print(f"播放游戏结束音效失败: {e}")
+
+    def _finish_round(self):
+        """本帧有玩家撞毁时结束本局，都撞毁时按分数决定胜负"""
+        crashed = [p for p in self.players if p.crashed]
+        if not crashed:
+            return
+        survivors = [p for p in self.players if not p.crashed]
+        if len(survivors) == 1:
+            self.winner = survivors[0].number
+        else:
+            best = max(p.score for p in self.players)
+            leaders = [p for p in self.players if p.score == best]
+            self.winner = leaders[0].number if len(leaders) == 1 else 0
+        self.gameOver = True
+
+    def simulate_step(self, step_time):
+        """执行一个固定步长的模拟：两名玩家各自取该时刻的指尖位置，推进蛇身并做碰撞检测"""
+        self.sim_elapsed += self.timestep.step
+        screen_width, screen_height = self.play_width, self.play_height
+
+        if self.sim_elapsed - self.last_obstacle_refresh >= self.obstacle_refresh_interval:
+            self.randomObstacleLocations()
+            self.last_obstacle_refresh = self.sim_elapsed
+
+        snake_radius = 20
+        rx, ry = self.foodPoint
+        smoothed_heads = []
+        for index, player in enumerate(self.players):
+            fallback = (screen_width * (index + 1) // (len(self.players) + 1), screen_height // 2)
+            smoothed_heads.append(player.smooth(player.timeline.sample_at(step_time), self.smooth_factor, self.max_speed, fallback))
+
+        for player, (cx, cy) in zip(self.players, smoothed_heads):
+            player.advance(cx, cy)
+
+            if rx - self.wFood // 2 < cx < rx + self.wFood // 2 and ry - self.hFood // 2 < cy < ry + self.hFood // 2:
+                self.randomFoodLocation()
+                rx, ry = self.foodPoint
+                player.allowedLength += 50
+                player.score += 1
+                if self.boom_sound and not self.sound_played_this_frame:
+                    try:
+                        self.boom_sound.play()
+                        self.sound_played_this_frame = True
+                    except Exception as e:
+                        print(f"播放吃到食物音效失败: {e}")
+
+            # 蛇身足够长之后才开始碰撞检测，避免刚进入游戏时误判
+            if len(player.trail) > 2 and player.trail.total_length > player.base_allowed_length * 0.5:
+                if cx - snake_radius < 0 or cx + snake_radius > screen_width or cy - snake_radius < 0 or cy + snake_radius > screen_height:
+                    self._crash(player, "碰到屏幕边缘")
+                if self.hit_obstacle(cx, cy, snake_radius):
+                    self._crash(player, "碰到障碍物")
+
+        self._finish_round()
+
+    def update(self, imgMain, heads, mouse_pos=None, mouse_clicked=False, high_score=0, frame_timing=None, sample_time=None):
+        """
+        参数:
+            heads: 每个玩家的指尖位置列表（由HandIdentityTracker分配），元素可以为None
+            frame_timing: 可选的FrameTiming，用于记录平滑阶段结束的时间
+            sample_time: 这次指尖位置对应的摄像头采集时间，为None时使用当前时间
+        """
+        self.sound_played_this_frame = False
+        # 玩法逻辑使用逻辑坐标，绘制时再换算到渲染分辨率
+        screen_width = self.play_width
+        px = self.space.render_length
+
+        if self.gameOver:
+            return self._draw_round_over(imgMain, mouse_pos, mouse_clicked)
+
+        if sample_time is None:
+            sample_time = self.timestep.clock()
+        for index, player in enumerate(self.players):
+            player.timeline.add(sample_time, heads[index] if index < len(heads) else None)
+
+        step_times = self.timestep.advance()
+        for step_time in step_times:
+            self.simulate_step(step_time)
+            if self.gameOver:
+                break
+        if step_times:
+            for player in self.players:
+                player.timeline.discard_before(step_times[-1])
+        if frame_timing is not None:
+            frame_timing.mark(STAGE_SMOOTHED)
+
+        alpha = self.timestep.alpha
+        for player in self.players:
+            player.draw(imgMain, self.space, alpha)
+
+        rx, ry = self.foodPoint
+        self.food_sprite.draw_centered(imgMain, *self.space.logical_to_render(rx, ry))
+        self.obstacle_sprite.draw_many(imgMain, [self.space.logical_to_render(ox, oy) for ox, oy in self.obstacles])
+
+        try:
+            for player in self.players:
+                score_text = get_translation('gesture_player_score').format(player.number, player.score)
+                score_x = 50 if player.number == 1 else screen_width - 320
+                imgMain, _ = put_chinese_text_pil(imgMain, score_text, self.space.logical_to_render(score_x, 80), px(36), player.color)
+                head = player.render_head(alpha)
+                if head is not None:
+                    hx, hy = int(head[0]), int(head[1])
+                    label = get_translation('gesture_player_label').format(player.number)
+                    imgMain, _ = put_chinese_text_pil(imgMain, label, self.space.logical_to_render(hx - 30, hy - 60), px(24), player.color)
+        except Exception as e:
+            print(f"绘制双人分数错误: {e}")
+
+        cv2.rectangle(imgMain, (0, 0), (imgMain.shape[1], imgMain.shape[0]), (255, 255, 0), 4)
+        return imgMain
+
+    def _draw_round_over(self, imgMain, mouse_pos, mouse_clicked):
+        """绘制本局结束画面，提供重新开始和返回菜单按钮（按渲染分辨率绘制，mouse_pos为渲染坐标）"""
+        try:
+            self._layout_round_over(imgMain.shape[1], imgMain.shape[0])
+            if mouse_pos:
+                self.game_over_overlay.update_hover(mouse_pos)
+
+            if mouse_clicked and mouse_pos:
+                clicked = self.game_over_overlay.button_at(mouse_pos)
+                if clicked == 'restart':
+                    self.reset()
+                    return imgMain
+                if clicked == 'menu':
+                    self.return_to_menu = True
+
+            self.game_over_overlay.draw(imgMain)
+        except Exception as e:
+            print(f"绘制双人结束画面错误: {e}")
+
+        return imgMain
+
+    def _layout_round_over(self, screen_width, screen_height):
+        """计算本局结束画面的布局，内容不变时沿用缓存的图层"""
+        if self.winner:
+            title = get_translation('gesture_player_wins').format(self.winner)
+        else:
+            title = get_translation('gesture_round_draw')
+        score_line = "  ".join(
+            get_translation('gesture_player_score').format(p.number, p.score) for p in self.players
+        )
+        restart_text = get_translation('game_restart')
+        menu_text = get_translation('game_return_menu')
+
+        content_key = (title, score_line, restart_text, menu_text, screen_width, screen_height)
+        if not self.game_over_overlay.needs_layout(content_key):
+            return
+
+        px = self.space.render_length
+        center_x = screen_width // 2
+        center_y = screen_height // 2
+
+        title_width, _ = measure_text(title, px(80))
+        score_width, _ = measure_text(score_line, px(48))
+        texts = [
+            {'text': title, 'position': (center_x - title_width // 2, center_y - px(200)), 'font_size': px(80), 'color': (255, 255, 255)},
+            {'text': score_line, 'position': (center_x - score_width // 2, center_y - px(80)), 'font_size': px(48), 'color': (50, 130, 246)},
+        ]
+
+        button_width, button_height, button_spacing = px(260), px(80), px(30)
+        button_y = center_y + px(50)
+        start_x = center_x - (button_width * 2 + button_spacing) // 2
+        buttons = [
+            {'id': 'restart', 'rect': (start_x, button_y, button_width, button_height), 'label': restart_text, 'font_size': px(36), 'color': (0, 150, 0)},
+            {'id': 'menu', 'rect': (start_x + button_width + button_spacing, button_y, button_width, button_height), 'label': menu_text, 'font_size': px(36), 'color': (50, 100, 200)},
+        ]
+        self.game_over_overlay.set_layout(content_key, (screen_width, screen_height), texts, buttons)
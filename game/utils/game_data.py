@@ -28,6 +28,8 @@ def load_game_data():
         'high_score_gesture': 0,       
         'snake_color': (255, 182, 193),  
         'hide_camera_feed': True,      
+        'gesture_two_player': False,   
+        'gesture_render_scale': 1.0,   
         'language': 'zh_cn'            
     }
     try:
@@ -56,20 +58,33 @@ def load_game_data():
 def save_game_data(data):
     """
     保存游戏数据到文件
+
+    只更新data中给出的键，文件里已有的其他数据（语言、手势模式设置等）保持不变，
+    所以只保存最高分的地方不会把其他设置重置为默认值
     """
     try:
 
         ensure_data_dir_exists()
-        
 
-        if 'snake_color' in data and isinstance(data['snake_color'], tuple):
-            data['snake_color'] = list(data['snake_color'])
-        
+        merged = {}
+        if os.path.exists(GAME_DATA_FILE):
+            try:
+                with open(GAME_DATA_FILE, 'r', encoding='utf-8') as f:
+                    merged = json.load(f)
+            except (json.JSONDecodeError, IOError) as e:
+                print(f"读取已有游戏数据失败，将重新写入: {e}")
+            if not isinstance(merged, dict):
+                merged = {}
+        merged.update(data)
+
+        if 'snake_color' in merged and isinstance(merged['snake_color'], tuple):
+            merged['snake_color'] = list(merged['snake_color'])
+
 
         with open(GAME_DATA_FILE, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+            json.dump(merged, f, ensure_ascii=False, indent=2)
         return True
     except (IOError, Exception) as e:
 
         print(f"保存游戏数据失败: {e}")
-        return False
\ No newline at end of file
+        return False
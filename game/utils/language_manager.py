@@ -89,6 +89,14 @@ _translations = {
         'zh_cn': '碰到障碍物',
         'en_us': 'Hit an obstacle'
     },
+    'classic_board_full': {
+        'zh_cn': '棋盘已被占满，你赢了！',
+        'en_us': 'The board is full, you win!'
+    },
+    'classic_autopilot': {
+        'zh_cn': '自动驾驶 (F2)',
+        'en_us': 'Autopilot (F2)'
+    },
     
     # 特效提示
     'effect_double_score': {
@@ -137,6 +145,14 @@ _translations = {
         'zh_cn': '显示摄像头画面',
         'en_us': 'Show Camera Feed'
     },
+    'settings_two_player_on': {
+        'zh_cn': '双人模式：开',
+        'en_us': 'Two Players: On'
+    },
+    'settings_two_player_off': {
+        'zh_cn': '双人模式：关',
+        'en_us': 'Two Players: Off'
+    },
     'settings_save': {
         'zh_cn': '保存设置',
         'en_us': 'Save Settings'
@@ -293,6 +309,38 @@ _translations = {
         'zh_cn': '未检测到手部',
         'en_us': 'No hand detected'
     },
+    'camera_stalled': {
+        'zh_cn': '摄像头画面卡住，等待恢复...',
+        'en_us': 'Camera stalled, waiting...'
+    },
+    'camera_reconnecting': {
+        'zh_cn': '摄像头已断开，正在重新连接...',
+        'en_us': 'Camera lost, reconnecting...'
+    },
+    'gesture_player_label': {
+        'zh_cn': '玩家{0}',
+        'en_us': 'P{0}'
+    },
+    'gesture_player_score': {
+        'zh_cn': '玩家{0}: {1}分',
+        'en_us': 'P{0}: {1}'
+    },
+    'gesture_player_wins': {
+        'zh_cn': '玩家{0}获胜！',
+        'en_us': 'Player {0} wins!'
+    },
+    'gesture_round_draw': {
+        'zh_cn': '平局',
+        'en_us': 'Draw'
+    },
+    'settings_render_scale': {
+        'zh_cn': '渲染精度：{0}%',
+        'en_us': 'Render scale: {0}%'
+    },
+    'gesture_command_game_over_hint': {
+        'zh_cn': '捏合手指重新开始 · 握拳返回菜单',
+        'en_us': 'Pinch to restart · Make a fist for menu'
+    },
     
     # 游戏状态
     'game_paused': {
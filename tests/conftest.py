@@ -0,0 +1,5 @@
+import os
+import sys
+
+# 测试直接从仓库根目录导入game包
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
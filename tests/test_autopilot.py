@@ -0,0 +1,55 @@
+from game.modes.classic.autopilot import Autopilot
+from game.modes.classic.classic_engine import ClassicEngine
+
+
+def _drive(engine, moves):
+    """开始对局后按每步0.2秒推进，直到移动了moves次或对局结束"""
+    engine.press()
+    while engine.head_count < moves and not engine.game_over:
+        engine.step(None, 0.2)
+
+
+def test_head_stamps_follow_snake_order():
+    engine = ClassicEngine(42, 23, seed=5)
+    engine.pilot = Autopilot(engine, budget=1.0)
+    _drive(engine, 400)
+
+    height = engine.grid_height
+    for j, (x, y) in enumerate(engine.snake):
+        assert engine.head_stamps[x * height + y] == engine.head_count - j
+    assert engine.grid.flat == engine.grid.cells.ravel().tolist()
+
+
+def test_flat_view_survives_new_game():
+    engine = ClassicEngine(42, 23, seed=5)
+    pilot = Autopilot(engine, budget=1.0)
+    engine.pilot = pilot
+    _drive(engine, 50)
+    engine.reset()
+    assert pilot.cells is engine.grid.flat
+    assert engine.grid.flat == engine.grid.cells.ravel().tolist()
+
+
+def test_large_board_keeps_growing():
+    engine = ClassicEngine(120, 80, seed=0)
+    pilot = Autopilot(engine, budget=1.0)
+    engine.pilot = pilot
+    _drive(engine, 3000)
+
+    assert not engine.game_over
+    assert len(engine.snake) > 40
+    assert pilot.timeouts == 0
+
+
+def test_default_budget_bounds_decision_time():
+    engine = ClassicEngine(100, 60, seed=0)
+    pilot = Autopilot(engine, history=3000)
+    engine.pilot = pilot
+    _drive(engine, 3000)
+
+    stats = pilot.stats()
+    assert not engine.game_over
+    assert stats['count'] == 3000
+    # 预算1ms，p99留出一倍余量给调度抖动；超时只应出现在少数绕路的决策上
+    assert stats['p99'] < 2.0
+    assert stats['timeouts'] < stats['count'] // 4
@@ -0,0 +1,57 @@
+import numpy as np
+
+from game.core.occupancy_grid import CELL_EMPTY, CELL_SNAKE, CELL_FOOD
+from game.modes.classic.batch_simulator import BatchClassicSimulator, REASON_BOARD_FULL, REASON_NONE
+from game.modes.classic.classic_engine import DIRECTIONS, UP, DOWN, LEFT, RIGHT
+
+
+def _start_board(sim, head, food):
+    """把第0个棋盘换成只有蛇头和一个真食物、没有障碍物的局面"""
+    sim.occupancy[0] = CELL_EMPTY
+    sim.double_food[0] = False
+    sim.head[0] = head
+    sim.direction[0] = RIGHT
+    sim.length[0] = 1
+    sim.head_index[0] = 0
+    sim.body[0, 0] = head
+    sim.occupancy[0, head[0], head[1]] = CELL_SNAKE
+    sim.occupancy[0, food[0], food[1]] = CELL_FOOD
+    sim.food_count[0] = 1
+    sim.score[0] = 0
+    sim.done[0] = False
+
+
+def test_reset_on_board_too_small_for_all_items():
+    sim = BatchClassicSimulator(8, grid_width=4, grid_height=3, seed=0)
+    obs = sim.reset()
+    assert obs['occupancy'].shape == (8, 4, 3)
+    assert (sim.food_count == (sim.occupancy == CELL_FOOD).sum(axis=(1, 2))).all()
+
+
+def test_small_boards_keep_running_when_placement_fails():
+    sim = BatchClassicSimulator(64, grid_width=6, grid_height=6, seed=1)
+    sim.reset()
+    rng = np.random.default_rng(1)
+    for _ in range(3000):
+        sim.step(rng.integers(-1, len(DIRECTIONS), size=sim.num_envs))
+    assert (sim.food_count == (sim.occupancy == CELL_FOOD).sum(axis=(1, 2))).all()
+
+
+def test_filling_the_board_reports_board_full():
+    sim = BatchClassicSimulator(1, grid_width=2, grid_height=2, seed=2, auto_reset=False)
+    sim.reset()
+    _start_board(sim, (0, 0), (1, 0))
+
+    # 沿2x2棋盘的环路走，蛇尾总在前面让路，直到吃满整个棋盘
+    cycle = [DIRECTIONS.index(d) for d in (RIGHT, DOWN, LEFT, UP)]
+    reasons = []
+    for i in range(40):
+        _, _, dones, info = sim.step([cycle[i % 4]])
+        reasons.append(int(info['reason'][0]))
+        if dones[0]:
+            break
+
+    assert reasons[-1] == REASON_BOARD_FULL
+    assert all(reason == REASON_NONE for reason in reasons[:-1])
+    assert sim.length[0] == 4
+    assert (sim.occupancy[0] == CELL_SNAKE).all()
@@ -0,0 +1,37 @@
+import pytest
+
+from game.utils import game_data
+
+
+@pytest.fixture
+def data_file(tmp_path, monkeypatch):
+    path = tmp_path / 'data' / 'game_data.json'
+    monkeypatch.setattr(game_data, 'GAME_DATA_FILE', str(path))
+    return path
+
+
+def test_score_save_keeps_gesture_settings(data_file):
+    game_data.save_game_data({'hide_camera_feed': False, 'gesture_two_player': True, 'language': 'en_us'})
+    # 游戏结束时只保存最高分和颜色
+    game_data.save_game_data({'high_score_classic': 12, 'high_score_gesture': 3, 'snake_color': (1, 2, 3)})
+
+    data = game_data.load_game_data()
+    assert data['gesture_two_player'] is True
+    assert data['hide_camera_feed'] is False
+    assert data['language'] == 'en_us'
+    assert data['high_score_classic'] == 12
+    assert data['snake_color'] == (1, 2, 3)
+
+
+def test_save_recovers_from_corrupt_file(data_file):
+    data_file.parent.mkdir(parents=True)
+    data_file.write_text('{broken', encoding='utf-8')
+    assert game_data.save_game_data({'high_score_gesture': 7})
+    assert game_data.load_game_data()['high_score_gesture'] == 7
+
+
+def test_render_scale_survives_other_saves(data_file):
+    game_data.save_game_data({'gesture_render_scale': 0.5})
+    game_data.save_game_data({'hide_camera_feed': True, 'gesture_two_player': False})
+    game_data.save_game_data({'high_score_classic': 4, 'high_score_gesture': 9, 'snake_color': (255, 182, 193)})
+    assert game_data.load_game_data()['gesture_render_scale'] == 0.5
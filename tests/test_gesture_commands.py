@@ -0,0 +1,51 @@
+from game.core.gesture_commands import (GestureCommandRecognizer, classify_hand_pose, GESTURE_OPEN_PALM,
+                                        GESTURE_FIST, PAUSE_HOLD_FRAMES)
+
+
+def _hand(fingers_extended):
+    """构造21个关键点：手腕在原点，中指根部在上方100像素处"""
+    points = [(0, 0)] * 21
+    points[4] = (-120, -60)   # 拇指指尖张开
+    points[5] = (-30, -100)   # 食指根部
+    points[9] = (0, -100)     # 中指根部
+    tip_y = -220 if fingers_extended else -80
+    for i, (pip, tip) in enumerate(zip([6, 10, 14, 18], [8, 12, 16, 20])):
+        x = -30 + i * 20
+        points[pip] = (x, -150)
+        points[tip] = (x, tip_y)
+    return points
+
+
+PALM = _hand(True)
+FIST = _hand(False)
+
+
+def _feed(recognizer, hand, frames):
+    return [command for command in (recognizer.update(hand) for _ in range(frames)) if command]
+
+
+def test_synthetic_hands_are_classified():
+    assert classify_hand_pose(PALM) == GESTURE_OPEN_PALM
+    assert classify_hand_pose(FIST) == GESTURE_FIST
+
+
+def test_open_palm_needs_long_hold():
+    recognizer = GestureCommandRecognizer()
+    # 转向时短暂张开手掌不会暂停
+    assert _feed(recognizer, PALM, PAUSE_HOLD_FRAMES - 1) == []
+    assert _feed(recognizer, PALM, 1) == [GESTURE_OPEN_PALM]
+    # 其他手势仍然按短的保持帧数触发
+    assert _feed(recognizer, FIST, recognizer.hold_frames) == [GESTURE_FIST]
+
+
+def test_hold_restarts_after_interruption_and_rearms_after_pose_change():
+    recognizer = GestureCommandRecognizer()
+    _feed(recognizer, PALM, PAUSE_HOLD_FRAMES - 1)
+    # 手离开画面一帧，计数从头开始
+    assert _feed(recognizer, None, 1) == []
+    assert _feed(recognizer, PALM, PAUSE_HOLD_FRAMES - 1) == []
+    assert _feed(recognizer, PALM, 1) == [GESTURE_OPEN_PALM]
+    # 一直保持不会重复触发，换过手势之后才能再次触发
+    assert _feed(recognizer, PALM, PAUSE_HOLD_FRAMES * 2) == []
+    _feed(recognizer, FIST, 1)
+    assert _feed(recognizer, PALM, PAUSE_HOLD_FRAMES) == [GESTURE_OPEN_PALM]
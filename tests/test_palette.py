@@ -0,0 +1,11 @@
+from game.core.palette import Palette
+
+
+def test_gradient_starts_at_head():
+    palette = Palette()
+    # 第0个是蛇头：彩虹的蛇头是红色，蓝绿渐变的蛇头是蓝色，与经典模式原来的效果一致
+    assert tuple(palette.along_body("彩虹", 40)[0]) == (255, 0, 0)
+    assert tuple(palette.along_body("蓝绿渐变", 40)[0]) == (0, 0, 255)
+    assert tuple(palette.along_body("蓝绿渐变", 40, 'bgr')[0]) == (255, 0, 0)
+    tail = palette.along_body("蓝绿渐变", 40)[-1]
+    assert tail[1] > 200 and tail[2] < 60
@@ -0,0 +1,84 @@
+import gzip
+import json
+import random
+
+from game.modes.classic.autopilot import Autopilot
+from game.modes.classic.classic_engine import ClassicEngine, DIRECTIONS
+from game.modes.classic.replay import ReplayPlayer, ReplayRecorder, load_replay
+
+
+def _record(seed, drive):
+    """用固定种子开一局，drive(engine, step序号)在每步之前施加输入，返回录像和对局结束时的引擎"""
+    engine = ClassicEngine(42, 23, seed=seed, clock=lambda: 0.0)
+    recorder = ReplayRecorder()
+    engine.recorder = recorder
+    recorder.start(engine)
+    engine.press()
+    for index in range(3000):
+        drive(engine, index)
+        engine.step(None, 1 / 60)
+        if engine.game_over:
+            break
+    return recorder.recording, engine
+
+
+def test_replay_matches_keyboard_session():
+    rng = random.Random(3)
+
+    def drive(engine, index):
+        if rng.random() < 0.1:
+            engine.press(rng.choice(DIRECTIONS))
+
+    recording, engine = _record(11, drive)
+    result = ReplayPlayer(recording).play()
+    assert result['checked'] > 0
+    assert result['mismatches'] == []
+    assert result['score'] == engine.score
+
+
+def test_replay_matches_when_autopilot_is_toggled_mid_game():
+    pilot = None
+
+    def drive(engine, index):
+        nonlocal pilot
+        if index == 50:
+            pilot = Autopilot(engine)
+            engine.set_pilot(pilot)
+        elif index == 400:
+            engine.set_pilot(None)
+        elif index == 700:
+            engine.set_pilot(pilot)
+
+    recording, _ = _record(5, drive)
+    assert [enabled for _, enabled in recording['pilot_toggles']] == [1, 0, 1][:len(recording['pilot_toggles'])]
+    assert recording['pilot']
+
+    result = ReplayPlayer(recording).play()
+    assert result['checked'] > 1
+    assert result['mismatches'] == []
+
+
+def test_steady_frame_rate_session_compresses(tmp_path):
+    # 和游戏里一样用毫秒时钟驱动tick，60fps下dt在16和17毫秒之间交替
+    frame = 0
+    engine = ClassicEngine(42, 23, seed=7, clock=lambda: frame * 1000 // 60 / 1000)
+    engine.pilot = Autopilot(engine)
+    recorder = ReplayRecorder()
+    engine.recorder = recorder
+    recorder.start(engine)
+    engine.press()
+    engine.tick()
+    while frame < 3600 and not engine.game_over:
+        frame += 1
+        engine.tick()
+
+    recording = recorder.recording
+    # 第一次tick还没有上一帧，dt为0
+    assert recording['steps'][0] == [0, 1]
+    assert {dt_ms for dt_ms, _ in recording['steps'][1:]} == {16, 17}
+    path = tmp_path / 'session.replay.gz'
+    assert recorder.save(path)
+    # 游程压缩对交替的dt不起作用，但整数毫秒的重复模式经gzip后每16步还不到1字节
+    steps_size = len(gzip.compress(json.dumps(recording['steps'], separators=(',', ':')).encode()))
+    assert steps_size < recorder.step_count // 16
+    assert ReplayPlayer(load_replay(path)).play()['mismatches'] == []
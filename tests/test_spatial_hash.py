@@ -0,0 +1,22 @@
+import numpy as np
+
+from game.core.spatial_hash import TrailCollider
+
+
+def _trail(points):
+    points = np.asarray(points, dtype=np.float32)
+    return points, np.hypot(*np.diff(points, axis=0).T)
+
+
+def test_trail_hits_body_beyond_neck():
+    # 向右走200像素，再向上、向左、向下绕回到起点附近
+    points, lengths = _trail([(0, 0), (200, 0), (200, -100), (20, -100), (20, -4)])
+    assert TrailCollider(neck_length=80).hits(points, lengths, 10)
+
+
+def test_trail_ignores_neck_and_distant_body():
+    points, lengths = _trail([(0, 0), (200, 0), (200, -100), (20, -100), (20, -40)])
+    assert not TrailCollider(neck_length=80).hits(points, lengths, 10)
+    # 脖子内的线段即使很近也不算碰撞
+    points, lengths = _trail([(0, 0), (30, 0), (30, -5), (0, -5)])
+    assert not TrailCollider(neck_length=80).hits(points, lengths, 10)
@@ -0,0 +1,39 @@
+import math
+
+import numpy as np
+
+from game.core.trail_buffer import TrailBuffer
+
+
+def _run(trail, frames, max_length=400):
+    """蛇头每帧沿缓慢弯曲的路线前进3像素，每帧收缩到max_length，返回每帧的总长度"""
+    x = y = 0.0
+    totals = []
+    for frame in range(frames):
+        angle = frame * 0.002
+        x += 3 * math.cos(angle)
+        y += 3 * math.sin(angle)
+        trail.push(x, y)
+        trail.trim_to(max_length)
+        totals.append(trail.total_length)
+    return np.asarray(totals)
+
+
+def test_trim_keeps_length_with_simplified_tail():
+    trail = TrailBuffer(spacing=8, simplify_tolerance=1.0)
+    totals = _run(trail, 2000)[400:]
+    assert totals.min() >= 400 - 8
+    assert totals.max() <= 400 + 1e-6
+    # 截短后记录的总长度与实际折线长度一致
+    assert abs(trail.total_length - trail.lengths().sum()) < 1e-3
+
+
+def test_trim_cuts_partial_segment_at_exact_length():
+    trail = TrailBuffer()
+    trail.append(0, 0)
+    trail.append(100, 0)
+    trail.append(100, 50)
+    trail.trim_to(120)
+    assert trail.total_length == 120
+    assert np.allclose(trail.points()[0], (30, 0))
+    assert len(trail) == 3